@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Login latency at each password hashing cost.
+
+For every cost in --costs a fresh process (PASSWORD_HASH_COST=<cost>, as
+TicketingStack would set it) registers --users users through the register
+handler and then runs --logins logins through the login handler on
+--concurrency threads against moto. Reported per cost:
+- register: latency of hashing a new password
+- login: steady-state logins (hash already at the current cost)
+- rehashLogin: first login of users whose hash was made one cost step lower,
+  i.e. the extra work right after the cost is raised
+Login rate limits are disabled so only hashing and DynamoDB are measured.
+
+Usage:
+    pip install -r backend/benchmarks/requirements.txt
+    python backend/benchmarks/bench_login.py --costs 12,13,14,15 --output login.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import common
+
+PASSWORD = 'bench-password'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Measure login latency per password hashing cost')
+    parser.add_argument('--costs', default='12,13,14,15', help='Comma-separated log2(N) scrypt costs')
+    parser.add_argument('--users', type=int, default=50, help='Users registered per cost')
+    parser.add_argument('--logins', type=int, default=200, help='Logins per cost')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent logins')
+    parser.add_argument('--output', default=None, help='Also write the JSON results to this file')
+    parser.add_argument('--child', type=int, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def timed_calls(handler, bodies, concurrency):
+    """Invoke handler once per body; returns (latencies, statuses, wall seconds)."""
+    def call(body):
+        started = time.perf_counter()
+        response = handler({'body': json.dumps(body)}, None)
+        return time.perf_counter() - started, response['statusCode']
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(call, bodies))
+    wall = time.perf_counter() - started
+    return [latency for latency, _ in results], [status for _, status in results], wall
+
+
+def run_child(cost, args):
+    """One cost setting, in this (fresh) process."""
+    common.configure_environment()
+    mock = common.start_moto()
+    try:
+        import boto3
+        common.create_tables(boto3.client('dynamodb'))
+
+        import login
+        import register
+        from utils.dynamo import Table
+        from utils.passwords import hash_password
+
+        users = [f'bench-login-{i:05d}' for i in range(args.users)]
+        latencies, statuses, wall = timed_calls(
+            register.lambda_handler,
+            [{'userId': user_id, 'password': PASSWORD} for user_id in users],
+            args.concurrency
+        )
+        results = {'register': common.latency_summary(latencies, wall)}
+        failures = sum(1 for status in statuses if status != 200)
+
+        latencies, statuses, wall = timed_calls(
+            login.lambda_handler,
+            [{'userId': users[i % len(users)], 'password': PASSWORD} for i in range(args.logins)],
+            args.concurrency
+        )
+        results['login'] = common.latency_summary(latencies, wall)
+        failures += sum(1 for status in statuses if status != 200)
+
+        # Users hashed before the cost was raised: their first login rehashes
+        users_table = Table(os.environ['USERS_TABLE'])
+        stale = [f'bench-stale-{i:05d}' for i in range(args.users)]
+        for user_id in stale:
+            users_table.put_item(Item={
+                'userId': user_id,
+                'passwordHash': hash_password(PASSWORD, max(cost - 1, 1))
+            })
+        latencies, statuses, wall = timed_calls(
+            login.lambda_handler,
+            [{'userId': user_id, 'password': PASSWORD} for user_id in stale],
+            args.concurrency
+        )
+        results['rehashLogin'] = common.latency_summary(latencies, wall)
+        failures += sum(1 for status in statuses if status != 200)
+        results['failedRequests'] = failures
+        return results
+    finally:
+        mock.stop()
+
+
+def spawn(cost, args):
+    env = {
+        **os.environ,
+        'PASSWORD_HASH_COST': str(cost),
+        'RATE_LIMIT_LOGIN_PER_CLIENT': 'off',
+        'RATE_LIMIT_REGISTER_PER_CLIENT': 'off'
+    }
+    command = [
+        sys.executable, __file__, '--child', str(cost),
+        '--users', str(args.users), '--logins', str(args.logins),
+        '--concurrency', str(args.concurrency)
+    ]
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    if args.child is not None:
+        print(json.dumps(run_child(args.child, args)))
+        return
+
+    costs = [int(cost) for cost in args.costs.split(',') if cost.strip()]
+    results = {
+        'config': {
+            'users': args.users,
+            'logins': args.logins,
+            'concurrency': args.concurrency,
+            'cpus': os.cpu_count()
+        },
+        'costs': {str(cost): spawn(cost, args) for cost in costs}
+    }
+    common.write_results(results, args.output)
+
+    if any(result['failedRequests'] for result in results['costs'].values()):
+        print("ERROR: some register/login requests failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
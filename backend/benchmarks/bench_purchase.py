@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Load test of the purchase hot path, run in-process against a stand-in
+DynamoDB (moto, or DynamoDB Local with --endpoint-url) and an in-memory SQS
+queue.
+
+Simulated buyers call purchase.lambda_handler concurrently for one hot event
+while browsers page through get_events.lambda_handler; afterwards the orders
+are pushed through the outbox (order_publisher) and confirmed by
+order_consumer. Results (throughput, p50/p95/p99 latency, sold-out /
+conditional-check failure rate, invariant checks) are printed as JSON.
+Exits 1 if an invariant is violated (oversell, negative inventory,
+unconfirmed orders).
+
+Usage:
+    pip install -r backend/benchmarks/requirements.txt
+    python backend/benchmarks/bench_purchase.py --buyers 5000 --concurrency 64 --tickets 2000 --shards 8
+    python backend/benchmarks/bench_purchase.py --endpoint-url http://localhost:8000 --output results.json
+
+Note: with moto, requests to the stand-in are serialized (see
+common.start_moto), so the numbers mostly reflect handler overhead; use
+DynamoDB Local to observe contention (TransactionConflict) behaviour.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import common
+
+HOT_EVENT_ID = 'bench-hot-event'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the purchase hot path locally')
+    parser.add_argument('--buyers', type=int, default=2000, help='Number of purchase requests')
+    parser.add_argument('--concurrency', type=int, default=64, help='Concurrent simulated clients')
+    parser.add_argument('--tickets', type=int, default=1000, help='Inventory of the hot event')
+    parser.add_argument('--shards', type=int, default=0,
+                        help='Inventory shards for the hot event (0 = counter on the event item)')
+    parser.add_argument('--max-quantity', type=int, default=4, help='Max tickets per purchase')
+    parser.add_argument('--retry-ratio', type=float, default=0.05,
+                        help='Share of buyers that resend the same request (same Idempotency-Key)')
+    parser.add_argument('--browse-requests', type=int, default=500,
+                        help='GET /events calls interleaved with the purchases')
+    parser.add_argument('--catalog-size', type=int, default=200, help='Extra events in the catalog')
+    parser.add_argument('--consumer-batch', type=int, default=100, help='SQS batch size for order_consumer')
+    parser.add_argument('--endpoint-url', default=None, help='DynamoDB Local endpoint (default: moto)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--output', default=None, help='Also write the JSON results to this file')
+    return parser.parse_args()
+
+
+def auth_headers(user_id):
+    """Authorization header the lambdas accept for user_id (a signed session token)."""
+    from utils.auth import issue_token
+    return {'Authorization': issue_token(user_id)}
+
+
+def seed_catalog(dynamodb, args):
+    """Hot event (optionally sharded) plus a catalog of other events to browse."""
+    events_table = dynamodb.Table(common.TABLE_ENV['EVENTS_TABLE'])
+    hot_event = {
+        'eventId': HOT_EVENT_ID,
+        'name': 'Benchmark On-Sale',
+        'category': 'concert',
+        'city': 'Seattle',
+        'venue': 'Bench Arena',
+        'date': '2030-01-01',
+        'price': 99,
+        'metaVersion': 1
+    }
+    if args.shards > 0:
+        hot_event['inventoryShards'] = args.shards
+        inventory_table = dynamodb.Table(common.TABLE_ENV['INVENTORY_TABLE'])
+        base, extra = divmod(args.tickets, args.shards)
+        with inventory_table.batch_writer() as batch:
+            for shard_id in range(args.shards):
+                batch.put_item(Item={
+                    'eventId': HOT_EVENT_ID,
+                    'shardId': shard_id,
+                    'remainingTickets': base + (1 if shard_id < extra else 0)
+                })
+    else:
+        hot_event['remainingTickets'] = args.tickets
+    events_table.put_item(Item=hot_event)
+
+    categories = ['concert', 'sports', 'theater', 'comedy']
+    cities = ['Seattle', 'Boston', 'Austin', 'Denver']
+    with events_table.batch_writer() as batch:
+        for i in range(args.catalog_size):
+            batch.put_item(Item={
+                'eventId': f'bench-e{i:05d}',
+                'name': f'Event {i}',
+                'category': categories[i % len(categories)],
+                'city': cities[i % len(cities)],
+                'venue': 'Venue',
+                'date': f'2030-{i % 12 + 1:02d}-{i % 28 + 1:02d}',
+                'price': 25 + i % 100,
+                'remainingTickets': 500,
+                'metaVersion': 1
+            })
+
+
+def read_inventory(dynamodb, args):
+    """Current remainingTickets counters of the hot event (one per shard)."""
+    if args.shards > 0:
+        items = dynamodb.Table(common.TABLE_ENV['INVENTORY_TABLE']).query(
+            KeyConditionExpression='eventId = :id',
+            ExpressionAttributeValues={':id': HOT_EVENT_ID},
+            ConsistentRead=True
+        )['Items']
+        return [int(item['remainingTickets']) for item in items]
+    item = dynamodb.Table(common.TABLE_ENV['EVENTS_TABLE']).get_item(
+        Key={'eventId': HOT_EVENT_ID}, ConsistentRead=True
+    )['Item']
+    return [int(item['remainingTickets'])]
+
+
+def scan_orders(client):
+    """All orders, as low-level (typed) items."""
+    items = []
+    kwargs = {'TableName': common.TABLE_ENV['ORDERS_TABLE']}
+    while True:
+        page = client.scan(**kwargs)
+        items.extend(page['Items'])
+        if 'LastEvaluatedKey' not in page:
+            return items
+        kwargs['ExclusiveStartKey'] = page['LastEvaluatedKey']
+
+
+class InventoryMonitor(threading.Thread):
+    """Samples the hot event's counters during the run and keeps the minimum seen."""
+
+    def __init__(self, dynamodb, args, interval=0.05):
+        super().__init__(daemon=True)
+        self._dynamodb = dynamodb
+        self._args = args
+        self._interval = interval
+        self._done = threading.Event()
+        self.min_observed = None
+        self.samples = 0
+
+    def run(self):
+        while not self._done.is_set():
+            lowest = min(read_inventory(self._dynamodb, self._args))
+            self.min_observed = lowest if self.min_observed is None else min(self.min_observed, lowest)
+            self.samples += 1
+            self._done.wait(self._interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def run_buyers(purchase, get_events, args):
+    """Drive purchases and catalog reads concurrently; returns samples and outcome counts."""
+    rng = random.Random(args.seed)
+    requests = []
+    for i in range(args.buyers):
+        user_id = f'bench-user-{i:06d}'
+        request = {
+            'headers': {**auth_headers(user_id), 'Idempotency-Key': str(uuid.uuid4())},
+            'body': json.dumps({
+                'eventId': HOT_EVENT_ID,
+                'quantity': rng.randint(1, args.max_quantity)
+            })
+        }
+        requests.append(('purchase', request))
+        if rng.random() < args.retry_ratio:
+            requests.append(('retry', request))
+    for _ in range(args.browse_requests):
+        requests.append(('browse', {'queryStringParameters': {'limit': '20'}}))
+    rng.shuffle(requests)
+
+    lock = threading.Lock()
+    purchase_latencies = []
+    browse_latencies = []
+    outcomes = {}
+    order_ids = set()
+
+    def call(entry):
+        kind, request = entry
+        handler = get_events.lambda_handler if kind == 'browse' else purchase.lambda_handler
+        started = time.perf_counter()
+        try:
+            response = handler(request, None)
+        except Exception as e:
+            response = {'statusCode': 'exception', 'body': json.dumps({'error': repr(e)})}
+        elapsed = time.perf_counter() - started
+
+        status = response['statusCode']
+        if kind == 'browse':
+            outcome = 'browse_ok' if status == 200 else f'browse_{status}'
+        elif status == 200:
+            replayed = response.get('headers', {}).get('Idempotent-Replayed') == 'true'
+            outcome = f'{kind}_replayed' if replayed else f'{kind}_ok'
+        elif status == 400 and 'Not enough tickets' in response['body']:
+            outcome = 'sold_out'
+        else:
+            outcome = f'{kind}_{status}'
+
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            if kind == 'browse':
+                browse_latencies.append(elapsed)
+            else:
+                purchase_latencies.append(elapsed)
+                if status == 200:
+                    order_ids.add(json.loads(response['body'])['data']['orderId'])
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(call, requests))
+    wall = time.perf_counter() - started
+    return purchase_latencies, browse_latencies, outcomes, order_ids, wall
+
+
+def drain_pipeline(client, order_publisher, order_consumer, queue, args):
+    """
+    Replay the OrdersTable stream into order_publisher (moto does not invoke
+    stream consumers), then feed the queued messages to order_consumer.
+    """
+    orders = scan_orders(client)
+    records = [
+        {
+            'eventName': 'INSERT',
+            'dynamodb': {'NewImage': item, 'SequenceNumber': str(i + 1)}
+        }
+        for i, item in enumerate(orders)
+    ]
+    publisher_failures = 0
+    for start in range(0, len(records), 100):
+        result = order_publisher.lambda_handler({'Records': records[start:start + 100]}, None)
+        publisher_failures += len(result['batchItemFailures'])
+
+    batch_latencies = []
+    consumer_failures = 0
+    started = time.perf_counter()
+    for sqs_event in queue.drain_batches(args.consumer_batch):
+        batch_started = time.perf_counter()
+        result = order_consumer.lambda_handler(sqs_event, None)
+        batch_latencies.append(time.perf_counter() - batch_started)
+        consumer_failures += len(result['batchItemFailures'])
+    wall = time.perf_counter() - started
+
+    summary = common.latency_summary(batch_latencies)
+    summary['messagesPerSec'] = round(len(orders) / wall, 2) if wall else 0.0
+    summary['publisherFailures'] = publisher_failures
+    summary['consumerFailures'] = consumer_failures
+    return summary
+
+
+def check_invariants(client, dynamodb, args, order_ids, monitor):
+    orders = scan_orders(client)
+    sold = sum(int(item['quantity']['N']) for item in orders)
+    remaining = read_inventory(dynamodb, args)
+    unconfirmed = [item['orderId']['S'] for item in orders if item['status']['S'] != 'confirmed']
+
+    from utils.dynamo import Table
+    from utils.event_stats import read_stats
+    stats = read_stats(Table(common.TABLE_ENV['EVENT_STATS_TABLE']), HOT_EVENT_ID)
+
+    violations = []
+    if monitor.min_observed is not None and monitor.min_observed < 0:
+        violations.append(f'remainingTickets observed at {monitor.min_observed} during the run')
+    if min(remaining) < 0:
+        violations.append(f'remainingTickets ended negative: {remaining}')
+    if sold + sum(remaining) != args.tickets:
+        violations.append(f'sold ({sold}) + remaining ({sum(remaining)}) != initial ({args.tickets})')
+    if len(orders) != len(order_ids):
+        violations.append(f'{len(orders)} orders stored but {len(order_ids)} distinct orderIds returned')
+    if unconfirmed:
+        violations.append(f'{len(unconfirmed)} orders not confirmed, e.g. {unconfirmed[:5]}')
+    if stats['tickets'] != sold or stats['orders'] != len(orders):
+        violations.append(f"sales counters ({stats['tickets']} tickets, {stats['orders']} orders) "
+                          f"!= confirmed orders ({sold} tickets, {len(orders)} orders)")
+
+    return {
+        'ticketsSold': sold,
+        'ticketsRemaining': sum(remaining),
+        'minObservedRemaining': monitor.min_observed,
+        'inventorySamples': monitor.samples,
+        'orders': len(orders),
+        'statsTickets': stats['tickets'],
+        'statsRevenue': stats['revenue'],
+        'violations': violations
+    }
+
+
+def run(args):
+    import boto3
+
+    client = boto3.client('dynamodb')
+    dynamodb = boto3.resource('dynamodb')
+    common.create_tables(client)
+    seed_catalog(dynamodb, args)
+
+    # Handlers read their environment at import time
+    import purchase
+    import get_events
+    import order_publisher
+    import order_consumer
+
+    from utils import clients
+    queue = common.InMemoryQueue()
+    clients.set_client('sqs', queue)
+
+    monitor = InventoryMonitor(dynamodb, args)
+    monitor.start()
+    try:
+        purchase_latencies, browse_latencies, outcomes, order_ids, wall = run_buyers(
+            purchase, get_events, args
+        )
+    finally:
+        monitor.stop()
+
+    pipeline = drain_pipeline(client, order_publisher, order_consumer, queue, args)
+    invariants = check_invariants(client, dynamodb, args, order_ids, monitor)
+
+    attempts = len(purchase_latencies)
+    return {
+        'config': {
+            'buyers': args.buyers,
+            'concurrency': args.concurrency,
+            'tickets': args.tickets,
+            'shards': args.shards,
+            'maxQuantity': args.max_quantity,
+            'retryRatio': args.retry_ratio,
+            'browseRequests': args.browse_requests,
+            'backend': args.endpoint_url or 'moto'
+        },
+        'wallSeconds': round(wall, 3),
+        'purchase': common.latency_summary(purchase_latencies, wall),
+        'browse': common.latency_summary(browse_latencies, wall),
+        'outcomes': outcomes,
+        'conditionalCheckFailureRate': round(outcomes.get('sold_out', 0) / attempts, 4) if attempts else 0.0,
+        'consumer': pipeline,
+        'invariants': invariants
+    }
+
+
+def main():
+    args = parse_args()
+    common.configure_environment(args.endpoint_url)
+
+    mock = None if args.endpoint_url else common.start_moto()
+    try:
+        results = run(args)
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    common.write_results(results, args.output)
+    if results['invariants']['violations']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
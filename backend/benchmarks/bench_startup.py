@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of the Lambda handlers.
+
+Every measurement runs in a fresh Python process, as a new Lambda container
+would: module import (the init phase), a first request rejected before any
+AWS call (which must not build clients), and creation of the shared clients
+compared with creating the boto3.resource the handlers used to build at
+import time. No AWS endpoint is contacted. Results are printed as JSON
+(median over --runs processes).
+
+Usage:
+    pip install -r backend/benchmarks/requirements.txt
+    python backend/benchmarks/bench_startup.py --runs 10 --output startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+import common
+
+HANDLERS = [
+    'get_events', 'get_event_detail', 'availability', 'search', 'get_orders',
+    'get_order_detail', 'event_stats', 'login', 'register', 'purchase', 'create_hold',
+    'confirm_hold', 'waiting_room', 'order_consumer', 'order_publisher', 'hold_expiry'
+]
+
+# Handlers that authenticate first: an unauthenticated request must be
+# answered without creating any AWS client
+AUTHENTICATED_HANDLERS = [
+    'purchase', 'create_hold', 'confirm_hold', 'get_orders', 'get_order_detail', 'event_stats'
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Measure Lambda cold-start cost locally')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh processes per measurement')
+    parser.add_argument('--output', default=None, help='Also write the JSON results to this file')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+def measure_handler(name):
+    """Import one handler module and send it an unauthenticated request."""
+    common.configure_environment()
+    started = time.perf_counter()
+    module = __import__(name)
+    result = {'importMs': _ms(started)}
+
+    if name in AUTHENTICATED_HANDLERS:
+        from utils import clients
+        started = time.perf_counter()
+        response = module.lambda_handler({'headers': {}, 'body': '{}'}, None)
+        result['rejectedRequestMs'] = _ms(started)
+        result['rejectedStatus'] = response['statusCode']
+        result['clientsCreated'] = len(clients._clients)
+    return result
+
+
+def measure_clients(target):
+    """
+    Cold creation of the shared low-level clients ('clients'), or of the
+    boto3.resource objects the handlers used to build at import ('resource').
+    """
+    common.configure_environment()
+    started = time.perf_counter()
+    import boto3
+    result = {'importBoto3Ms': _ms(started)}
+
+    if target == 'resource':
+        started = time.perf_counter()
+        resource = boto3.resource('dynamodb')
+        resource.Table(common.TABLE_ENV['EVENTS_TABLE'])
+        result['dynamodbResourceMs'] = _ms(started)
+        return result
+
+    from utils import clients
+    started = time.perf_counter()
+    clients.dynamodb()
+    result['dynamodbClientMs'] = _ms(started)
+    started = time.perf_counter()
+    clients.sqs()
+    result['sqsClientMs'] = _ms(started)
+    return result
+
+
+def run_child(target):
+    measure = measure_clients if target in ('clients', 'resource') else measure_handler
+    print(json.dumps(measure(target)))
+
+
+def spawn(target, runs):
+    """Median of each metric over `runs` fresh processes."""
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child', target],
+            check=True, capture_output=True, text=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        metric: statistics.median(sample[metric] for sample in samples)
+        for metric in samples[0]
+    }
+
+
+def main():
+    args = parse_args()
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = {
+        'runs': args.runs,
+        'python': sys.version.split()[0],
+        'clients': spawn('clients', args.runs),
+        'resource': spawn('resource', args.runs),
+        'handlers': {name: spawn(name, args.runs) for name in HANDLERS}
+    }
+    common.write_results(results, args.output)
+
+    leaked = [name for name in AUTHENTICATED_HANDLERS if results['handlers'][name]['clientsCreated']]
+    if leaked:
+        print(f"ERROR: clients created for rejected requests in {', '.join(leaked)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Shared setup for the local benchmarks: environment, table creation against
+a stand-in DynamoDB (moto or DynamoDB Local), an in-memory SQS queue, and
+latency statistics / JSON result output.
+"""
+import json
+import math
+import os
+import sys
+import threading
+import uuid
+from pathlib import Path
+
+LAMBDAS_DIR = Path(__file__).resolve().parent.parent / 'lambdas'
+
+REGION = 'us-east-1'
+QUEUE_URL = 'https://sqs.us-east-1.amazonaws.com/000000000000/bench-order-created'
+
+# env var -> table name, as TicketingStack passes them to the lambdas
+TABLE_ENV = {
+    'EVENTS_TABLE': 'bench-events',
+    'ORDERS_TABLE': 'bench-orders',
+    'USERS_TABLE': 'bench-users',
+    'INVENTORY_TABLE': 'bench-inventory',
+    'IDEMPOTENCY_TABLE': 'bench-idempotency',
+    'HOLDS_TABLE': 'bench-holds',
+    'WAITING_ROOM_TABLE': 'bench-waiting-room',
+    'RATE_LIMIT_TABLE': 'bench-rate-limits',
+    'CATALOG_CHANGES_TABLE': 'bench-catalog-changes',
+    'ORDER_SUMMARY_TABLE': 'bench-order-summaries',
+    'EVENT_STATS_TABLE': 'bench-event-stats'
+}
+
+
+def configure_environment(endpoint_url=None):
+    """
+    Set the environment the lambda modules read at import time. Must run
+    before any handler is imported.
+    endpoint_url: DynamoDB Local endpoint; None for moto
+    """
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    os.environ['AWS_DEFAULT_REGION'] = REGION
+    os.environ['AWS_REGION'] = REGION
+    if endpoint_url:
+        os.environ['AWS_ENDPOINT_URL_DYNAMODB'] = endpoint_url
+    os.environ.update(TABLE_ENV)
+    os.environ['QUEUE_URL'] = QUEUE_URL
+    os.environ.setdefault('SIGNING_KEY', 'bench-signing-key')
+
+    if str(LAMBDAS_DIR) not in sys.path:
+        sys.path.insert(0, str(LAMBDAS_DIR))
+
+
+def start_moto():
+    """
+    Start moto's in-process AWS mock. moto applies requests without any
+    locking, so concurrent TransactWriteItems calls can interleave and
+    oversell; requests are serialized here to give each one the atomicity
+    DynamoDB guarantees. Returns the mock, to stop() after the run.
+    """
+    from moto import mock_aws
+    from moto.core.botocore_stubber import BotocoreStubber
+
+    lock = threading.Lock()
+    process_request = BotocoreStubber.process_request
+
+    def locked_process_request(self, request):
+        with lock:
+            return process_request(self, request)
+
+    BotocoreStubber.process_request = locked_process_request
+    mock = mock_aws()
+    mock.start()
+    return mock
+
+
+def _table(client, name, keys, indexes=(), stream=None):
+    attributes = {}
+    key_schema = []
+    for attr_name, attr_type, key_type in keys:
+        attributes[attr_name] = attr_type
+        key_schema.append({'AttributeName': attr_name, 'KeyType': key_type})
+
+    request = {
+        'TableName': name,
+        'KeySchema': key_schema,
+        'BillingMode': 'PAY_PER_REQUEST'
+    }
+    gsis = []
+    for index_name, index_keys in indexes:
+        index_schema = []
+        for attr_name, attr_type, key_type in index_keys:
+            attributes[attr_name] = attr_type
+            index_schema.append({'AttributeName': attr_name, 'KeyType': key_type})
+        gsis.append({
+            'IndexName': index_name,
+            'KeySchema': index_schema,
+            'Projection': {'ProjectionType': 'ALL'}
+        })
+    if gsis:
+        request['GlobalSecondaryIndexes'] = gsis
+    if stream:
+        request['StreamSpecification'] = {'StreamEnabled': True, 'StreamViewType': stream}
+    request['AttributeDefinitions'] = [
+        {'AttributeName': n, 'AttributeType': t} for n, t in attributes.items()
+    ]
+    client.create_table(**request)
+
+
+def create_tables(client):
+    """Create the TicketingStack tables (keys and GSIs) on the stand-in DynamoDB."""
+    _table(client, TABLE_ENV['EVENTS_TABLE'], [('eventId', 'S', 'HASH')], indexes=[
+        ('CategoryDateIndex', [('category', 'S', 'HASH'), ('date', 'S', 'RANGE')]),
+        ('CityDateIndex', [('city', 'S', 'HASH'), ('date', 'S', 'RANGE')])
+    ])
+    _table(client, TABLE_ENV['INVENTORY_TABLE'],
+           [('eventId', 'S', 'HASH'), ('shardId', 'N', 'RANGE')])
+    _table(client, TABLE_ENV['ORDERS_TABLE'], [('orderId', 'S', 'HASH')], indexes=[
+        ('UserOrdersIndex', [('userId', 'S', 'HASH'), ('createdAt', 'S', 'RANGE')])
+    ], stream='NEW_IMAGE')
+    _table(client, TABLE_ENV['USERS_TABLE'], [('userId', 'S', 'HASH')])
+    _table(client, TABLE_ENV['IDEMPOTENCY_TABLE'], [('idempotencyKey', 'S', 'HASH')])
+    _table(client, TABLE_ENV['WAITING_ROOM_TABLE'], [('eventId', 'S', 'HASH')])
+    _table(client, TABLE_ENV['RATE_LIMIT_TABLE'], [('bucketKey', 'S', 'HASH')])
+    _table(client, TABLE_ENV['CATALOG_CHANGES_TABLE'], [('feed', 'S', 'HASH'), ('change', 'S', 'RANGE')])
+    _table(client, TABLE_ENV['ORDER_SUMMARY_TABLE'], [('userId', 'S', 'HASH')])
+    _table(client, TABLE_ENV['EVENT_STATS_TABLE'], [('eventId', 'S', 'HASH'), ('bucket', 'S', 'RANGE')])
+    _table(client, TABLE_ENV['HOLDS_TABLE'], [('holdId', 'S', 'HASH')], indexes=[
+        ('ExpiringHoldsIndex', [('expiryPartition', 'N', 'HASH'), ('expiresAt', 'N', 'RANGE')])
+    ])
+
+
+class InMemoryQueue:
+    """
+    Stand-in for the OrderCreated SQS queue, exposing the subset of the SQS
+    client API the lambdas call and producing SQS-shaped event records.
+    """
+
+    def __init__(self):
+        self._messages = []
+        self._lock = threading.Lock()
+
+    def send_message(self, QueueUrl, MessageBody, **kwargs):
+        with self._lock:
+            self._messages.append(MessageBody)
+        return {'MessageId': str(uuid.uuid4())}
+
+    def send_message_batch(self, QueueUrl, Entries, **kwargs):
+        with self._lock:
+            self._messages.extend(entry['MessageBody'] for entry in Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries], 'Failed': []}
+
+    def __len__(self):
+        return len(self._messages)
+
+    def drain_batches(self, batch_size):
+        """Yield SQS Lambda events of up to batch_size records until the queue is empty."""
+        while True:
+            with self._lock:
+                bodies, self._messages = self._messages[:batch_size], self._messages[batch_size:]
+            if not bodies:
+                return
+            yield {'Records': [
+                {'messageId': str(uuid.uuid4()), 'body': body, 'eventSource': 'aws:sqs'}
+                for body in bodies
+            ]}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values)) - 1
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+
+def latency_summary(samples, wall_seconds=None):
+    """
+    Summarize latency samples (seconds) in milliseconds.
+    wall_seconds: elapsed time of the whole run, to report throughput
+    """
+    ordered = sorted(samples)
+    summary = {
+        'count': len(ordered),
+        'p50Ms': round(percentile(ordered, 50) * 1000, 3),
+        'p95Ms': round(percentile(ordered, 95) * 1000, 3),
+        'p99Ms': round(percentile(ordered, 99) * 1000, 3),
+        'maxMs': round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        'meanMs': round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0
+    }
+    if wall_seconds:
+        summary['throughputPerSec'] = round(len(ordered) / wall_seconds, 2)
+    return summary
+
+
+def write_results(results, output_path=None):
+    """Emit results as JSON on stdout, and to output_path if given."""
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if output_path:
+        Path(output_path).write_text(text + '\n')
+    print(text)
@@ -9,7 +9,8 @@ env = Environment(
     region="us-east-1"
 )
 
-TicketingStack(app, "TicketingStack", env=env)
-FrontendStack(app, "FrontendStack", env=env)
+frontend = FrontendStack(app, "FrontendStack", env=env)
+# The catalog snapshot is published into the frontend bucket
+TicketingStack(app, "TicketingStack", env=env, frontend_bucket=frontend.frontend_bucket)
 
 app.synth()
@@ -16,7 +16,7 @@ class FrontendStack(Stack):
         # =========================
         # 1. S3 Bucket
         # =========================
-        frontend_bucket = s3.Bucket(
+        self.frontend_bucket = frontend_bucket = s3.Bucket(
             self,
             "FrontendBucket",
             website_index_document="index.html",
@@ -94,6 +94,9 @@ class FrontendStack(Stack):
             destination_bucket=frontend_bucket,
             distribution=distribution,
             distribution_paths=["/*"],
+            # catalog/ holds the snapshot written by TicketingStack's
+            # catalog-snapshot-lambda; deployments must not prune it
+            exclude=["catalog/*"],
         )
 
         # Output a public URL
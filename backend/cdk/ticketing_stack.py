@@ -4,13 +4,17 @@ from aws_cdk import (
     aws_dynamodb as dynamodb,
     aws_apigateway as apigw,
     aws_sqs as sqs,
+    aws_events as events,
+    aws_events_targets as targets,
+    aws_secretsmanager as secretsmanager,
     aws_lambda_event_sources as lambda_event_sources,
+    aws_s3 as s3,
 )
 from constructs import Construct
 
 
 class TicketingStack(cdk.Stack):
-    def __init__(self, scope: Construct, id: str, **kwargs):
+    def __init__(self, scope: Construct, id: str, frontend_bucket: s3.IBucket = None, **kwargs):
         super().__init__(scope, id, **kwargs)
 
         # ============================================================
@@ -22,6 +26,27 @@ class TicketingStack(cdk.Stack):
         # - description (String)
         # - imageUrl (String)
         # - remainingTickets (Number)
+        # - inventoryShards (Number, optional) - >= 2 keeps stock in
+        #   InventoryTable instead of remainingTickets
+        # - metaVersion (Number) - bumped on metadata changes, invalidates
+        #   cached copies of the event in warm Lambdas
+        # - waitingRoom (Boolean, optional) - purchases need an admission
+        #   token from the waiting room (bump metaVersion when toggling)
+        # - admissionRate (Number, optional) - buyers admitted per second
+        # - category (String) - used in GSI
+        # - city (String) - used in GSI
+        # - date (String) - YYYY-MM-DD, GSI sort key
+        #
+        # GSI: CategoryDateIndex
+        # - category (String, PK)
+        # - date (String, SK) - date-range filtering as a Query
+        #
+        # GSI: CityDateIndex
+        # - city (String, PK)
+        # - date (String, SK)
+        #
+        # Stream (NEW_AND_OLD_IMAGES): catalog snapshot and search change
+        # feed, see catalog_snapshot / catalog_changes
         # ============================================================
         events_table = dynamodb.Table(
             self, "EventsTable",
@@ -30,6 +55,55 @@ class TicketingStack(cdk.Stack):
                 type=dynamodb.AttributeType.STRING
             ),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            # Old images tell ticket-count updates apart from catalog changes
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES
+        )
+
+        # Add GSIs so filtered catalog listings are Queries, not Scans
+        # (DynamoDB creates one GSI per table update; on an existing table
+        # deploy these one at a time)
+        events_table.add_global_secondary_index(
+            index_name="CategoryDateIndex",
+            partition_key=dynamodb.Attribute(
+                name="category",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="date",
+                type=dynamodb.AttributeType.STRING
+            )
+        )
+
+        events_table.add_global_secondary_index(
+            index_name="CityDateIndex",
+            partition_key=dynamodb.Attribute(
+                name="city",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="date",
+                type=dynamodb.AttributeType.STRING
+            )
+        )
+
+        # ============================================================
+        # InventoryTable Schema (sharded stock of hot events):
+        # - eventId (String, PK)
+        # - shardId (Number, SK) - 0..inventoryShards-1
+        # - remainingTickets (Number)
+        # ============================================================
+        inventory_table = dynamodb.Table(
+            self, "InventoryTable",
+            partition_key=dynamodb.Attribute(
+                name="eventId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="shardId",
+                type=dynamodb.AttributeType.NUMBER
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
             removal_policy=cdk.RemovalPolicy.DESTROY
         )
 
@@ -39,12 +113,17 @@ class TicketingStack(cdk.Stack):
         # - userId (String) - used in GSI
         # - eventId (String)
         # - quantity (Number)
-        # - status (String) - pending/confirmed
+        # - unitPrice (Number) - event price at purchase
+        # - status (String) - pending -> confirmed -> fulfilled, or pending -> cancelled
+        #   (transitions in lambdas/utils/order_status.py)
         # - createdAt (String) - ISO timestamp
         #
         # GSI: UserOrdersIndex
         # - userId (String, PK)
         # - createdAt (String, SK) - for sorting by time
+        #
+        # Stream (NEW_AND_OLD_IMAGES): outbox for order publication, see
+        # order_publisher; per-user summaries, see order_summarizer
         # ============================================================
         orders_table = dynamodb.Table(
             self, "OrdersTable",
@@ -53,7 +132,9 @@ class TicketingStack(cdk.Stack):
                 type=dynamodb.AttributeType.STRING
             ),
             billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
-            removal_policy=cdk.RemovalPolicy.DESTROY
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            # Old images carry the status an order moved from
+            stream=dynamodb.StreamViewType.NEW_AND_OLD_IMAGES
         )
         
         # Add GSI for querying orders by userId
@@ -84,6 +165,177 @@ class TicketingStack(cdk.Stack):
             removal_policy=cdk.RemovalPolicy.DESTROY
         )
 
+        # ============================================================
+        # IdempotencyTable Schema (POST /purchase dedupe records):
+        # - idempotencyKey (String, PK) - <userId>#<Idempotency-Key header>
+        # - requestHash (String) - fingerprint the replay must match
+        # - responseBody (String) - original response, returned on replay
+        # - expiresAt (Number) - epoch seconds, DynamoDB TTL attribute
+        # ============================================================
+        idempotency_table = dynamodb.Table(
+            self, "IdempotencyTable",
+            partition_key=dynamodb.Attribute(
+                name="idempotencyKey",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            time_to_live_attribute="expiresAt"
+        )
+
+        # ============================================================
+        # HoldsTable Schema (tickets reserved during checkout):
+        # - holdId (String, PK)
+        # - userId (String)
+        # - eventId (String)
+        # - quantity (Number)
+        # - shardId (Number, optional) - inventory shard the tickets came from
+        # - unitPrice (Number) - event price when held, copied to the order
+        # - holdState (String) - held -> confirmed | released
+        #   (see lambdas/utils/holds.py)
+        # - orderId (String) - set on confirm
+        # - createdAt (Number) - epoch seconds
+        # - expiresAt (Number) - epoch seconds, confirm deadline
+        # - expiryPartition (Number) - 0..15, only while held
+        # - purgeAt (Number) - epoch seconds, DynamoDB TTL attribute
+        #
+        # GSI: ExpiringHoldsIndex (sparse: held holds only)
+        # - expiryPartition (Number, PK)
+        # - expiresAt (Number, SK) - hold_expiry queries expiresAt <= now
+        # ============================================================
+        holds_table = dynamodb.Table(
+            self, "HoldsTable",
+            partition_key=dynamodb.Attribute(
+                name="holdId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            time_to_live_attribute="purgeAt"
+        )
+
+        holds_table.add_global_secondary_index(
+            index_name="ExpiringHoldsIndex",
+            partition_key=dynamodb.Attribute(
+                name="expiryPartition",
+                type=dynamodb.AttributeType.NUMBER
+            ),
+            sort_key=dynamodb.Attribute(
+                name="expiresAt",
+                type=dynamodb.AttributeType.NUMBER
+            ),
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["holdId", "eventId", "quantity", "shardId"]
+        )
+
+        # ============================================================
+        # WaitingRoomTable Schema (one queue per waiting-room event):
+        # - eventId (String, PK)
+        # - lastPosition (Number) - atomic counter, last position handed out
+        # - nextAdmitAt (Number) - next free admission slot, epoch ms
+        # ============================================================
+        waiting_room_table = dynamodb.Table(
+            self, "WaitingRoomTable",
+            partition_key=dynamodb.Attribute(
+                name="eventId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY
+        )
+
+        # ============================================================
+        # RateLimitTable Schema (write-endpoint rate limits, GCRA):
+        # - bucketKey (String, PK) - e.g. purchase#user#<userId>
+        # - tat (Number) - theoretical arrival time, epoch ms
+        # - expiresAt (Number) - epoch seconds, DynamoDB TTL attribute
+        # ============================================================
+        rate_limit_table = dynamodb.Table(
+            self, "RateLimitTable",
+            partition_key=dynamodb.Attribute(
+                name="bucketKey",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            time_to_live_attribute="expiresAt"
+        )
+
+        # ============================================================
+        # EventStatsTable Schema (per-event sales counters, added to by
+        # order_consumer when it confirms an order; see
+        # lambdas/utils/event_stats.py):
+        # - eventId (String, PK)
+        # - bucket (String, SK) - "TOTAL#<shard>" or
+        #   "HOUR#<YYYY-MM-DDTHH>#<shard>" (UTC hour of purchase)
+        # - tickets, revenue, orders (Number)
+        # ============================================================
+        event_stats_table = dynamodb.Table(
+            self, "EventStatsTable",
+            partition_key=dynamodb.Attribute(
+                name="eventId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="bucket",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY
+        )
+
+        # ============================================================
+        # UserOrderSummaryTable Schema (first page of GET /orders, kept by
+        # order_summarizer; see lambdas/utils/order_summary.py):
+        # - userId (String, PK)
+        # - orders (List) - newest orders with embedded event fields
+        # - hasMore (Boolean) - older orders exist beyond `orders`
+        # - orderCount, ticketCount, totalSpend (Number)
+        # - applied (List) - recently applied "<orderId>#<status>" changes
+        # - version (Number) - optimistic lock
+        # ============================================================
+        order_summary_table = dynamodb.Table(
+            self, "UserOrderSummaryTable",
+            partition_key=dynamodb.Attribute(
+                name="userId",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY
+        )
+
+        # ============================================================
+        # CatalogChangesTable Schema (catalog change feed for search):
+        # - feed (String, PK) - always "catalog"
+        # - change (String, SK) - "<epoch ms>#<eventId>"
+        # - eventId (String)
+        # - expiresAt (Number) - epoch seconds, DynamoDB TTL attribute
+        # ============================================================
+        catalog_changes_table = dynamodb.Table(
+            self, "CatalogChangesTable",
+            partition_key=dynamodb.Attribute(
+                name="feed",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="change",
+                type=dynamodb.AttributeType.STRING
+            ),
+            billing_mode=dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy=cdk.RemovalPolicy.DESTROY,
+            time_to_live_attribute="expiresAt"
+        )
+
+        # HMAC key for signed tokens (session and waiting-room admission), read once per
+        # Lambda container
+        signing_secret = secretsmanager.Secret(
+            self, "TokenSigningKey",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                password_length=64,
+                exclude_punctuation=True
+            )
+        )
+
         # ============================================================
         # 2. SQS (OrderCreated Queue)
         # ============================================================
@@ -96,9 +348,17 @@ class TicketingStack(cdk.Stack):
             retention_period=cdk.Duration.days(14)
         )
 
+        consumer_timeout_seconds = 30
+        consumer_batching_window_seconds = 2
+
         order_queue = sqs.Queue(
             self, "OrderCreatedQueue",
-            visibility_timeout=cdk.Duration.seconds(30),
+            # At least 6x the consumer timeout plus the batching window (AWS
+            # guidance), so messages waiting in a batch or still in flight
+            # don't become visible again and get delivered twice
+            visibility_timeout=cdk.Duration.seconds(
+                6 * consumer_timeout_seconds + consumer_batching_window_seconds
+            ),
             dead_letter_queue=sqs.DeadLetterQueue(
                 max_receive_count=3,  # Retry 3 times before sending to DLQ
                 queue=order_dlq
@@ -111,22 +371,247 @@ class TicketingStack(cdk.Stack):
             runtime=_lambda.Runtime.PYTHON_3_11,
             handler="order_consumer.lambda_handler",
             code=_lambda.Code.from_asset("../lambdas"),
-            timeout=cdk.Duration.seconds(30),
+            timeout=cdk.Duration.seconds(consumer_timeout_seconds),
             environment={
-                "ORDERS_TABLE": orders_table.table_name
+                "ORDERS_TABLE": orders_table.table_name,
+                "EVENTS_TABLE": events_table.table_name,
+                "EVENT_STATS_TABLE": event_stats_table.table_name,
+                # Counter items per stats bucket (spreads hot-event writes)
+                "STATS_COUNTER_SHARDS": "4",
+                "CONSUMER_MAX_WORKERS": "16"
             }
         )
 
         orders_table.grant_read_write_data(order_consumer_lambda)
+        events_table.grant_read_data(order_consumer_lambda)
+        event_stats_table.grant_read_write_data(order_consumer_lambda)
         order_queue.grant_consume_messages(order_consumer_lambda)
 
         order_consumer_lambda.add_event_source(
             lambda_event_sources.SqsEventSource(
                 order_queue,
-                batch_size=10
+                # Batches above 10 require a batching window
+                batch_size=100,
+                max_batching_window=cdk.Duration.seconds(consumer_batching_window_seconds),
+                # Only failed records are redelivered (handler returns batchItemFailures)
+                report_batch_item_failures=True
             )
         )
 
+        # ============================================================
+        # Order publisher: OrdersTable stream -> OrderCreated queue
+        # purchase writes the order in a transaction; inserted orders are
+        # published from the stream instead of on the request path
+        # ============================================================
+        order_publisher_lambda = _lambda.Function(
+            self,
+            "order-publisher-lambda",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="order_publisher.lambda_handler",
+            code=_lambda.Code.from_asset("../lambdas"),
+            timeout=cdk.Duration.seconds(30),
+            environment={
+                "QUEUE_URL": order_queue.queue_url
+            }
+        )
+
+        order_queue.grant_send_messages(order_publisher_lambda)
+
+        order_publisher_lambda.add_event_source(
+            lambda_event_sources.DynamoEventSource(
+                orders_table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=100,
+                max_batching_window=cdk.Duration.seconds(1),
+                bisect_batch_on_error=True,
+                retry_attempts=10,
+                report_batch_item_failures=True,
+                # Only new orders; status updates by order_consumer are ignored
+                filters=[
+                    _lambda.FilterCriteria.filter({
+                        "eventName": _lambda.FilterRule.is_equal("INSERT")
+                    })
+                ]
+            )
+        )
+
+        # ============================================================
+        # Order summarizer: OrdersTable stream -> UserOrderSummaryTable
+        # ============================================================
+        order_summarizer_lambda = _lambda.Function(
+            self,
+            "order-summarizer-lambda",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="order_summarizer.lambda_handler",
+            code=_lambda.Code.from_asset("../lambdas"),
+            timeout=cdk.Duration.seconds(60),
+            environment={
+                "ORDERS_TABLE": orders_table.table_name,
+                "ORDER_SUMMARY_TABLE": order_summary_table.table_name,
+                "EVENTS_TABLE": events_table.table_name
+            }
+        )
+
+        orders_table.grant_read_data(order_summarizer_lambda)
+        events_table.grant_read_data(order_summarizer_lambda)
+        order_summary_table.grant_read_write_data(order_summarizer_lambda)
+
+        order_summarizer_lambda.add_event_source(
+            lambda_event_sources.DynamoEventSource(
+                orders_table,
+                starting_position=_lambda.StartingPosition.TRIM_HORIZON,
+                batch_size=100,
+                max_batching_window=cdk.Duration.seconds(1),
+                bisect_batch_on_error=True,
+                retry_attempts=10,
+                report_batch_item_failures=True,
+                # Inserts and status changes (orders are never deleted)
+                filters=[
+                    _lambda.FilterCriteria.filter({
+                        "eventName": _lambda.FilterRule.or_("INSERT", "MODIFY")
+                    })
+                ]
+            )
+        )
+
+        # ============================================================
+        # Hold expiry: every minute, releases holds past their deadline
+        # and returns their tickets to the inventory
+        # ============================================================
+        hold_expiry_lambda = _lambda.Function(
+            self,
+            "hold-expiry-lambda",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="hold_expiry.lambda_handler",
+            code=_lambda.Code.from_asset("../lambdas"),
+            timeout=cdk.Duration.seconds(55),
+            environment={
+                "HOLDS_TABLE": holds_table.table_name,
+                "EVENTS_TABLE": events_table.table_name,
+                "INVENTORY_TABLE": inventory_table.table_name,
+                "EXPIRY_MAX_WORKERS": "16"
+            }
+        )
+
+        holds_table.grant_read_write_data(hold_expiry_lambda)
+        events_table.grant_read_write_data(hold_expiry_lambda)
+        inventory_table.grant_read_write_data(hold_expiry_lambda)
+
+        events.Rule(
+            self,
+            "HoldExpirySchedule",
+            schedule=events.Schedule.rate(cdk.Duration.minutes(1)),
+            targets=[targets.LambdaFunction(hold_expiry_lambda)]
+        )
+
+        # ============================================================
+        # Sales export: daily dump of every order, joined with its event,
+        # to gzip'd NDJSON partitioned by eventId/date for reporting jobs
+        # (layout in lambdas/utils/sales_export.py). Parquet output needs
+        # pyarrow bundled with the function.
+        # ============================================================
+        export_bucket = s3.Bucket(
+            self,
+            "SalesExportBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            removal_policy=cdk.RemovalPolicy.DESTROY
+        )
+
+        sales_exporter_lambda = _lambda.Function(
+            self,
+            "sales-exporter-lambda",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="sales_exporter.lambda_handler",
+            code=_lambda.Code.from_asset("../lambdas"),
+            timeout=cdk.Duration.minutes(15),
+            memory_size=1024,
+            environment={
+                "ORDERS_TABLE": orders_table.table_name,
+                "EVENTS_TABLE": events_table.table_name,
+                "EXPORT_BUCKET": export_bucket.bucket_name,
+                "EXPORT_PREFIX": "exports/sales",
+                "EXPORT_FORMAT": "ndjson",
+                "EXPORT_SEGMENTS": "8",
+                # Full 1 MB scan pages
+                "AWS_READ_TIMEOUT_SECONDS": "10"
+            }
+        )
+
+        orders_table.grant_read_data(sales_exporter_lambda)
+        events_table.grant_read_data(sales_exporter_lambda)
+        export_bucket.grant_put(sales_exporter_lambda)
+
+        events.Rule(
+            self,
+            "SalesExportSchedule",
+            schedule=events.Schedule.cron(minute="0", hour="3"),
+            targets=[targets.LambdaFunction(sales_exporter_lambda)]
+        )
+
+        # ============================================================
+        # Catalog change feed: EventsTable stream -> CatalogChangesTable,
+        # read by warm search containers to refresh their index
+        # ============================================================
+        catalog_changes_lambda = _lambda.Function(
+            self,
+            "catalog-changes-lambda",
+            runtime=_lambda.Runtime.PYTHON_3_11,
+            handler="catalog_changes.lambda_handler",
+            code=_lambda.Code.from_asset("../lambdas"),
+            timeout=cdk.Duration.seconds(30),
+            environment={
+                "CATALOG_CHANGES_TABLE": catalog_changes_table.table_name
+            }
+        )
+
+        catalog_changes_table.grant_write_data(catalog_changes_lambda)
+
+        catalog_changes_lambda.add_event_source(
+            lambda_event_sources.DynamoEventSource(
+                events_table,
+                starting_position=_lambda.StartingPosition.LATEST,
+                batch_size=100,
+                max_batching_window=cdk.Duration.seconds(1),
+                retry_attempts=10
+            )
+        )
+
+        # ============================================================
+        # Catalog snapshot: EventsTable stream -> catalog/*.json in the
+        # frontend bucket, served by CloudFront to anonymous browsers
+        # ============================================================
+        if frontend_bucket is not None:
+            catalog_snapshot_lambda = _lambda.Function(
+                self,
+                "catalog-snapshot-lambda",
+                runtime=_lambda.Runtime.PYTHON_3_11,
+                handler="catalog_snapshot.lambda_handler",
+                code=_lambda.Code.from_asset("../lambdas"),
+                timeout=cdk.Duration.seconds(60),
+                environment={
+                    "EVENTS_TABLE": events_table.table_name,
+                    "INVENTORY_TABLE": inventory_table.table_name,
+                    "CATALOG_BUCKET": frontend_bucket.bucket_name,
+                    "SNAPSHOT_MAX_AGE_SECONDS": "60"
+                }
+            )
+
+            events_table.grant_read_data(catalog_snapshot_lambda)
+            inventory_table.grant_read_data(catalog_snapshot_lambda)
+            frontend_bucket.grant_put(catalog_snapshot_lambda, "catalog/*")
+            frontend_bucket.grant_delete(catalog_snapshot_lambda, "catalog/*")
+
+            catalog_snapshot_lambda.add_event_source(
+                lambda_event_sources.DynamoEventSource(
+                    events_table,
+                    starting_position=_lambda.StartingPosition.LATEST,
+                    batch_size=100,
+                    # Coalesce bursts of edits (e.g. seeding) into one rebuild
+                    max_batching_window=cdk.Duration.seconds(5),
+                    retry_attempts=10
+                )
+            )
+
         # ============================================================
         # 3. Create Lambdas
         # ============================================================
@@ -136,9 +621,15 @@ class TicketingStack(cdk.Stack):
             "login",
             "get_events",
             "get_event_detail",
+            "availability",
+            "search",
             "purchase",
+            "create_hold",
+            "confirm_hold",
+            "waiting_room",
             "get_orders",
-            "get_order_detail"
+            "get_order_detail",
+            "event_stats"
         ]
 
         for name in lambda_names:
@@ -153,14 +644,51 @@ class TicketingStack(cdk.Stack):
                     "EVENTS_TABLE": events_table.table_name,
                     "ORDERS_TABLE": orders_table.table_name,
                     "USERS_TABLE": users_table.table_name,
-                    "QUEUE_URL": order_queue.queue_url
+                    "INVENTORY_TABLE": inventory_table.table_name,
+                    "IDEMPOTENCY_TABLE": idempotency_table.table_name,
+                    "IDEMPOTENCY_TTL_SECONDS": "86400",
+                    "HOLDS_TABLE": holds_table.table_name,
+                    "HOLD_TTL_SECONDS": "600",
+                    "WAITING_ROOM_TABLE": waiting_room_table.table_name,
+                    "WAITING_ROOM_ADMISSION_RATE": "50",
+                    "ADMISSION_WINDOW_SECONDS": "600",
+                    "SIGNING_SECRET_ARN": signing_secret.secret_arn,
+                    "AUTH_TOKEN_TTL_SECONDS": "43200",
+                    # scrypt cost, log2(N); tune with benchmarks/bench_login.py
+                    "PASSWORD_HASH_COST": "14",
+                    # Rate limits, "<requests per second>:<burst>" ("off" disables)
+                    "RATE_LIMIT_TABLE": rate_limit_table.table_name,
+                    "RATE_LIMIT_PURCHASE_PER_USER": "1:5",
+                    "RATE_LIMIT_PURCHASE_PER_EVENT": "200:400",
+                    "RATE_LIMIT_LOGIN_PER_CLIENT": "0.2:5",
+                    "RATE_LIMIT_REGISTER_PER_CLIENT": "0.1:3",
+                    # In-process event cache shared by warm invocations
+                    "EVENT_CACHE_TTL_SECONDS": "60",
+                    "EVENT_CACHE_MAX_ENTRIES": "1024",
+                    "AVAILABILITY_MAX_AGE_SECONDS": "5",
+                    # Search index kept in warm containers
+                    "CATALOG_CHANGES_TABLE": catalog_changes_table.table_name,
+                    "SEARCH_REFRESH_SECONDS": "5",
+                    "SEARCH_REBUILD_SECONDS": "3600",
+                    "ORDER_SUMMARY_TABLE": order_summary_table.table_name,
+                    "EVENT_STATS_TABLE": event_stats_table.table_name,
+                    # userIds allowed to read sales stats (cdk deploy -c organizerUserIds=a,b)
+                    "ORGANIZER_USER_IDS": self.node.try_get_context("organizerUserIds") or ""
                 }
             )
 
             lambda_functions[name] = fn
             events_table.grant_read_write_data(fn)
+            inventory_table.grant_read_write_data(fn)
+            idempotency_table.grant_read_write_data(fn)
+            holds_table.grant_read_write_data(fn)
+            waiting_room_table.grant_read_write_data(fn)
+            signing_secret.grant_read(fn)
+            rate_limit_table.grant_read_write_data(fn)
+            catalog_changes_table.grant_read_data(fn)
+            order_summary_table.grant_read_data(fn)
+            event_stats_table.grant_read_data(fn)
             orders_table.grant_read_write_data(fn)
-            order_queue.grant_send_messages(fn)
             users_table.grant_read_write_data(fn)
 
         # ============================================================
@@ -172,7 +700,7 @@ class TicketingStack(cdk.Stack):
             default_cors_preflight_options=apigw.CorsOptions(
                 allow_origins=["*"],
                 allow_methods=["GET", "POST", "OPTIONS"],
-                allow_headers=["Content-Type", "Authorization"]
+                allow_headers=["Content-Type", "Authorization", "Idempotency-Key", "X-Admission-Token"]
             )
         )
 
@@ -204,6 +732,14 @@ class TicketingStack(cdk.Stack):
             method_responses=[cors_response]
         )
 
+        # Literal path, matched before {eventId}
+        search_resource = events_resource.add_resource("search")
+        search_resource.add_method(
+            "GET",
+            apigw.LambdaIntegration(lambda_functions["search"]),
+            method_responses=[cors_response]
+        )
+
         event_detail_resource = events_resource.add_resource("{eventId}")
         event_detail_resource.add_method(
             "GET",
@@ -211,6 +747,28 @@ class TicketingStack(cdk.Stack):
             method_responses=[cors_response]
         )
 
+        event_stats_resource = event_detail_resource.add_resource("stats")
+        event_stats_resource.add_method(
+            "GET",
+            apigw.LambdaIntegration(lambda_functions["event_stats"]),
+            method_responses=[cors_response]
+        )
+
+        availability_resource = api.root.add_resource("availability")
+        availability_resource.add_method(
+            "GET",
+            apigw.LambdaIntegration(lambda_functions["availability"]),
+            method_responses=[cors_response]
+        )
+
+        queue_resource = event_detail_resource.add_resource("queue")
+        for method in ("POST", "GET"):
+            queue_resource.add_method(
+                method,
+                apigw.LambdaIntegration(lambda_functions["waiting_room"]),
+                method_responses=[cors_response]
+            )
+
         purchase_resource = api.root.add_resource("purchase")
         purchase_resource.add_method(
             "POST",
@@ -218,6 +776,20 @@ class TicketingStack(cdk.Stack):
             method_responses=[cors_response]
         )
 
+        holds_resource = api.root.add_resource("holds")
+        holds_resource.add_method(
+            "POST",
+            apigw.LambdaIntegration(lambda_functions["create_hold"]),
+            method_responses=[cors_response]
+        )
+
+        confirm_hold_resource = holds_resource.add_resource("{holdId}").add_resource("confirm")
+        confirm_hold_resource.add_method(
+            "POST",
+            apigw.LambdaIntegration(lambda_functions["confirm_hold"]),
+            method_responses=[cors_response]
+        )
+
         orders_resource = api.root.add_resource("orders")
         orders_resource.add_method(
             "GET",
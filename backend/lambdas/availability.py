@@ -0,0 +1,59 @@
+import os
+from utils.cache import env_int
+from utils.dynamo import batch_get_items
+from utils.inventory import apply_shard_totals
+from utils.pagination import get_query_params
+from utils.response import JSON_HEADERS, error_response, respond, success_body
+
+events_table_name = os.environ['EVENTS_TABLE']
+inventory_table_name = os.environ['INVENTORY_TABLE']
+
+# One BatchGetItem request
+MAX_IDS = 100
+# Counts move with every purchase: browsers and caches may reuse them briefly
+AVAILABILITY_MAX_AGE_SECONDS = env_int('AVAILABILITY_MAX_AGE_SECONDS', 5)
+
+AVAILABILITY_HEADERS = {
+    **JSON_HEADERS,
+    "Cache-Control": f"public, max-age={AVAILABILITY_MAX_AGE_SECONDS}"
+}
+
+
+def parse_ids(raw):
+    """Distinct, non-empty eventIds of a comma-separated list, in request order."""
+    ids = []
+    for event_id in (raw or '').split(','):
+        event_id = event_id.strip()
+        if event_id and event_id not in ids:
+            ids.append(event_id)
+    return ids
+
+
+def lambda_handler(event, context):
+    """
+    GET /availability?ids=e001,e002,...
+    Remaining tickets of up to MAX_IDS events, for pages that poll counts:
+    {"success": true, "data": {"e001": 120, "e002": 0}}
+    Unknown eventIds are left out. Only eventId, remainingTickets and
+    inventoryShards are read (one BatchGetItem, plus one for the shard
+    counters of sharded events).
+    """
+    try:
+        event_ids = parse_ids(get_query_params(event).get('ids'))
+        if not event_ids:
+            return error_response(400, "ids is required")
+        if len(event_ids) > MAX_IDS:
+            return error_response(400, f"At most {MAX_IDS} ids per request")
+
+        items = batch_get_items(
+            events_table_name,
+            [{'eventId': event_id} for event_id in event_ids],
+            projection='eventId, remainingTickets, inventoryShards'
+        )
+        # Sharded events: remainingTickets is the sum of the shard counters
+        apply_shard_totals(inventory_table_name, items)
+
+        counts = {item['eventId']: int(item.get('remainingTickets', 0)) for item in items}
+        return respond(200, success_body(counts), AVAILABILITY_HEADERS)
+    except Exception as e:
+        return error_response(500, str(e))
@@ -0,0 +1,24 @@
+import os
+from utils.catalog_feed import record_changes
+from utils.dynamo import Table
+from utils.events import changed_event_ids
+
+catalog_changes_table = Table(os.environ['CATALOG_CHANGES_TABLE'])
+
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer on EventsTable
+    Appends every event whose catalog entry changed (inserted, edited or
+    removed; ticket-count updates excluded) to the catalog change feed, from
+    which warm search containers refresh their index incrementally.
+
+    Error handling: any failure fails the batch and the stream retries it;
+    recording a change twice only makes a container re-read that event.
+    """
+    records = event.get('Records', [])
+    changed, removed = changed_event_ids(records)
+    record_changes(catalog_changes_table, changed | removed)
+
+    print(f"Change feed summary: Records={len(records)}, Changed={len(changed)}, Removed={len(removed)}")
+    return {'changes': len(changed) + len(removed)}
@@ -0,0 +1,106 @@
+import gzip
+import os
+from datetime import datetime, timezone
+from utils import clients
+from utils.cache import env_int
+from utils.dynamo import Table
+from utils.events import changed_event_ids
+from utils.inventory import apply_shard_totals
+from utils.serialization import dumps, project_event
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+inventory_table_name = os.environ['INVENTORY_TABLE']
+bucket_name = os.environ['CATALOG_BUCKET']
+
+# Keys in the frontend bucket (FrontendStack deploys everything else and
+# leaves this prefix alone)
+CATALOG_PREFIX = 'catalog/'
+CATALOG_KEY = f'{CATALOG_PREFIX}events.json'
+# CloudFront and browsers may serve a snapshot this long after it changed
+SNAPSHOT_MAX_AGE_SECONDS = env_int('SNAPSHOT_MAX_AGE_SECONDS', 60)
+
+
+def event_key(event_id):
+    """Key of an event's own snapshot, read by the event detail page."""
+    return f'{CATALOG_PREFIX}events/{event_id}.json'
+
+
+def read_catalog():
+    """All events, sharded stock summed, upcoming first."""
+    items, kwargs = [], {}
+    while True:
+        response = events_table.scan(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    apply_shard_totals(inventory_table_name, items)
+    items.sort(key=lambda item: (item.get('date', ''), item['eventId']))
+    return items
+
+
+def put_json(key, value):
+    """Write a gzip'd JSON object that CloudFront serves as is."""
+    clients.client('s3').put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=gzip.compress(dumps(value).encode('utf-8')),
+        ContentType='application/json',
+        ContentEncoding='gzip',
+        CacheControl=f'public, max-age={SNAPSHOT_MAX_AGE_SECONDS}'
+    )
+
+
+def publish(items, event_ids):
+    """Write catalog/events.json and the snapshots of event_ids."""
+    events = [project_event(item) for item in items]
+    put_json(CATALOG_KEY, {
+        'generatedAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
+        'events': events
+    })
+    for event in events:
+        if event['eventId'] in event_ids:
+            put_json(event_key(event['eventId']), event)
+
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer on EventsTable
+    Regenerates the catalog snapshot in the frontend bucket, which CloudFront
+    serves to anonymous browsers (frontend/api.js reads it before falling back
+    to GET /events):
+    - catalog/events.json - every event
+    - catalog/events/<eventId>.json - one event, rewritten when it changes
+    Invoke with {"full": true} to rewrite every per-event snapshot (e.g. after
+    the first deployment).
+
+    Cost: every batch with a non-inventory change rescans EventsTable (and
+    the sharded events' InventoryTable items) and rewrites events.json,
+    whatever the number of changed events. The event source's 5 s batching
+    window coalesces bursts, so this runs at most about once per window and
+    stream shard; purchases only change ticket counts and never trigger it.
+
+    Error handling: any failure fails the batch and the stream retries it;
+    rebuilding a snapshot is idempotent.
+    """
+    if event.get('full'):
+        items = read_catalog()
+        publish(items, {item['eventId'] for item in items})
+        print(f"Snapshot summary: Events={len(items)}, Rewritten={len(items)}")
+        return {'events': len(items)}
+
+    records = event.get('Records', [])
+    changed, removed = changed_event_ids(records)
+    if not changed and not removed:
+        print(f"Snapshot summary: Records={len(records)}, inventory-only changes, skipped")
+        return {'events': 0}
+
+    items = read_catalog()
+    publish(items, changed)
+    s3 = clients.client('s3')
+    for event_id in removed:
+        s3.delete_object(Bucket=bucket_name, Key=event_key(event_id))
+
+    print(f"Snapshot summary: Records={len(records)}, Events={len(items)}, "
+          f"Changed={len(changed)}, Removed={len(removed)}")
+    return {'events': len(items)}
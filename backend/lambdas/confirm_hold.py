@@ -0,0 +1,97 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from utils.auth import verify_token, auth_response_401
+from utils.dynamo import Table, to_attribute_values, transact_write
+from utils.holds import HELD, CONFIRMED, confirm_hold
+from utils.order_status import PENDING
+from utils.response import error_response, success_response
+
+holds_table = Table(os.environ['HOLDS_TABLE'])
+holds_table_name = os.environ['HOLDS_TABLE']
+orders_table_name = os.environ['ORDERS_TABLE']
+
+
+def _order_id(hold_id):
+    """Deterministic orderId per hold, so a retried confirm cannot create a second order."""
+    return f"o{hashlib.sha256(f'hold:{hold_id}'.encode('utf-8')).hexdigest()[:12]}"
+
+
+def _settled_response(hold, user_id, now):
+    """
+    Response for a hold that cannot be confirmed (again), or None if it is
+    still live and held.
+    """
+    if hold is None or hold.get('userId') != user_id:
+        return error_response(404, "Hold not found")
+    if hold.get('holdState') == CONFIRMED:
+        # Retried confirm: answer with the order the first one created
+        return _confirmed_response(hold['holdId'], hold['orderId'])
+    if hold.get('holdState') != HELD or int(hold.get('expiresAt', 0)) <= now:
+        return error_response(410, "Hold has expired")
+    return None
+
+
+def _confirmed_response(hold_id, order_id):
+    return success_response({
+        "orderId": order_id,
+        "holdId": hold_id,
+        "message": "Purchase successful"
+    })
+
+
+def lambda_handler(event, context):
+    """
+    POST /holds/{holdId}/confirm
+    Converts a live hold into a pending order. The hold update and the order
+    insert are one transaction; the order then flows through the OrdersTable
+    stream -> order_publisher -> SQS -> order_consumer like any purchase.
+    Tickets were already taken when the hold was created.
+    """
+    try:
+        # Authenticate user from token
+        try:
+            user_id = verify_token(event)
+        except:
+            return auth_response_401()
+
+        hold_id = (event.get('pathParameters') or {}).get('holdId')
+        if not hold_id:
+            return error_response(400, "holdId is required")
+
+        now = int(time.time())
+        hold = holds_table.get_item(Key={'holdId': hold_id}, ConsistentRead=True).get('Item')
+        settled = _settled_response(hold, user_id, now)
+        if settled is not None:
+            return settled
+
+        order_item = {
+            'orderId': _order_id(hold_id),
+            'userId': user_id,
+            'eventId': hold['eventId'],
+            'quantity': int(hold['quantity']),
+            'holdId': hold_id,
+            'createdAt': datetime.now(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z'),
+            'status': PENDING
+        }
+        if hold.get('unitPrice') is not None:
+            order_item['unitPrice'] = hold['unitPrice']
+        codes = transact_write([
+            confirm_hold(holds_table_name, hold_id, user_id, order_item['orderId'], now),
+            {
+                'Put': {
+                    'TableName': orders_table_name,
+                    'Item': to_attribute_values(order_item),
+                    'ConditionExpression': 'attribute_not_exists(orderId)'
+                }
+            }
+        ])
+        if codes is None:
+            return _confirmed_response(hold_id, order_item['orderId'])
+
+        # Lost a race with a concurrent confirm or with expiry
+        hold = holds_table.get_item(Key={'holdId': hold_id}, ConsistentRead=True).get('Item')
+        return _settled_response(hold, user_id, now) or error_response(409, "Hold could not be confirmed")
+    except Exception as e:
+        return error_response(500, str(e))
@@ -0,0 +1,91 @@
+import json
+import os
+import uuid
+from utils.auth import verify_token, auth_response_401
+from utils.dynamo import Table, transact_write
+from utils.events import load_event
+from utils.holds import HOLD_TTL_SECONDS, new_hold, put_hold
+from utils.inventory import decrement_targets, decrement_item
+from utils.rate_limit import (
+    PURCHASE_PER_USER, PURCHASE_PER_EVENT, RateLimited, enforce, rate_limited_response
+)
+from utils.response import error_response, success_response
+from utils.serialization import project_hold
+from utils.waiting_room import AdmissionDenied, check_admission
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+events_table_name = os.environ['EVENTS_TABLE']
+inventory_table_name = os.environ['INVENTORY_TABLE']
+holds_table_name = os.environ['HOLDS_TABLE']
+
+
+def lambda_handler(event, context):
+    """
+    POST /holds
+    Reserves tickets for HOLD_TTL_SECONDS while the buyer checks out: the
+    inventory decrement and the hold are written in one transaction. The
+    hold is turned into an order by POST /holds/{holdId}/confirm; otherwise
+    hold_expiry returns the tickets once it expires.
+    """
+    try:
+        # Authenticate user from token
+        try:
+            user_id = verify_token(event)
+        except:
+            return auth_response_401()
+
+        # Parse body: eventId, quantity
+        body = json.loads(event.get('body') or '{}')
+        event_id = body.get('eventId', '')
+
+        try:
+            quantity = int(body.get('quantity', 0))
+        except (ValueError, TypeError):
+            quantity = 0
+
+        if not event_id or quantity <= 0:
+            return error_response(400, "eventId and quantity (positive) are required")
+
+        # Holds take stock like purchases and share their buckets
+        try:
+            enforce(
+                (f"purchase#user#{user_id}", PURCHASE_PER_USER),
+                (f"purchase#event#{event_id}", PURCHASE_PER_EVENT)
+            )
+        except RateLimited as e:
+            return rate_limited_response(e)
+
+        # Static fields come from the warm cache, checked against the item's
+        # metaVersion: re-sharding or toggling the waiting room takes effect
+        # at once instead of after the cache TTL
+        event_item = load_event(events_table, event_id)
+        if event_item is None:
+            return error_response(404, "Event not found")
+
+        # Waiting-room events only accept admitted buyers
+        try:
+            check_admission(event, event_item, user_id)
+        except AdmissionDenied as e:
+            return error_response(403, str(e))
+
+        hold_id = f"h{uuid.uuid4().hex[:12]}"
+
+        # Sharded events fall back to other shards when one is exhausted; the
+        # hold remembers its shard so expiry returns stock to the same item
+        for shard_id in decrement_targets(event_item):
+            hold = new_hold(hold_id, user_id, event_id, quantity, shard_id,
+                            unit_price=event_item.get('price'))
+            codes = transact_write([
+                decrement_item(events_table_name, inventory_table_name,
+                               event_id, shard_id, quantity),
+                put_hold(holds_table_name, hold)
+            ])
+            if codes is None:
+                return success_response({
+                    **project_hold(hold),
+                    "holdSeconds": HOLD_TTL_SECONDS
+                })
+
+        return error_response(400, "Not enough tickets available")
+    except Exception as e:
+        return error_response(500, str(e))
@@ -0,0 +1,67 @@
+import os
+from utils.auth import verify_token, auth_response_401
+from utils.dynamo import Table
+from utils.event_stats import read_stats
+from utils.events import load_static
+from utils.pagination import get_query_params
+from utils.response import error_response, success_response
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+stats_table = Table(os.environ['EVENT_STATS_TABLE'])
+
+# Users allowed to read sales figures (comma-separated userIds); none by default
+ORGANIZER_USER_IDS = frozenset(
+    user_id.strip() for user_id in os.environ.get('ORGANIZER_USER_IDS', '').split(',') if user_id.strip()
+)
+
+DEFAULT_HOURS = 24
+# One week of hourly buckets
+MAX_HOURS = 168
+
+
+def _parse_hours(raw):
+    """Validated `hours` query parameter, or None if invalid."""
+    if raw in (None, ''):
+        return DEFAULT_HOURS
+    try:
+        hours = int(raw)
+    except (TypeError, ValueError):
+        return None
+    return hours if 1 <= hours <= MAX_HOURS else None
+
+
+def lambda_handler(event, context):
+    """
+    GET /events/{eventId}/stats?hours=24
+    Sales of one event from the pre-aggregated counters that order_consumer
+    maintains (utils/event_stats.py): tickets sold, revenue and orders, plus
+    sales velocity over the last `hours` hourly buckets:
+    {"success": true, "data": {"tickets": n, "revenue": x, "orders": n,
+     "velocity": {...}, "hourly": [{"hour": "YYYY-MM-DDTHH", ...}]}}
+    Counts confirmed orders only; pending orders appear once confirmed.
+    Restricted to the organizers listed in ORGANIZER_USER_IDS.
+    """
+    try:
+        # Authenticate user from token
+        try:
+            user_id = verify_token(event)
+        except:
+            return auth_response_401()
+        if user_id not in ORGANIZER_USER_IDS:
+            return error_response(403, "Sales stats are only available to organizers")
+
+        event_id = (event.get('pathParameters') or {}).get('eventId')
+        if not event_id:
+            return error_response(400, "eventId is required")
+
+        hours = _parse_hours(get_query_params(event).get('hours'))
+        if hours is None:
+            return error_response(400, f"hours must be between 1 and {MAX_HOURS}")
+
+        # Static fields come from the warm cache
+        if load_static(events_table, event_id) is None:
+            return error_response(404, "Event not found")
+
+        return success_response(read_stats(stats_table, event_id, hours))
+    except Exception as e:
+        return error_response(500, str(e))
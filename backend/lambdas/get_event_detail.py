@@ -1,81 +1,31 @@
-import json
-import boto3
 import os
+from utils.dynamo import Table
+from utils.events import event_cache, load_event
+from utils.inventory import apply_shard_totals
+from utils.response import error_response, success_response
+from utils.serialization import project_event
 
-dynamodb = boto3.resource('dynamodb')
-events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+events_table = Table(os.environ['EVENTS_TABLE'])
+inventory_table_name = os.environ['INVENTORY_TABLE']
 
 def lambda_handler(event, context):
     try:
         # Read eventId from pathParameters
-        event_id = event.get('pathParameters', {}).get('eventId')
+        event_id = (event.get('pathParameters') or {}).get('eventId')
         
         if not event_id:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "eventId is required"
-                })
-            }
+            return error_response(400, "eventId is required")
         
-        # Get item from EventsTable
-        response = events_table.get_item(Key={'eventId': event_id})
+        # Get item from EventsTable (static fields served from the warm cache)
+        item = load_event(events_table, event_id)
+        event_cache.log_stats()
         
-        if 'Item' not in response:
-            return {
-                "statusCode": 404,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "Event not found"
-                })
-            }
+        if item is None:
+            return error_response(404, "Event not found")
         
-        item = response['Item']
-        event_detail = {
-            'eventId': item.get('eventId'),
-            'name': item.get('name', ''),
-            'description': item.get('description', ''),
-            'imageUrl': item.get('imageUrl', ''),
-            'remainingTickets': int(item.get('remainingTickets', 0)) if 'remainingTickets' in item else 0,
-            'performer': item.get('performer', ''),
-            'venue': item.get('venue', ''),
-            'city': item.get('city', ''),
-            'date': item.get('date', ''),
-            'price': float(item.get('price', 0)) if 'price' in item else 0,
-            'category': item.get('category', '')
-        }
-        
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": event_detail
-            })
-        }
+        # Sharded events: remainingTickets is the sum of the shard counters
+        apply_shard_totals(inventory_table_name, [item])
+
+        return success_response(project_event(item))
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
\ No newline at end of file
+        return error_response(500, str(e))
@@ -1,56 +1,141 @@
-import json
-import boto3
 import os
+from datetime import date
+from utils.cache import TTLCache, env_int
+from utils.dynamo import Table
+from utils.events import event_cache, load_events, remember
+from utils.inventory import apply_shard_totals
+from utils.pagination import (
+    InvalidPageRequest, get_query_params, parse_limit, encode_token, decode_token, read_page
+)
+from utils.response import error_response, success_response
+from utils.serialization import project_event
 
-dynamodb = boto3.resource('dynamodb')
-events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+events_table = Table(os.environ['EVENTS_TABLE'])
+inventory_table_name = os.environ['INVENTORY_TABLE']
 
-def lambda_handler(event, context):
+# GSIs on EventsTable (see TicketingStack): partition by the filter, sort by date
+CATEGORY_INDEX = 'CategoryDateIndex'
+CITY_INDEX = 'CityDateIndex'
+
+# Listing results (eventIds + nextToken) per distinct query; the events on a
+# cached page are re-hydrated through the shared event cache, so only their
+# inventory counters are read from DynamoDB
+catalog_page_cache = TTLCache(
+    'catalog_pages',
+    max_entries=env_int('CATALOG_PAGE_CACHE_MAX_ENTRIES', 256),
+    ttl_seconds=env_int('EVENT_CACHE_TTL_SECONDS', 60)
+)
+
+
+def _parse_date(value, name):
+    """Validate an optional YYYY-MM-DD query parameter."""
+    if not value:
+        return None
     try:
-        # Scan EventsTable to get all events
-        response = events_table.scan()
-        events = response.get('Items', [])
-        
-        # Transform DynamoDB items into API output format
-        # DynamoDB returns numbers as Decimal, convert to int
-        formatted_events = []  # list to collect normalized event records
-        for item in events:
-            formatted_events.append({
-                'eventId': item.get('eventId'),
-                'name': item.get('name', ''),
-                'description': item.get('description', ''),
-                'imageUrl': item.get('imageUrl', ''),
-                'remainingTickets': int(item.get('remainingTickets', 0)) if 'remainingTickets' in item else 0,
-                'performer': item.get('performer', ''),
-                'venue': item.get('venue', ''),
-                'city': item.get('city', ''),
-                'date': item.get('date', ''),
-                'price': float(item.get('price', 0)) if 'price' in item else 0,
-                'category': item.get('category', '')
-            })
-        
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": formatted_events
-            })
+        date.fromisoformat(value)
+    except ValueError:
+        raise InvalidPageRequest(f"{name} must be a date in YYYY-MM-DD format")
+    return value
+
+
+def _date_condition(start_date, end_date):
+    """
+    Condition on the `date` attribute, usable as a sort-key condition or a filter.
+    Returns: (expression or None, attribute values)
+    """
+    if start_date and end_date:
+        return '#date BETWEEN :startDate AND :endDate', {':startDate': start_date, ':endDate': end_date}
+    if start_date:
+        return '#date >= :startDate', {':startDate': start_date}
+    if end_date:
+        return '#date <= :endDate', {':endDate': end_date}
+    return None, {}
+
+
+def _build_request(category, city, start_date, end_date):
+    """
+    Choose Query (category/city filter, backed by a GSI) or Scan (no filter).
+    Returns: (operation, request kwargs, key attributes carried by LastEvaluatedKey)
+    """
+    date_condition, values = _date_condition(start_date, end_date)
+    # `date` is a DynamoDB reserved word
+    names = {'#date': 'date'} if date_condition else {}
+
+    if category or city:
+        if category:
+            index_name, partition = CATEGORY_INDEX, ('category', category)
+            key_names = ['eventId', 'category', 'date']
+        else:
+            index_name, partition = CITY_INDEX, ('city', city)
+            key_names = ['eventId', 'city', 'date']
+        names['#pk'], values[':pk'] = partition
+        key_condition = '#pk = :pk'
+
+        # Date range is pushed into the sort-key condition
+        if date_condition:
+            key_condition = f"{key_condition} AND {date_condition}"
+
+        kwargs = {
+            'IndexName': index_name,
+            'KeyConditionExpression': key_condition,
+            # Upcoming events first
+            'ScanIndexForward': True
         }
+        if category and city:
+            kwargs['FilterExpression'] = '#city = :city'
+            names['#city'], values[':city'] = 'city', city
+        operation = events_table.query
+    else:
+        kwargs = {}
+        if date_condition:
+            kwargs['FilterExpression'] = date_condition
+        operation, key_names = events_table.scan, ['eventId']
+
+    if names:
+        kwargs['ExpressionAttributeNames'] = names
+        kwargs['ExpressionAttributeValues'] = values
+    return operation, kwargs, key_names
+
+
+def lambda_handler(event, context):
+    try:
+        params = get_query_params(event)
+        category = params.get('category')
+        city = params.get('city')
+
+        try:
+            limit = parse_limit(params.get('limit'))
+            start_date = _parse_date(params.get('startDate'), 'startDate')
+            end_date = _parse_date(params.get('endDate'), 'endDate')
+            operation, kwargs, key_names = _build_request(category, city, start_date, end_date)
+            start_key = decode_token(params.get('nextToken'), key_names)
+        except InvalidPageRequest as e:
+            return error_response(400, str(e))
+
+        page_key = (category, city, start_date, end_date, limit, params.get('nextToken'))
+        cached_page = catalog_page_cache.get(page_key)
+        if cached_page is not None:
+            event_ids, last_key = cached_page
+            events_by_id = load_events(events_table.name, event_ids)
+            events = [events_by_id[eid] for eid in event_ids if eid in events_by_id]
+        else:
+            if start_key:
+                kwargs['ExclusiveStartKey'] = start_key
+
+            events, last_key = read_page(operation, kwargs, key_names, limit)
+            for item in events:
+                remember(item)
+            catalog_page_cache.put(page_key, ([item['eventId'] for item in events], last_key))
+
+        catalog_page_cache.log_stats()
+        event_cache.log_stats()
+
+        # Sharded events: remainingTickets is the sum of the shard counters
+        apply_shard_totals(inventory_table_name, events)
+
+        return success_response(
+            [project_event(item) for item in events],
+            nextToken=encode_token(last_key)
+        )
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
\ No newline at end of file
+        return error_response(500, str(e))
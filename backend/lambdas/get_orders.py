@@ -1,27 +1,157 @@
-import json
-from datetime import datetime
+from datetime import datetime, timezone
 
-import boto3
 import os
 
-from decimal import Decimal
 from utils.auth import verify_token, auth_response_401
+from utils.cache import TTLCache, env_int
+from utils.dynamo import Table, batch_get_items
+from utils.order_status import ORDER_STATUSES
+from utils.order_summary import (
+    ORDER_EVENT_FIELDS, EVENT_PROJECTION, EVENT_PROJECTION_NAMES, page_key
+)
+from utils.pagination import (
+    InvalidPageRequest, get_query_params, parse_limit, encode_token, decode_token, read_page
+)
+from utils.response import error_response, success_response
+from utils.serialization import ORDER_EVENT_CONVERTERS, project_event, project_order
 
 
-def _normalize_decimals(value):
-    """Recursively convert DynamoDB Decimals into int/float for JSON serialization."""
-    if isinstance(value, list):
-        return [_normalize_decimals(v) for v in value]
-    if isinstance(value, dict):
-        return {k: _normalize_decimals(v) for k, v in value.items()}
-    if isinstance(value, Decimal):
-        # If it's an integer-like decimal, cast to int, otherwise to float
-        return int(value) if value % 1 == 0 else float(value)
-    return value
+orders_table = Table(os.environ['ORDERS_TABLE'])
+summary_table = Table(os.environ['ORDER_SUMMARY_TABLE'])
+events_table_name = os.environ['EVENTS_TABLE']
 
-dynamodb = boto3.resource('dynamodb')
-orders_table = dynamodb.Table(os.environ['ORDERS_TABLE'])
-events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
+# Attributes of a UserOrdersIndex LastEvaluatedKey (table key + index keys)
+ORDER_PAGE_KEY = ['orderId', 'userId', 'createdAt']
+
+# Projected events are cached per container; the order list does not show
+# remainingTickets, so a warm hit needs no DynamoDB read at all
+order_event_cache = TTLCache(
+    'order_events',
+    max_entries=env_int('EVENT_CACHE_MAX_ENTRIES', 1024),
+    ttl_seconds=env_int('EVENT_CACHE_TTL_SECONDS', 60)
+)
+
+
+def _load_order_events(event_ids):
+    """
+    Hydrate events for the order list: cached ones from memory, the rest with
+    chunked BatchGetItem.
+    Returns: dict of eventId -> projected event item
+    """
+    events = {}
+    missing = []
+    for event_id in event_ids:
+        cached = order_event_cache.get(event_id)
+        if cached is not None:
+            events[event_id] = cached
+        else:
+            missing.append({'eventId': event_id})
+
+    fetched = batch_get_items(
+        events_table_name, missing,
+        projection=EVENT_PROJECTION,
+        attribute_names=EVENT_PROJECTION_NAMES
+    )
+    for item in fetched:
+        order_event_cache.put(item['eventId'], item)
+        events[item['eventId']] = item
+    return events
+
+
+def _parse_timestamp(value, name, end_of_day=False):
+    """
+    Validate an optional since/until parameter (ISO date or timestamp) and
+    return it in the string form of createdAt (UTC, always with
+    microseconds), so it compares correctly against the sort key.
+    end_of_day: upper bound; a bare date covers the whole day and a
+                timestamp without fractional seconds the whole second
+    """
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise InvalidPageRequest(f"{name} must be an ISO 8601 date or timestamp")
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    if end_of_day:
+        if len(value) == 10:
+            dt = dt.replace(hour=23, minute=59, second=59)
+        if dt.microsecond == 0 and '.' not in value:
+            dt = dt.replace(microsecond=999999)
+    return dt.strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _build_query(user_id, params):
+    """Translate limit/nextToken/since/until/status into UserOrdersIndex query kwargs."""
+    limit = parse_limit(params.get('limit'))
+    since = _parse_timestamp(params.get('since'), 'since')
+    until = _parse_timestamp(params.get('until'), 'until', end_of_day=True)
+    status = params.get('status')
+    if status and status not in ORDER_STATUSES:
+        raise InvalidPageRequest(f"status must be one of: {', '.join(ORDER_STATUSES)}")
+
+    # Time window is pushed into the createdAt sort-key condition
+    key_condition = 'userId = :userId'
+    values = {':userId': user_id}
+    if since and until:
+        key_condition += ' AND createdAt BETWEEN :since AND :until'
+        values.update({':since': since, ':until': until})
+    elif since:
+        key_condition += ' AND createdAt >= :since'
+        values[':since'] = since
+    elif until:
+        key_condition += ' AND createdAt <= :until'
+        values[':until'] = until
+
+    kwargs = {
+        'IndexName': 'UserOrdersIndex',
+        'KeyConditionExpression': key_condition,
+        'ExpressionAttributeValues': values,
+        # Sort descending by createdAt (newest first)
+        'ScanIndexForward': False
+    }
+    if status:
+        # `status` is a DynamoDB reserved word
+        kwargs['FilterExpression'] = '#status = :status'
+        kwargs['ExpressionAttributeNames'] = {'#status': 'status'}
+        values[':status'] = status
+
+    start_key = decode_token(params.get('nextToken'), ORDER_PAGE_KEY)
+    if start_key:
+        # A token minted for another user must not page through their history
+        if start_key['userId'] != user_id:
+            raise InvalidPageRequest("nextToken is invalid")
+        kwargs['ExclusiveStartKey'] = start_key
+    return kwargs, limit
+
+
+def _summary_page(user_id, params):
+    """
+    First page of an unfiltered listing from the user's order summary, in
+    a single get_item (see order_summarizer).
+    Returns: (orders, last key, totals), or None when the summary cannot
+    answer: filters, deeper pages, no summary yet, or a limit beyond it
+    """
+    if any(params.get(name) for name in ('nextToken', 'since', 'until', 'status')):
+        return None
+    limit = parse_limit(params.get('limit'))
+    summary = summary_table.get_item(Key={'userId': user_id}).get('Item')
+    if summary is None:
+        return None
+
+    entries = summary.get('orders', [])
+    if limit > len(entries) and summary.get('hasMore'):
+        return None
+    page = entries[:limit]
+    more = len(entries) > limit or summary.get('hasMore')
+    totals = {
+        'orderCount': summary.get('orderCount', 0),
+        'ticketCount': summary.get('ticketCount', 0),
+        'totalSpend': summary.get('totalSpend', 0)
+    }
+    # Deeper pages continue on UserOrdersIndex after the last entry shown
+    return page, page_key(page[-1]) if more and page else None, totals
 
 
 def lambda_handler(event, context):
@@ -32,63 +162,41 @@ def lambda_handler(event, context):
         except:
             return auth_response_401()
 
-        # Query orders by userId using GSI (UserOrdersIndex)
+        params = get_query_params(event)
+        try:
+            query_kwargs, limit = _build_query(user_id, params)
+        except InvalidPageRequest as e:
+            return error_response(400, str(e))
+
+        summary_page = _summary_page(user_id, params)
+        if summary_page is not None:
+            entries, last_key, totals = summary_page
+            return success_response(
+                [project_order(entry, event=project_event(
+                    entry['event'], ORDER_EVENT_FIELDS, ORDER_EVENT_CONVERTERS
+                ) if entry.get('event') else {}) for entry in entries],
+                nextToken=encode_token(last_key),
+                totals=totals
+            )
+
+        # Query one page of orders by userId using GSI (UserOrdersIndex)
         # GSI: partition key = userId, sort key = createdAt
-        response = orders_table.query(
-            IndexName='UserOrdersIndex',
-            KeyConditionExpression='userId = :uid',
-            ExpressionAttributeValues={':uid': user_id},
-            # Sort descending by createdAt (newest first)
-            ScanIndexForward=False
-        )
+        orders, last_key = read_page(orders_table.query, query_kwargs, ORDER_PAGE_KEY, limit)
 
-        orders = response.get('Items', [])
+        # Hydrate each distinct event once instead of one get_item per order
+        event_ids = {item['eventId'] for item in orders if item.get('eventId')}
+        events_by_id = _load_order_events(event_ids)
+        order_event_cache.log_stats()
 
         # Format orders for API response
         formatted_orders = []
         for item in orders:
-            event_id = item.get('eventId')
-            quantity = int(item.get('quantity', 0)) if 'quantity' in item else 0
-            raw_created_at = item.get('createdAt', '')
-            formatted_created_at = raw_created_at
-            try:
-                dt = datetime.fromisoformat(raw_created_at.replace('Z', '+00:00'))
-                formatted_created_at = dt.strftime("%Y-%m-%d %H:%M:%S")
-            except Exception:
-                pass
-            raw_event_item = events_table.get_item(Key={'eventId': event_id}).get('Item', {})
-            event_item = _normalize_decimals(raw_event_item)
-
-            formatted_orders.append({
-                'orderId': item.get('orderId'),
-                'eventId': event_id,
-                'quantity': quantity,
-                'createdAt': formatted_created_at,
-                'event': event_item
-            })
-
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": formatted_orders
-            })
-        }
+            event_item = events_by_id.get(item.get('eventId'))
+            formatted_orders.append(project_order(
+                item,
+                event=project_event(event_item, ORDER_EVENT_FIELDS, ORDER_EVENT_CONVERTERS) if event_item else {}
+            ))
+
+        return success_response(formatted_orders, nextToken=encode_token(last_key))
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
+        return error_response(500, str(e))
@@ -0,0 +1,102 @@
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from utils.cache import env_int
+from utils.dynamo import Table, transact_write
+from utils.holds import EXPIRY_INDEX, EXPIRY_PARTITIONS, release_hold
+from utils.inventory import increment_item
+
+holds_table = Table(os.environ['HOLDS_TABLE'])
+holds_table_name = os.environ['HOLDS_TABLE']
+events_table_name = os.environ['EVENTS_TABLE']
+inventory_table_name = os.environ['INVENTORY_TABLE']
+
+# Expired holds are released concurrently
+MAX_WORKERS = env_int('EXPIRY_MAX_WORKERS', 16)
+
+# Per-hold outcomes
+RELEASED = 'released'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+def _expired_holds(partition, now):
+    """Held holds of one ExpiringHoldsIndex partition whose deadline has passed."""
+    kwargs = {
+        'IndexName': EXPIRY_INDEX,
+        'KeyConditionExpression': 'expiryPartition = :partition AND expiresAt <= :now',
+        'ExpressionAttributeValues': {':partition': partition, ':now': now}
+    }
+    holds = []
+    while True:
+        response = holds_table.query(**kwargs)
+        holds.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return holds
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _release(hold, now):
+    """
+    Release one hold and return its tickets in a single transaction.
+    Returns: RELEASED, SKIPPED or FAILED
+    """
+    hold_id = hold['holdId']
+    try:
+        shard_id = int(hold['shardId']) if 'shardId' in hold else None
+        restock = increment_item(events_table_name, inventory_table_name,
+                                 hold['eventId'], shard_id, int(hold['quantity']))
+        codes = transact_write([release_hold(holds_table_name, hold_id, now), restock])
+        if codes is None:
+            print(f"SUCCESS: Released hold {hold_id} ({hold['quantity']} tickets of {hold['eventId']})")
+            return RELEASED
+
+        hold_code, inventory_code = codes
+        if hold_code == 'ConditionalCheckFailed':
+            # The index is eventually consistent: confirmed or released meanwhile
+            print(f"SKIP: Hold {hold_id} is no longer held")
+            return SKIPPED
+
+        # Inventory item is gone (event deleted): release without restocking
+        print(f"WARNING: Inventory of {hold['eventId']} not found ({inventory_code}); "
+              f"releasing hold {hold_id} without restocking")
+        codes = transact_write([release_hold(holds_table_name, hold_id, now)])
+        return RELEASED if codes is None else SKIPPED
+    except Exception as e:
+        print(f"ERROR: Failed to release hold {hold_id}: {str(e)}")
+        print(f"Traceback: {traceback.format_exc()}")
+        return FAILED
+
+
+def lambda_handler(event, context):
+    """
+    Scheduled hold expiry worker (EventBridge, every minute)
+    Finds held holds past their deadline through the sparse ExpiringHoldsIndex
+    and releases each one: holdState -> released and the tickets go back to
+    the inventory item (EventsTable or shard) they were taken from, in one
+    transaction conditional on the hold still being held, so a hold confirmed
+    at the last moment is never restocked.
+
+    Failed releases stay in the index and are retried on the next run.
+    """
+    now = int(time.time())
+    expired = []
+    for partition in range(EXPIRY_PARTITIONS):
+        expired.extend(_expired_holds(partition, now))
+
+    if len(expired) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(expired))) as executor:
+            outcomes = list(executor.map(lambda hold: _release(hold, now), expired))
+    else:
+        outcomes = [_release(hold, now) for hold in expired]
+
+    summary = {
+        'expired': len(expired),
+        'released': outcomes.count(RELEASED),
+        'skipped': outcomes.count(SKIPPED),
+        'failed': outcomes.count(FAILED)
+    }
+    print(f"Expiry summary: Expired={summary['expired']}, Released={summary['released']}, "
+          f"Skipped={summary['skipped']}, Failed={summary['failed']}")
+    return summary
@@ -1,9 +1,12 @@
 import json
-import boto3
 import os
+from utils.auth import issue_token
+from utils.dynamo import Table
+from utils.passwords import check_user_password, hash_password
+from utils.rate_limit import LOGIN_PER_CLIENT, RateLimited, enforce, rate_limited_response, source_ip
+from utils.response import CORS_HEADERS, error_response, success_response
 
-dynamodb = boto3.resource("dynamodb")
-users_table = dynamodb.Table(os.environ["USERS_TABLE"])
+users_table = Table(os.environ["USERS_TABLE"])
 
 def lambda_handler(event, context):
     try:
@@ -14,64 +17,37 @@ def lambda_handler(event, context):
         password = body.get("password", "")
 
         if not user_id or not password:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                    "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "Missing userId or password"
-                })
-            }
+            return error_response(400, "Missing userId or password", CORS_HEADERS)
 
-        user = users_table.get_item(Key={"userId": user_id}).get("Item")
-
-        if not user or user.get("password") != password:
-            return {
-                "statusCode": 401,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                    "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "Invalid userId or password"
-                })
-            }
+        # Per source IP and userId: guessing is slowed down without letting
+        # others lock the user out
+        try:
+            enforce((f"login#ip#{source_ip(event)}#user#{user_id}", LOGIN_PER_CLIENT))
+        except RateLimited as e:
+            return rate_limited_response(e)
 
-        token = f"token-{user_id}"
+        user = users_table.get_item(Key={"userId": user_id}).get("Item")
 
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": {
-                    "token": token,
-                    "userId": user_id
-                }
-            })
-        }
+        matches, rehash = check_user_password(user, password)
+        if not matches:
+            return error_response(401, "Invalid userId or password", CORS_HEADERS)
+
+        # Upgrade plaintext or outdated hashes now that we know the password
+        if rehash:
+            try:
+                users_table.update_item(
+                    Key={"userId": user_id},
+                    UpdateExpression="SET passwordHash = :hash REMOVE password",
+                    ExpressionAttributeValues={":hash": hash_password(password)}
+                )
+            except Exception as e:
+                print(f"WARNING: Failed to rehash password for {user_id}: {str(e)}")
+
+        token = issue_token(user_id)
+
+        return success_response({
+            "token": token,
+            "userId": user_id
+        })
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
\ No newline at end of file
+        return error_response(500, str(e))
@@ -1,104 +1,171 @@
 import json
-import boto3
 import os
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
 from botocore.exceptions import ClientError
+from utils import clients
+from utils.cache import TTLCache, env_int
+from utils.dynamo import Table
+from utils.event_stats import counter_updates
+from utils.events import load_static
+from utils.order_status import (
+    CONFIRMED, TRANSITIONED, ALREADY_IN_STATUS, NOT_FOUND, transition_order
+)
+from utils.order_summary import order_amount
+
+orders_table_name = os.environ['ORDERS_TABLE']
+orders_table = Table(orders_table_name)
+events_table = Table(os.environ['EVENTS_TABLE'])
+event_stats_table_name = os.environ['EVENT_STATS_TABLE']
+
+# Records of one SQS batch are updated concurrently
+MAX_WORKERS = env_int('CONSUMER_MAX_WORKERS', 16)
+
+# Orders this container confirmed recently: SQS redeliveries that land on
+# the same warm container are dropped without any DynamoDB write
+recently_confirmed = TTLCache('confirmed_orders', max_entries=10000, ttl_seconds=600)
+
+# Per-record outcomes
+PROCESSED = 'processed'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+def _sale(message_body):
+    """
+    (eventId, createdAt, quantity, amount) of the order a message is about,
+    for the sales counters. Messages carry all of it; messages published
+    before orders stored unitPrice fall back to reading the order and, for
+    orders without a unitPrice, the event's current price.
+    Returns: None if the order does not exist
+    """
+    order = dict(message_body)
+    if 'unitPrice' in order:
+        order['unitPrice'] = Decimal(str(order['unitPrice']))
+    else:
+        order = orders_table.get_item(
+            Key={'orderId': message_body['orderId']},
+            ConsistentRead=True
+        ).get('Item')
+        if order is None:
+            return None
+
+    event = None
+    if order.get('unitPrice') is None:
+        event = load_static(events_table, order['eventId'])
+    quantity = int(order.get('quantity', 0))
+    return order['eventId'], order.get('createdAt', ''), quantity, order_amount(order, event)
+
+
+def _process_record(record):
+    """
+    Confirm the order referenced by one SQS record.
+    Returns: PROCESSED, SKIPPED or FAILED
+    """
+    try:
+        # Parse SQS message body
+        try:
+            message_body = json.loads(record['body'])
+        except json.JSONDecodeError as e:
+            print(f"ERROR: Invalid JSON in message body: {str(e)}")
+            print(f"Message body: {record.get('body', 'N/A')}")
+            return FAILED
+
+        order_id = message_body.get('orderId')
+        user_id = message_body.get('userId', 'N/A')
+        event_id = message_body.get('eventId', 'N/A')
+
+        # Validate required fields
+        if not order_id:
+            print(f"ERROR: Missing orderId in message. Message: {json.dumps(message_body)}")
+            return FAILED
+
+        if recently_confirmed.get(order_id) is not None:
+            print(f"SKIP: Order {order_id} already confirmed (duplicate delivery)")
+            return SKIPPED
+
+        # Move the order pending -> confirmed, conditional on its current
+        # status, and add it to its event's sales counters in the same
+        # transaction (counted exactly once, however often it is delivered)
+        try:
+            sale = _sale(message_body)
+            if sale is None:
+                print(f"WARNING: Order {order_id} not found in database. Skipping.")
+                return SKIPPED
+            result = transition_order(
+                clients.dynamodb(), orders_table_name, order_id, CONFIRMED,
+                with_items=counter_updates(event_stats_table_name, *sale)
+            )
+        except ClientError as e:
+            # DynamoDB errors - log and fail
+            error_code = e.response.get('Error', {}).get('Code', '')
+            print(f"ERROR: DynamoDB error updating order {order_id}: {error_code}")
+            print(f"Error details: {str(e)}")
+            print(f"Full error response: {json.dumps(e.response, default=str)}")
+            return FAILED
+
+        if result == TRANSITIONED:
+            recently_confirmed.put(order_id, True)
+            print(f"SUCCESS: Confirmed order {order_id} (userId: {user_id}, eventId: {event_id})")
+            return PROCESSED
+
+        if result == ALREADY_IN_STATUS:
+            # Redelivered message: the failed condition returned the current
+            # item, so no extra read was needed to tell
+            recently_confirmed.put(order_id, True)
+            print(f"SKIP: Order {order_id} already confirmed (duplicate delivery)")
+        elif result == NOT_FOUND:
+            # This could happen if order was deleted or never created
+            print(f"WARNING: Order {order_id} not found in database. Skipping.")
+        else:
+            # e.g. cancelled before the message arrived; retrying cannot help
+            print(f"WARNING: Order {order_id} cannot move to {CONFIRMED} from its current status. Skipping.")
+        return SKIPPED
+
+    except Exception as e:
+        # Catch-all for any unexpected errors
+        print(f"ERROR: Unexpected error processing record: {str(e)}")
+        print(f"Error type: {type(e).__name__}")
+        print(f"Traceback: {traceback.format_exc()}")
+        print(f"Record: {json.dumps(record, default=str)}")
+        return FAILED
 
-dynamodb = boto3.resource('dynamodb')
-orders_table = dynamodb.Table(os.environ['ORDERS_TABLE'])
 
 def lambda_handler(event, context):
     """
     SQS event consumer Lambda
-    Processes order-created messages and updates order status to confirmed
-    
-    Error handling:
-    - Invalid message format: logs and skips (will go to DLQ after maxReceiveCount)
-    - Missing orderId: logs and skips
-    - Order not found: logs warning but doesn't fail (idempotent)
-    - DynamoDB errors: logs full error and fails (will retry, then go to DLQ)
+    Processes order-created messages and moves orders pending -> confirmed
+    (see utils.order_status), adding each confirmed order to its event's
+    sales counters (utils.event_stats) in the same transaction. Records of a
+    batch are processed concurrently on a thread pool.
+
+    Error handling (partial batch responses, ReportBatchItemFailures):
+    - Invalid message format / missing orderId: reported as failed
+      (retried, then go to DLQ after maxReceiveCount)
+    - Already confirmed (redelivery): skipped, via an in-memory cache or the
+      current item returned by the failed condition
+    - Order not found / not pending (e.g. cancelled): logs warning but doesn't fail
+    - DynamoDB errors: logs full error and reported as failed (will retry, then go to DLQ)
+    Only the failed records are returned in batchItemFailures, so SQS
+    redelivers those instead of the whole batch.
     """
-    records_processed = 0
-    records_failed = 0
-    records_skipped = 0
-    
-    for record in event.get('Records', []):
-        try:
-            # Parse SQS message body
-            try:
-                message_body = json.loads(record['body'])
-            except json.JSONDecodeError as e:
-                print(f"ERROR: Invalid JSON in message body: {str(e)}")
-                print(f"Message body: {record.get('body', 'N/A')}")
-                records_failed += 1
-                continue
-            
-            order_id = message_body.get('orderId')
-            user_id = message_body.get('userId', 'N/A')
-            event_id = message_body.get('eventId', 'N/A')
-            
-            # Validate required fields
-            if not order_id:
-                print(f"ERROR: Missing orderId in message. Message: {json.dumps(message_body)}")
-                records_failed += 1
-                continue
-            
-            # Update order status from pending to confirmed
-            # Use conditional update to ensure we only update pending orders
-            # This makes the operation idempotent
-            try:
-                orders_table.update_item(
-                    Key={'orderId': order_id},
-                    UpdateExpression='SET #status = :confirmed',
-                    ConditionExpression='attribute_exists(orderId)',  # Ensure order exists
-                    ExpressionAttributeNames={
-                        '#status': 'status'
-                    },
-                    ExpressionAttributeValues={
-                        ':confirmed': 'confirmed'
-                    }
-                )
-                
-                print(f"SUCCESS: Confirmed order {order_id} (userId: {user_id}, eventId: {event_id})")
-                records_processed += 1
-                
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', '')
-                
-                if error_code == 'ConditionalCheckFailedException':
-                    # Order doesn't exist - log warning but don't fail
-                    # This could happen if order was deleted or never created
-                    print(f"WARNING: Order {order_id} not found in database. Skipping.")
-                    records_skipped += 1
-                else:
-                    # Other DynamoDB errors - log and fail
-                    print(f"ERROR: DynamoDB error updating order {order_id}: {error_code}")
-                    print(f"Error details: {str(e)}")
-                    print(f"Full error response: {json.dumps(e.response)}")
-                    records_failed += 1
-                    
-        except Exception as e:
-            # Catch-all for any unexpected errors
-            print(f"ERROR: Unexpected error processing record: {str(e)}")
-            print(f"Error type: {type(e).__name__}")
-            print(f"Traceback: {traceback.format_exc()}")
-            print(f"Record: {json.dumps(record, default=str)}")
-            records_failed += 1
-    
+    records = event.get('Records', [])
+
+    if len(records) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(records))) as executor:
+            outcomes = list(executor.map(_process_record, records))
+    else:
+        outcomes = [_process_record(record) for record in records]
+
+    batch_item_failures = [
+        {'itemIdentifier': record['messageId']}
+        for record, outcome in zip(records, outcomes)
+        if outcome == FAILED
+    ]
+
     # Log summary
-    total_records = len(event.get('Records', []))
-    print(f"Processing summary: Total={total_records}, Processed={records_processed}, "
-          f"Skipped={records_skipped}, Failed={records_failed}")
-    
-    # Return success even if some records failed
-    # Failed records will be retried by SQS, and eventually sent to DLQ
-    return {
-        'statusCode': 200,
-        'body': json.dumps({
-            'processed': records_processed,
-            'skipped': records_skipped,
-            'failed': records_failed,
-            'total': total_records
-        })
-    }
+    print(f"Processing summary: Total={len(records)}, Processed={outcomes.count(PROCESSED)}, "
+          f"Skipped={outcomes.count(SKIPPED)}, Failed={len(batch_item_failures)}")
 
+    return {'batchItemFailures': batch_item_failures}
@@ -0,0 +1,77 @@
+import json
+import os
+from utils import clients
+from utils.dynamo import from_attribute_values
+from utils.order_status import PENDING
+
+queue_url = os.environ['QUEUE_URL']
+
+# SendMessageBatch accepts at most 10 entries
+SEND_BATCH_LIMIT = 10
+
+
+def _order_message(order):
+    """SQS message body for an order-created event (consumed by order_consumer)."""
+    message = {
+        'orderId': order['orderId'],
+        'userId': order.get('userId'),
+        'eventId': order.get('eventId'),
+        'quantity': int(order.get('quantity', 0)),
+        'createdAt': order.get('createdAt')
+    }
+    if order.get('unitPrice') is not None:
+        # As a string: an exact decimal for order_consumer's revenue counters
+        message['unitPrice'] = str(order['unitPrice'])
+    return json.dumps(message)
+
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer on OrdersTable (transactional outbox)
+    Publishes every newly inserted pending order to the OrderCreated queue,
+    so purchase no longer sends SQS messages on the request path.
+
+    Error handling:
+    - Non-INSERT records and non-pending orders: skipped (stream filter drops most)
+    - SQS send failures: the first failed record is reported in batchItemFailures,
+      so the stream retries from that record; order_consumer is idempotent, so
+      re-publishing already sent orders is harmless
+    """
+    records = event.get('Records', [])
+    pending = []  # (sequence number, message body)
+
+    for record in records:
+        if record.get('eventName') != 'INSERT':
+            continue
+        order = from_attribute_values(record['dynamodb'].get('NewImage', {}))
+        if order.get('status') != PENDING:
+            continue
+        pending.append((record['dynamodb']['SequenceNumber'], _order_message(order)))
+
+    failed_sequence_numbers = []
+    for start in range(0, len(pending), SEND_BATCH_LIMIT):
+        chunk = pending[start:start + SEND_BATCH_LIMIT]
+        try:
+            response = clients.sqs().send_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {'Id': str(i), 'MessageBody': body}
+                    for i, (_, body) in enumerate(chunk)
+                ]
+            )
+            for failure in response.get('Failed', []):
+                print(f"ERROR: Failed to publish order: {json.dumps(failure)}")
+                failed_sequence_numbers.append(chunk[int(failure['Id'])][0])
+        except Exception as e:
+            print(f"ERROR: SendMessageBatch failed: {str(e)}")
+            failed_sequence_numbers.extend(seq for seq, _ in chunk)
+
+    print(f"Publishing summary: Total={len(records)}, Published={len(pending) - len(failed_sequence_numbers)}, "
+          f"Failed={len(failed_sequence_numbers)}")
+
+    # Stream batches are checkpointed: reporting the earliest failure makes
+    # Lambda retry from there
+    if failed_sequence_numbers:
+        first_failure = min(failed_sequence_numbers, key=int)
+        return {'batchItemFailures': [{'itemIdentifier': first_failure}]}
+    return {'batchItemFailures': []}
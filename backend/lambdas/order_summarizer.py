@@ -0,0 +1,127 @@
+import os
+from botocore.exceptions import ClientError
+from utils.dynamo import Table, batch_get_items, from_attribute_values
+from utils.order_summary import (
+    EVENT_PROJECTION, EVENT_PROJECTION_NAMES, apply_change, empty_summary
+)
+
+orders_table = Table(os.environ['ORDERS_TABLE'])
+summary_table = Table(os.environ['ORDER_SUMMARY_TABLE'])
+events_table_name = os.environ['EVENTS_TABLE']
+
+# Optimistic-lock retries when another batch updates the same user
+SUMMARY_WRITE_ATTEMPTS = 5
+
+
+def _load_events(event_ids):
+    """Events to embed in summary entries, by eventId."""
+    items = batch_get_items(
+        events_table_name,
+        [{'eventId': event_id} for event_id in event_ids if event_id],
+        projection=EVENT_PROJECTION,
+        attribute_names=EVENT_PROJECTION_NAMES
+    )
+    return {item['eventId']: item for item in items}
+
+
+def _seed(user_id):
+    """
+    First summary of a user: fold in the orders they placed before the
+    summary existed (one pass over UserOrdersIndex, once per user).
+    """
+    orders = []
+    kwargs = {
+        'IndexName': 'UserOrdersIndex',
+        'KeyConditionExpression': 'userId = :userId',
+        'ExpressionAttributeValues': {':userId': user_id}
+    }
+    while True:
+        response = orders_table.query(**kwargs)
+        orders.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    summary = empty_summary(user_id)
+    events = _load_events({order.get('eventId') for order in orders})
+    for order in orders:
+        apply_change(summary, order, None, events.get(order.get('eventId')))
+    return summary
+
+
+def _update_summary(user_id, changes, events):
+    """
+    Apply (order image, previous status) changes to one user's summary with a
+    version-conditioned put, re-reading and retrying on conflicts.
+    """
+    for _ in range(SUMMARY_WRITE_ATTEMPTS):
+        item = summary_table.get_item(Key={'userId': user_id}, ConsistentRead=True).get('Item')
+        summary = item if item is not None else _seed(user_id)
+
+        changed = item is None
+        for order, previous_status in changes:
+            if apply_change(summary, order, previous_status, events.get(order.get('eventId'))):
+                changed = True
+        if not changed:
+            return
+
+        expected_version = int(summary['version'])
+        summary['version'] = expected_version + 1
+        try:
+            if item is None:
+                summary_table.put_item(Item=summary, ConditionExpression='attribute_not_exists(userId)')
+            else:
+                summary_table.put_item(
+                    Item=summary,
+                    ConditionExpression='version = :version',
+                    ExpressionAttributeValues={':version': expected_version}
+                )
+            return
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+    raise Exception(f"Summary of {user_id} kept changing, giving up after {SUMMARY_WRITE_ATTEMPTS} attempts")
+
+
+def lambda_handler(event, context):
+    """
+    DynamoDB Streams consumer on OrdersTable
+    Keeps UserOrderSummaryTable (utils/order_summary.py) in step with order
+    inserts and status changes, so get_orders serves a user's first page
+    with a single get_item.
+
+    Error handling:
+    - Records of one user are applied together in stream order; a user whose
+      summary cannot be written fails the batch from that user's first
+      record. Replayed changes are recognised by the summary and skipped.
+    """
+    records = event.get('Records', [])
+    by_user = {}  # userId -> (first sequence number, [(order, previous status)])
+
+    for record in records:
+        if record.get('eventName') not in ('INSERT', 'MODIFY'):
+            continue
+        data = record['dynamodb']
+        order = from_attribute_values(data.get('NewImage', {}))
+        if not order.get('userId'):
+            continue
+        previous_status = from_attribute_values(data.get('OldImage', {})).get('status')
+        by_user.setdefault(order['userId'], (data['SequenceNumber'], []))[1].append((order, previous_status))
+
+    events = _load_events({
+        order.get('eventId') for _, changes in by_user.values() for order, _ in changes
+    })
+
+    failed_sequence_numbers = []
+    for user_id, (first_sequence, changes) in by_user.items():
+        try:
+            _update_summary(user_id, changes, events)
+        except Exception as e:
+            print(f"ERROR: Failed to update order summary of {user_id}: {str(e)}")
+            failed_sequence_numbers.append(first_sequence)
+
+    print(f"Summary updates: Records={len(records)}, Users={len(by_user)}, Failed={len(failed_sequence_numbers)}")
+
+    if failed_sequence_numbers:
+        return {'batchItemFailures': [{'itemIdentifier': min(failed_sequence_numbers, key=int)}]}
+    return {'batchItemFailures': []}
@@ -1,17 +1,110 @@
 import json
-import boto3
+import hashlib
 import os
 import uuid
 from datetime import datetime, timezone
-from decimal import Decimal
-from botocore.exceptions import ClientError
 from utils.auth import verify_token, auth_response_401
+from utils.dynamo import Table, to_attribute_values, transact_write
+from utils.events import load_event
+from utils.idempotency import (
+    InvalidIdempotencyKey, get_idempotency_key, record_key, request_fingerprint, lookup, record_item
+)
+from utils.inventory import decrement_targets, decrement_item
+from utils.order_status import PENDING
+from utils.rate_limit import (
+    PURCHASE_PER_USER, PURCHASE_PER_EVENT, RateLimited, enforce, rate_limited_response
+)
+from utils.response import CORS_HEADERS, respond, success_body, error_response
+from utils.waiting_room import AdmissionDenied, check_admission
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+orders_table = Table(os.environ['ORDERS_TABLE'])
+idempotency_table = Table(os.environ['IDEMPOTENCY_TABLE'])
+events_table_name = os.environ['EVENTS_TABLE']
+orders_table_name = os.environ['ORDERS_TABLE']
+inventory_table_name = os.environ['INVENTORY_TABLE']
+idempotency_table_name = os.environ['IDEMPOTENCY_TABLE']
+
+# Replayed responses tell the client the purchase was not executed again
+REPLAY_HEADERS = {**CORS_HEADERS, "Idempotent-Replayed": "true"}
+
+# Outcomes of one purchase transaction
+PURCHASED = 'purchased'
+DUPLICATE = 'duplicate'
+REPLAYED = 'replayed'
+SOLD_OUT = 'sold_out'
+
+
+def _order_id(user_id, client_token):
+    """
+    Deterministic orderId for a client-supplied token, so a retried request
+    maps onto the order its first attempt created. Without a token every
+    request gets a fresh id.
+    """
+    if not client_token:
+        return f"o{uuid.uuid4().hex[:12]}"
+    digest = hashlib.sha256(f"{user_id}:{client_token}".encode('utf-8')).hexdigest()
+    return f"o{digest[:12]}"
+
+
+def _transact_purchase(order_item, shard_id, idempotency_put=None):
+    """
+    Decrement inventory and insert the order in one TransactWriteItems call.
+    The order Put is conditional on attribute_not_exists(orderId), which makes
+    a retried request a no-op instead of a second sale. With an Idempotency-Key
+    the dedupe record is written in the same transaction.
+    Returns: PURCHASED, REPLAYED (dedupe record already exists), DUPLICATE (order
+             already exists) or SOLD_OUT (this inventory item cannot cover it)
+    """
+    transact_items = [
+        decrement_item(events_table_name, inventory_table_name,
+                       order_item['eventId'], shard_id, order_item['quantity']),
+        {
+            'Put': {
+                'TableName': orders_table_name,
+                'Item': to_attribute_values(order_item),
+                'ConditionExpression': 'attribute_not_exists(orderId)'
+            }
+        }
+    ]
+    if idempotency_put:
+        transact_items.append(idempotency_put)
+
+    codes = transact_write(transact_items)
+    if codes is None:
+        return PURCHASED
+    inventory_code, order_code, idempotency_code = (codes + ['None'])[:3]
+    if idempotency_code == 'ConditionalCheckFailed':
+        return REPLAYED
+    if order_code == 'ConditionalCheckFailed':
+        return DUPLICATE
+    return SOLD_OUT
+
+
+def _replayed_order(order_item):
+    """
+    Load the order an earlier attempt with the same client token created.
+    Returns: the stored order, or None if the token was used for a different purchase
+    """
+    existing = orders_table.get_item(
+        Key={'orderId': order_item['orderId']},
+        ConsistentRead=True
+    ).get('Item')
+    if not existing:
+        return None
+    if existing.get('userId') != order_item['userId'] \
+            or existing.get('eventId') != order_item['eventId'] \
+            or int(existing.get('quantity', 0)) != order_item['quantity']:
+        return None
+    return existing
+
+
+def _replay_response(record, fingerprint):
+    """Answer a retried request from its dedupe record, without touching EventsTable."""
+    if record.get('requestHash') != fingerprint:
+        return error_response(422, "Idempotency-Key was already used for a different request")
+    return respond(200, record['responseBody'], REPLAY_HEADERS)
 
-dynamodb = boto3.resource('dynamodb')
-sqs = boto3.client('sqs')
-events_table = dynamodb.Table(os.environ['EVENTS_TABLE'])
-orders_table = dynamodb.Table(os.environ['ORDERS_TABLE'])
-queue_url = os.environ['QUEUE_URL']
 
 def lambda_handler(event, context):
     try:
@@ -21,105 +114,96 @@ def lambda_handler(event, context):
         except:
             return auth_response_401()
 
-        # Parse body: eventId, quantity
+        # Parse body: eventId, quantity, optional clientToken (idempotency)
         body = json.loads(event.get('body', '{}'))
         event_id = body.get('eventId', '')
+        client_token = body.get('clientToken', '')
 
         try:
             quantity = int(body.get('quantity', 0))
         except (ValueError, TypeError):
             quantity = 0
 
+        try:
+            idempotency_key = get_idempotency_key(event)
+        except InvalidIdempotencyKey as e:
+            return error_response(400, str(e))
+
         if not event_id or quantity <= 0:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "eventId and quantity (positive) are required"
-                })
-            }
-        
-        # DynamoDB conditional update: remainingTickets >= quantity
+            return error_response(400, "eventId and quantity (positive) are required")
+
         try:
-            response = events_table.update_item(
-                Key={'eventId': event_id},
-                UpdateExpression='SET remainingTickets = remainingTickets - :qty',
-                ConditionExpression='remainingTickets >= :qty',
-                ExpressionAttributeValues={
-                    ':qty': quantity
-                },
-                ReturnValues='UPDATED_NEW'
+            enforce(
+                (f"purchase#user#{user_id}", PURCHASE_PER_USER),
+                (f"purchase#event#{event_id}", PURCHASE_PER_EVENT)
             )
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
-                return {
-                    "statusCode": 400,
-                    "headers": {
-                        "Content-Type": "application/json",
-                        "Access-Control-Allow-Origin": "*"
-                    },
-                    "body": json.dumps({
-                        "success": False,
-                        "error": "Not enough tickets available"
-                    })
-                }
-            raise
-        
-        order_id = f"o{uuid.uuid4().hex[:8]}"
+        except RateLimited as e:
+            return rate_limited_response(e)
+
+        # Replayed Idempotency-Key: return the original response
+        dedupe_key = fingerprint = None
+        if idempotency_key:
+            client_token = idempotency_key
+            dedupe_key = record_key(user_id, idempotency_key)
+            fingerprint = request_fingerprint(event_id, quantity)
+            record = lookup(idempotency_table, dedupe_key)
+            if record is not None:
+                return _replay_response(record, fingerprint)
+
+        # Static fields come from the warm cache, checked against the item's
+        # metaVersion: re-sharding or toggling the waiting room takes effect
+        # at once instead of after the cache TTL
+        event_item = load_event(events_table, event_id)
+        if event_item is None:
+            return error_response(404, "Event not found")
+
+        # Waiting-room events only accept admitted buyers
+        try:
+            check_admission(event, event_item, user_id)
+        except AdmissionDenied as e:
+            return error_response(403, str(e))
+
         order_item = {
-            'orderId': order_id,
+            'orderId': _order_id(user_id, client_token),
             'userId': user_id,
             'eventId': event_id,
             'quantity': quantity,
-            'createdAt': datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z'),
-            'status': 'pending'
-        }
-        
-        # Convert to DynamoDB format (numbers as Decimal)
-        dynamodb_item = json.loads(json.dumps(order_item), parse_float=Decimal)
-        orders_table.put_item(Item=dynamodb_item)
-        
-        # Send SQS message (order created)
-        sqs.send_message(
-            QueueUrl=queue_url,
-            MessageBody=json.dumps({
-                'orderId': order_id,
-                'userId': user_id,
-                'eventId': event_id,
-                'quantity': quantity,
-                'createdAt': order_item['createdAt']
-            })
-        )
-        
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": {
-                    "orderId": order_id,
-                    "message": "Purchase successful"
-                }
-            })
+            # Price paid, for sales figures that must not follow later price changes
+            'unitPrice': event_item.get('price', 0),
+            'createdAt': datetime.now(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z'),
+            'status': PENDING
         }
+        response_body = success_body({
+            "orderId": order_item['orderId'],
+            "message": "Purchase successful"
+        })
+        idempotency_put = None
+        if dedupe_key:
+            idempotency_put = record_item(idempotency_table_name, dedupe_key, fingerprint, response_body)
+
+        # Inventory decrement + order insert (+ dedupe record) are atomic; the
+        # OrdersTable stream (order_publisher) publishes the order to SQS off
+        # the request path. Sharded events fall back to other shards when one
+        # is exhausted.
+        outcome = SOLD_OUT
+        for shard_id in decrement_targets(event_item):
+            outcome = _transact_purchase(order_item, shard_id, idempotency_put)
+            if outcome != SOLD_OUT:
+                break
+
+        if outcome == REPLAYED:
+            # A concurrent retry with the same key completed first
+            record = lookup(idempotency_table, dedupe_key)
+            if record is not None:
+                return _replay_response(record, fingerprint)
+            return error_response(409, "A request with this Idempotency-Key is already being processed")
+
+        if outcome == SOLD_OUT:
+            return error_response(400, "Not enough tickets available")
+
+        if outcome == DUPLICATE and _replayed_order(order_item) is None:
+            return error_response(409, "clientToken was already used for a different purchase")
+
+        return respond(200, response_body)
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
\ No newline at end of file
+        return error_response(500, str(e))
@@ -1,9 +1,13 @@
 import json
-import boto3
 import os
+from botocore.exceptions import ClientError
+from utils.auth import issue_token
+from utils.dynamo import Table
+from utils.passwords import hash_password
+from utils.rate_limit import REGISTER_PER_CLIENT, RateLimited, enforce, rate_limited_response, source_ip
+from utils.response import CORS_HEADERS, error_response, success_response
 
-dynamodb = boto3.resource("dynamodb")
-users_table = dynamodb.Table(os.environ["USERS_TABLE"])
+users_table = Table(os.environ["USERS_TABLE"])
 
 
 def lambda_handler(event, context):
@@ -15,72 +19,35 @@ def lambda_handler(event, context):
         password = body.get('password', '')
 
         if not user_id or not password:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                    "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
+            return error_response(400, "Missing userId or password", CORS_HEADERS)
+
+        try:
+            enforce((f"register#ip#{source_ip(event)}", REGISTER_PER_CLIENT))
+        except RateLimited as e:
+            return rate_limited_response(e)
+
+        # Single conditional write: the existence check and the insert are one
+        # round trip, and concurrent registrations of a userId cannot both win
+        try:
+            users_table.put_item(
+                Item={
+                    "userId": user_id,
+                    "passwordHash": hash_password(password)
                 },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "Missing userId or password"
-                })
-            }
+                ConditionExpression="attribute_not_exists(userId)"
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                return error_response(400, "User already exists", CORS_HEADERS)
+            raise
 
-        # Check if user already exists
-        existing = users_table.get_item(Key={"userId": user_id})
-        if "Item" in existing:
-            return {
-                "statusCode": 400,
-                "headers": {
-                    "Content-Type": "application/json",
-                    "Access-Control-Allow-Origin": "*",
-                    "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                    "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-                },
-                "body": json.dumps({
-                    "success": False,
-                    "error": "User already exists"
-                })
-            }
+        # Generate token (same format as login) for auto-login after registration
+        token = issue_token(user_id)
 
-        # Write user to DynamoDB
-        users_table.put_item(Item={
+        return success_response({
+            "token": token,
             "userId": user_id,
-            "password": password
+            "message": "User created"
         })
-
-        # Generate token (same format as login) for auto-login after registration
-        token = f"token-{user_id}"
-
-        return {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*",
-                "Access-Control-Allow-Headers": "Content-Type,Authorization",
-                "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-            },
-            "body": json.dumps({
-                "success": True,
-                "data": {
-                    "token": token,
-                    "userId": user_id,
-                    "message": "User created"
-                }
-            })
-        }
     except Exception as e:
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json",
-                "Access-Control-Allow-Origin": "*"
-            },
-            "body": json.dumps({
-                "success": False,
-                "error": str(e)
-            })
-        }
+        return error_response(500, str(e))
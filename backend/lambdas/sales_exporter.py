@@ -0,0 +1,32 @@
+import os
+from datetime import datetime, timezone
+from utils.cache import env_int
+from utils.sales_export import S3Sink, export_sales
+
+orders_table_name = os.environ['ORDERS_TABLE']
+events_table_name = os.environ['EVENTS_TABLE']
+bucket_name = os.environ['EXPORT_BUCKET']
+
+EXPORT_PREFIX = os.environ.get('EXPORT_PREFIX', 'exports/sales')
+EXPORT_FORMAT = os.environ.get('EXPORT_FORMAT', 'ndjson')
+EXPORT_SEGMENTS = env_int('EXPORT_SEGMENTS', 8)
+
+
+def lambda_handler(event, context):
+    """
+    Scheduled daily, or invoked with {"format": "parquet", "segments": 16}
+    Exports every order, joined with its event, to
+    s3://EXPORT_BUCKET/EXPORT_PREFIX/<run>/ for reporting jobs, which read
+    the files instead of paging through GET /orders
+    (layout in utils/sales_export.py).
+    """
+    fmt = event.get('format', EXPORT_FORMAT)
+    segments = max(1, int(event.get('segments', EXPORT_SEGMENTS)))
+    run = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    sink = S3Sink(bucket_name, f"{EXPORT_PREFIX}/run={run}")
+
+    manifest = export_sales(orders_table_name, events_table_name, sink, fmt, segments)
+
+    print(f"Export summary: Location={sink.location()}, Format={fmt}, Rows={manifest['rows']}, "
+          f"Files={manifest['files']}, Bytes={manifest['bytes']}, Seconds={manifest['seconds']}")
+    return {'location': sink.location(), **manifest}
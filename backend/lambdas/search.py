@@ -0,0 +1,139 @@
+import os
+from utils.cache import env_int
+from utils.catalog_feed import changes_since, now_ms
+from utils.dynamo import Table, batch_get_items
+from utils.pagination import (
+    InvalidPageRequest, get_query_params, parse_limit, encode_token, decode_token
+)
+from utils.response import error_response, success_response
+from utils.search_index import RESULT_FIELDS, SearchIndex
+from utils.serialization import project_event
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+catalog_changes_table = Table(os.environ['CATALOG_CHANGES_TABLE'])
+
+# Warm containers apply the change feed at most this often...
+SEARCH_REFRESH_SECONDS = env_int('SEARCH_REFRESH_SECONDS', 5)
+# ...and rebuild from a full scan this often (well within the feed's retention)
+SEARCH_REBUILD_SECONDS = env_int('SEARCH_REBUILD_SECONDS', 60 * 60)
+# Re-read feed entries this far back, covering clock skew with the writer
+FEED_OVERLAP_MS = 5000
+
+# Only what the index and the results use (`name` and `date` are reserved words)
+INDEX_PROJECTION = ('eventId, #name, performer, venue, description, category, '
+                    'city, price, #date, imageUrl, waitingRoom')
+INDEX_ATTRIBUTE_NAMES = {'#name': 'name', '#date': 'date'}
+
+_index = None
+_built_at_ms = 0
+_synced_at_ms = 0
+
+
+def _build():
+    """Index every event (full scan)."""
+    global _index, _built_at_ms, _synced_at_ms
+    started = now_ms()
+    index = SearchIndex()
+    kwargs = {'ProjectionExpression': INDEX_PROJECTION, 'ExpressionAttributeNames': INDEX_ATTRIBUTE_NAMES}
+    while True:
+        response = events_table.scan(**kwargs)
+        for item in response.get('Items', []):
+            index.upsert(item)
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    _index, _built_at_ms, _synced_at_ms = index, started, started
+    print(f"Search index built: Events={len(index)}, Ms={now_ms() - started}")
+
+
+def _refresh():
+    """Re-read the events changed since the last refresh."""
+    global _synced_at_ms
+    started = now_ms()
+    event_ids = changes_since(catalog_changes_table, _synced_at_ms - FEED_OVERLAP_MS)
+    if event_ids:
+        items = batch_get_items(
+            events_table.name,
+            [{'eventId': event_id} for event_id in event_ids],
+            projection=INDEX_PROJECTION,
+            attribute_names=INDEX_ATTRIBUTE_NAMES
+        )
+        for item in items:
+            _index.upsert(item)
+        # Changed events that no longer exist were removed
+        for event_id in event_ids - {item['eventId'] for item in items}:
+            _index.remove(event_id)
+    _synced_at_ms = started
+
+
+def get_index():
+    """The container's index, built on first use and kept in sync with the change feed."""
+    now = now_ms()
+    if _index is None or now - _built_at_ms >= SEARCH_REBUILD_SECONDS * 1000:
+        _build()
+    elif now - _synced_at_ms >= SEARCH_REFRESH_SECONDS * 1000:
+        _refresh()
+    return _index
+
+
+def _parse_price(value, name):
+    """Validate an optional non-negative price query parameter."""
+    if value in (None, ''):
+        return None
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        price = -1
+    if price < 0:
+        raise InvalidPageRequest(f"{name} must be a non-negative number")
+    return price
+
+
+def _parse_offset(token):
+    """Position in the result list a nextToken points at."""
+    key = decode_token(token, ['offset'])
+    if key is None:
+        return 0
+    offset = key['offset']
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidPageRequest("nextToken is invalid")
+    return offset
+
+
+def lambda_handler(event, context):
+    """
+    GET /events/search?q=&category=&city=&minPrice=&maxPrice=&limit=&nextToken=
+    Ranked full-text search over name, performer, venue and description,
+    answered from an in-memory index (utils/search_index.py):
+    {"success": true, "data": [...], "total": n, "nextToken": ...,
+     "facets": {"category": {value: count}, "city": {value: count}}}
+    Results carry the list-view fields only; ticket counts come from
+    GET /availability.
+    """
+    try:
+        params = get_query_params(event)
+        try:
+            limit = parse_limit(params.get('limit'))
+            offset = _parse_offset(params.get('nextToken'))
+            min_price = _parse_price(params.get('minPrice'), 'minPrice')
+            max_price = _parse_price(params.get('maxPrice'), 'maxPrice')
+        except InvalidPageRequest as e:
+            return error_response(400, str(e))
+
+        results, facets = get_index().search(
+            params.get('q', ''),
+            category=params.get('category'),
+            city=params.get('city'),
+            min_price=min_price,
+            max_price=max_price
+        )
+
+        end = offset + limit
+        return success_response(
+            [project_event(item, RESULT_FIELDS) for item in results[offset:end]],
+            total=len(results),
+            facets=facets,
+            nextToken=encode_token({'offset': end}) if end < len(results) else None
+        )
+    except Exception as e:
+        return error_response(500, str(e))
@@ -1,29 +1,52 @@
+from utils.cache import env_int
+from utils.response import CORS_HEADERS, respond
+from utils.signing import InvalidToken, sign, verify
+
+AUTH_USE = 'auth'
+# Lifetime of a login session token
+AUTH_TOKEN_TTL_SECONDS = env_int('AUTH_TOKEN_TTL_SECONDS', 12 * 60 * 60)
+
+# Same body for every 401, serialized once
+_UNAUTHORIZED_BODY = '{"success": false, "error": "Unauthorized"}'
+
+
+def get_header(event, name):
+    """Value of a request header (names are case-insensitive), or None if absent."""
+    wanted = name.lower()
+    for header, value in (event.get("headers") or {}).items():
+        if header.lower() == wanted:
+            return value
+    return None
+
+
+def issue_token(user_id):
+    """Mint a signed, expiring session token for user_id (login / register)."""
+    return sign({'sub': user_id}, AUTH_USE, AUTH_TOKEN_TTL_SECONDS)
+
+
 def verify_token(event):
     """
     Extract and validate Authorization token from Lambda event headers.
-    Token format:  token-<userId>
+    Token format: HMAC-signed token from issue_token (optionally "Bearer "-prefixed),
+    checked in memory - no DynamoDB read per request
     Returns: userId (string)
     Raises: Exception("Unauthorized") if invalid
     """
-    headers = event.get("headers", {}) or {}
-    token = headers.get("Authorization", "")
+    token = get_header(event, "Authorization") or ""
+    if token.startswith("Bearer "):
+        token = token[len("Bearer "):]
 
-    if not token or not token.startswith("token-"):
+    try:
+        claims = verify(token, AUTH_USE)
+    except InvalidToken:
         raise Exception("Unauthorized")
 
-    user_id = token.replace("token-", "")
+    user_id = claims.get('sub')
+    if not user_id or not isinstance(user_id, str):
+        raise Exception("Unauthorized")
     return user_id
 
 
 def auth_response_401():
     """Reusable 401 response."""
-    return {
-        "statusCode": 401,
-        "headers": {
-            "Content-Type": "application/json",
-            "Access-Control-Allow-Origin": "*",
-            "Access-Control-Allow-Headers": "Content-Type,Authorization",
-            "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
-        },
-        "body": '{"success": false, "error": "Unauthorized"}'
-    }
\ No newline at end of file
+    return respond(401, _UNAUTHORIZED_BODY, CORS_HEADERS)
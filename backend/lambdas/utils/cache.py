@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def env_int(name, default):
+    """Read an integer setting from the environment."""
+    try:
+        return int(os.environ.get(name, default))
+    except (ValueError, TypeError):
+        return default
+
+
+class TTLCache:
+    """
+    Bounded in-process cache that lives in module scope, so warm Lambda
+    invocations of the same container share it.
+
+    - LRU eviction once max_entries is reached
+    - every entry expires ttl_seconds after it was stored
+    - entries carry an optional version tag; validate() drops an entry whose
+      tag no longer matches the source of truth
+    - hit/miss/stale/eviction counters, reported by log_stats()
+    """
+
+    def __init__(self, name, max_entries, ttl_seconds):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, version, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, value, version=None):
+        """Store a value (tagged with `version`), evicting the least recently used entry if full."""
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def validate(self, key, version):
+        """
+        Check a cached entry against the current version of its source.
+        Returns: True if the entry is present and current; otherwise drops it and returns False
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            if entry[1] != version:
+                del self._entries[key]
+                self.stale += 1
+                return False
+            return True
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'cache': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'hitRate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'ttlSeconds': self.ttl_seconds
+        }
+
+    def log_stats(self):
+        """Print cumulative counters as one JSON line (queryable in CloudWatch Logs Insights)."""
+        print(f"CACHE_STATS {json.dumps(self.stats())}")
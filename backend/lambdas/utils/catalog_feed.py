@@ -0,0 +1,54 @@
+"""
+Change feed of the event catalog (CatalogChangesTable).
+
+catalog_changes appends one item per changed eventId, taken from the
+EventsTable stream; warm search containers query the items written since
+their last refresh and re-read only those events. All items share one
+partition, sorted by `change` = "<epoch ms, 13 digits>#<eventId>", and
+expire through TTL: containers that fall further behind than
+CHANGE_RETENTION_SECONDS rebuild their index instead.
+"""
+import time
+
+FEED = 'catalog'
+CHANGE_RETENTION_SECONDS = 24 * 60 * 60
+
+
+def now_ms():
+    return int(time.time() * 1000)
+
+
+def record_changes(table, event_ids, changed_at_ms=None):
+    """
+    Append eventIds to the feed.
+    table: CatalogChangesTable (utils.dynamo.Table)
+    """
+    changed_at_ms = changed_at_ms if changed_at_ms is not None else now_ms()
+    for event_id in sorted(event_ids):
+        table.put_item(Item={
+            'feed': FEED,
+            'change': f'{changed_at_ms:013d}#{event_id}',
+            'eventId': event_id,
+            'expiresAt': changed_at_ms // 1000 + CHANGE_RETENTION_SECONDS
+        })
+
+
+def changes_since(table, since_ms):
+    """
+    eventIds changed at or after since_ms (strongly consistent).
+    Returns: set of eventIds
+    """
+    event_ids = set()
+    kwargs = {
+        'KeyConditionExpression': 'feed = :feed AND #change >= :since',
+        'ExpressionAttributeNames': {'#change': 'change'},
+        'ExpressionAttributeValues': {':feed': FEED, ':since': f'{max(since_ms, 0):013d}'},
+        'ProjectionExpression': 'eventId',
+        'ConsistentRead': True
+    }
+    while True:
+        response = table.query(**kwargs)
+        event_ids.update(item['eventId'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return event_ids
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
@@ -0,0 +1,58 @@
+"""
+Shared AWS clients.
+
+Clients are created on first use rather than at import time, so requests
+rejected before touching AWS (auth, validation) never pay for them, and are
+then reused by every warm invocation of the container. Only low-level
+clients are built: boto3.resource is markedly slower to create, and clients
+are thread-safe (order_consumer shares one across its worker threads).
+"""
+import os
+import threading
+from utils.cache import env_int
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def _config():
+    from botocore.config import Config
+    return Config(
+        # Enough pooled connections for the consumer's worker threads
+        max_pool_connections=env_int('AWS_MAX_POOL_CONNECTIONS', 50),
+        # Keep idle pooled connections alive between warm invocations
+        tcp_keepalive=True,
+        # Fail fast and let the standard retry mode try again, well within
+        # the API Gateway timeout
+        connect_timeout=float(os.environ.get('AWS_CONNECT_TIMEOUT_SECONDS', 1)),
+        read_timeout=float(os.environ.get('AWS_READ_TIMEOUT_SECONDS', 3)),
+        retries={'mode': 'standard', 'max_attempts': env_int('AWS_MAX_ATTEMPTS', 3)}
+    )
+
+
+def client(service_name):
+    """Return the container's client for service_name, creating it on first use."""
+    existing = _clients.get(service_name)
+    if existing is not None:
+        return existing
+    with _lock:
+        if service_name not in _clients:
+            import boto3
+            _clients[service_name] = boto3.client(service_name, config=_config())
+        return _clients[service_name]
+
+
+def dynamodb():
+    """Low-level DynamoDB client."""
+    return client('dynamodb')
+
+
+def sqs():
+    """SQS client."""
+    return client('sqs')
+
+
+def set_client(service_name, instance):
+    """Install a pre-built client for service_name (e.g. a local stand-in in benchmarks)."""
+    with _lock:
+        _clients[service_name] = instance
@@ -0,0 +1,159 @@
+import random
+import time
+from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
+from botocore.exceptions import ClientError
+from utils import clients
+
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_LIMIT = 100
+BATCH_GET_MAX_ATTEMPTS = 5
+
+# Transactions touching the same item concurrently are cancelled with
+# TransactionConflict instead of being serialized; those are retried with jitter
+CONFLICT_MAX_ATTEMPTS = 3
+
+_serializer = TypeSerializer()
+_deserializer = TypeDeserializer()
+
+
+def batch_get_items(table_name, keys, projection=None, attribute_names=None):
+    """
+    Fetch items by key with chunked BatchGetItem, retrying UnprocessedKeys
+    with exponential backoff.
+    keys: plain-value key dicts
+    Returns: list of plain items (missing keys are simply absent)
+    Raises: Exception if keys remain unprocessed after BATCH_GET_MAX_ATTEMPTS
+    """
+    items = []
+    keys = list(keys)
+
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        chunk = keys[start:start + BATCH_GET_LIMIT]
+        table_request = {'Keys': [to_attribute_values(key) for key in chunk]}
+        if projection:
+            table_request['ProjectionExpression'] = projection
+        if attribute_names:
+            table_request['ExpressionAttributeNames'] = attribute_names
+        request = {table_name: table_request}
+
+        for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+            response = clients.dynamodb().batch_get_item(RequestItems=request)
+            items.extend(
+                from_attribute_values(item)
+                for item in response.get('Responses', {}).get(table_name, [])
+            )
+
+            request = response.get('UnprocessedKeys')
+            if not request:
+                break
+            # Exponential backoff before retrying throttled keys
+            time.sleep(0.05 * (2 ** attempt))
+        else:
+            raise Exception(f"Unable to read {table_name}: too many unprocessed keys")
+
+    return items
+
+
+def to_attribute_values(item):
+    """Serialize a plain dict into low-level DynamoDB attribute values."""
+    return {k: _serializer.serialize(v) for k, v in item.items()}
+
+
+def from_attribute_values(item):
+    """Deserialize low-level DynamoDB attribute values (e.g. a stream image) into a plain dict."""
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
+
+
+def cancellation_codes(error):
+    """
+    Per-item reason codes of a TransactionCanceledException, in TransactItems
+    order ('None' for items that did not cause the cancellation).
+    """
+    return [reason.get('Code', 'None') for reason in error.response.get('CancellationReasons', [])]
+
+
+def transact_write_reasons(transact_items, max_attempts=CONFLICT_MAX_ATTEMPTS):
+    """
+    Run TransactWriteItems (low-level attribute values), retrying
+    cancellations caused only by TransactionConflict.
+    Returns: None when committed, else the per-item CancellationReasons in
+             TransactItems order (each with a 'Code', and the current 'Item'
+             where ReturnValuesOnConditionCheckFailure asked for it)
+    Raises: ClientError for other errors, or conflicts persisting after max_attempts
+    """
+    for attempt in range(max_attempts):
+        try:
+            clients.dynamodb().transact_write_items(TransactItems=transact_items)
+            return None
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'TransactionCanceledException':
+                raise
+            reasons = list(e.response.get('CancellationReasons', []))
+            reasons += [{'Code': 'None'}] * (len(transact_items) - len(reasons))
+            codes = [reason.get('Code', 'None') for reason in reasons]
+            if 'ConditionalCheckFailed' in codes:
+                return reasons
+            if 'TransactionConflict' not in codes or attempt == max_attempts - 1:
+                raise
+            time.sleep(random.uniform(0, 0.02 * (2 ** attempt)))
+
+
+def transact_write(transact_items, max_attempts=CONFLICT_MAX_ATTEMPTS):
+    """
+    transact_write_reasons, reduced to the per-item cancellation codes
+    (e.g. 'ConditionalCheckFailed') in TransactItems order.
+    Returns: None when committed, else the codes
+    """
+    reasons = transact_write_reasons(transact_items, max_attempts)
+    if reasons is None:
+        return None
+    return [reason.get('Code', 'None') for reason in reasons]
+
+
+# Request parameters given as plain values, and response fields returned as such
+_REQUEST_VALUE_FIELDS = ('Key', 'Item', 'ExclusiveStartKey', 'ExpressionAttributeValues')
+_RESPONSE_ITEM_FIELDS = ('Item', 'Attributes', 'LastEvaluatedKey')
+
+
+class Table:
+    """
+    Lightweight replacement for boto3's Table resource on top of the shared
+    low-level client: same method names and keyword arguments, with Key,
+    Item, ExclusiveStartKey and ExpressionAttributeValues passed as plain
+    values and Item(s) / Attributes / LastEvaluatedKey returned as plain
+    dicts. Conditions are expression strings.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def _call(self, operation, kwargs):
+        request = {'TableName': self.name}
+        for field, value in kwargs.items():
+            request[field] = to_attribute_values(value) if field in _REQUEST_VALUE_FIELDS else value
+
+        response = getattr(clients.dynamodb(), operation)(**request)
+        for field in _RESPONSE_ITEM_FIELDS:
+            if field in response:
+                response[field] = from_attribute_values(response[field])
+        if 'Items' in response:
+            response['Items'] = [from_attribute_values(item) for item in response['Items']]
+        return response
+
+    def get_item(self, **kwargs):
+        return self._call('get_item', kwargs)
+
+    def put_item(self, **kwargs):
+        return self._call('put_item', kwargs)
+
+    def update_item(self, **kwargs):
+        return self._call('update_item', kwargs)
+
+    def delete_item(self, **kwargs):
+        return self._call('delete_item', kwargs)
+
+    def query(self, **kwargs):
+        return self._call('query', kwargs)
+
+    def scan(self, **kwargs):
+        return self._call('scan', kwargs)
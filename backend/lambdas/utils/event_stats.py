@@ -0,0 +1,137 @@
+"""
+Per-event sales aggregates (EventStatsTable).
+
+order_consumer adds every order it confirms to its event's counters in the
+same transaction as the confirmation, so each order is counted exactly
+once; GET /events/{eventId}/stats reads them without touching OrdersTable.
+scripts/backfill_event_stats.py rebuilds them from existing orders.
+
+Items (PK eventId, SK bucket) hold `tickets`, `revenue` and `orders`:
+- TOTAL#<shard>: every confirmed sale of the event
+- HOUR#<YYYY-MM-DDTHH>#<shard>: sales purchased in that UTC hour (createdAt)
+
+Like the inventory of hot events, each bucket is split over COUNTER_SHARDS
+items picked at random, so concurrent confirmations of one event rarely
+write the same item (transactions on one item conflict rather than queue).
+Readers sum whatever shards exist.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from utils.cache import env_int
+
+COUNTER_SHARDS = env_int('STATS_COUNTER_SHARDS', 4)
+COUNTERS = ('tickets', 'revenue', 'orders')
+
+TOTAL_PREFIX = 'TOTAL#'
+HOUR_PREFIX = 'HOUR#'
+HOUR_FORMAT = '%Y-%m-%dT%H'
+
+
+def hour_of(created_at):
+    """UTC hour ('YYYY-MM-DDTHH') of an ISO createdAt timestamp."""
+    return created_at[:13]
+
+
+def total_bucket(shard=0):
+    return f'{TOTAL_PREFIX}{shard}'
+
+
+def hour_bucket(hour, shard=0):
+    return f'{HOUR_PREFIX}{hour}#{shard}'
+
+
+def counter_updates(table_name, event_id, created_at, quantity, amount):
+    """
+    TransactWriteItems Updates adding one confirmed order to its event's
+    total and hourly counters (low-level attribute values).
+    """
+    shard = random.randrange(COUNTER_SHARDS)
+    values = {
+        ':tickets': {'N': str(quantity)},
+        ':revenue': {'N': str(amount)},
+        ':one': {'N': '1'}
+    }
+    return [
+        {
+            'Update': {
+                'TableName': table_name,
+                'Key': {'eventId': {'S': event_id}, 'bucket': {'S': bucket}},
+                'UpdateExpression': 'ADD tickets :tickets, revenue :revenue, orders :one',
+                'ExpressionAttributeValues': values
+            }
+        }
+        for bucket in (total_bucket(shard), hour_bucket(hour_of(created_at), shard))
+    ]
+
+
+def _query_all(table, **kwargs):
+    items = []
+    while True:
+        response = table.query(**kwargs)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def _sum(items):
+    totals = {name: Decimal(0) for name in COUNTERS}
+    for item in items:
+        for name in COUNTERS:
+            totals[name] += item.get(name, 0)
+    return totals
+
+
+def _counts(totals):
+    """API representation of summed counters."""
+    return {
+        'tickets': int(totals['tickets']),
+        'revenue': float(totals['revenue']),
+        'orders': int(totals['orders'])
+    }
+
+
+def read_stats(table, event_id, hours=24, now=None):
+    """
+    Totals and the last `hours` hourly buckets of an event: two queries
+    reading at most (1 + hours) x shards items, whatever the number of orders.
+    table: EventStatsTable (utils.dynamo.Table)
+    """
+    now = now or datetime.now(timezone.utc)
+    hour_list = [(now - timedelta(hours=offset)).strftime(HOUR_FORMAT) for offset in range(hours - 1, -1, -1)]
+
+    totals = _sum(_query_all(
+        table,
+        KeyConditionExpression='eventId = :eventId AND begins_with(#bucket, :prefix)',
+        ExpressionAttributeNames={'#bucket': 'bucket'},
+        ExpressionAttributeValues={':eventId': event_id, ':prefix': TOTAL_PREFIX}
+    ))
+
+    # '$' sorts right after '#': the range covers every shard of the last hour
+    by_hour = {}
+    for item in _query_all(
+        table,
+        KeyConditionExpression='eventId = :eventId AND #bucket BETWEEN :first AND :last',
+        ExpressionAttributeNames={'#bucket': 'bucket'},
+        ExpressionAttributeValues={
+            ':eventId': event_id,
+            ':first': f'{HOUR_PREFIX}{hour_list[0]}#',
+            ':last': f'{HOUR_PREFIX}{hour_list[-1]}$'
+        }
+    ):
+        by_hour.setdefault(item['bucket'][len(HOUR_PREFIX):][:13], []).append(item)
+
+    hourly = [{'hour': hour, **_counts(_sum(by_hour.get(hour, [])))} for hour in hour_list]
+    recent_tickets = sum(entry['tickets'] for entry in hourly)
+    return {
+        'eventId': event_id,
+        **_counts(totals),
+        'velocity': {
+            'currentHour': hourly[-1]['tickets'],
+            'windowHours': hours,
+            'windowTickets': recent_tickets,
+            'ticketsPerHour': round(recent_tickets / hours, 2)
+        },
+        'hourly': hourly
+    }
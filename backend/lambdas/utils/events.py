@@ -0,0 +1,144 @@
+"""
+Cached reads of EventsTable items.
+
+Event metadata (name, venue, imageUrl, price, ...) almost never changes,
+while remainingTickets changes on every purchase. Static fields are kept in
+a module-level TTLCache shared by warm invocations; only the inventory
+counter (plus the item's metaVersion) is re-read from DynamoDB. Writers of
+event metadata bump `metaVersion`, which invalidates cached copies on the
+next inventory read instead of waiting for the TTL.
+"""
+from utils.cache import TTLCache, env_int
+from utils.dynamo import batch_get_items, from_attribute_values
+
+INVENTORY_FIELDS = ('remainingTickets',)
+INVENTORY_PROJECTION = 'eventId, remainingTickets, metaVersion'
+
+event_cache = TTLCache(
+    'events',
+    max_entries=env_int('EVENT_CACHE_MAX_ENTRIES', 1024),
+    ttl_seconds=env_int('EVENT_CACHE_TTL_SECONDS', 60)
+)
+
+
+def _version(item):
+    return int(item.get('metaVersion', 0))
+
+
+def _merge(static, inventory_item):
+    """Combine cached static fields with freshly read inventory fields."""
+    merged = dict(static)
+    for field in INVENTORY_FIELDS:
+        if field in inventory_item:
+            merged[field] = inventory_item[field]
+    return merged
+
+
+def remember(item):
+    """Cache the static part of a full EventsTable item."""
+    static = {k: v for k, v in item.items() if k not in INVENTORY_FIELDS}
+    event_cache.put(item['eventId'], static, version=_version(item))
+
+
+def load_static(events_table, event_id):
+    """
+    Read the static fields of an event, from cache without any DynamoDB read
+    when warm. Cached copies may be up to the cache TTL old: decisions that
+    must follow a metaVersion bump (inventoryShards, waitingRoom) use
+    load_event instead.
+    Returns: event item (inventory fields may be absent), or None if the event does not exist
+    """
+    static = event_cache.get(event_id)
+    if static is not None:
+        return static
+
+    item = events_table.get_item(Key={'eventId': event_id}).get('Item')
+    if item is None:
+        return None
+    remember(item)
+    return item
+
+
+def load_event(events_table, event_id):
+    """
+    Read one event: static fields from cache when possible, inventory from DynamoDB.
+    Returns: full event item, or None if the event does not exist
+    """
+    static = event_cache.get(event_id)
+    if static is not None:
+        inventory = events_table.get_item(
+            Key={'eventId': event_id},
+            ProjectionExpression=INVENTORY_PROJECTION
+        ).get('Item')
+        if inventory is None:
+            event_cache.invalidate(event_id)
+            return None
+        if event_cache.validate(event_id, _version(inventory)):
+            return _merge(static, inventory)
+
+    item = events_table.get_item(Key={'eventId': event_id}).get('Item')
+    if item is not None:
+        remember(item)
+    return item
+
+
+def load_events(table_name, event_ids):
+    """
+    Read many events with at most two BatchGetItem passes: inventory for all
+    ids, then full items only for ids that are not cached or whose cached
+    metaVersion is stale.
+    Returns: dict of eventId -> full event item (missing events are absent)
+    """
+    event_ids = list(dict.fromkeys(event_ids))
+    if not event_ids:
+        return {}
+
+    inventory_items = batch_get_items(
+        table_name,
+        [{'eventId': eid} for eid in event_ids],
+        projection=INVENTORY_PROJECTION
+    )
+
+    events = {}
+    to_fetch = []
+    for inventory in inventory_items:
+        event_id = inventory['eventId']
+        static = event_cache.get(event_id)
+        if static is not None and event_cache.validate(event_id, _version(inventory)):
+            events[event_id] = _merge(static, inventory)
+        else:
+            to_fetch.append({'eventId': event_id})
+
+    for item in batch_get_items(table_name, to_fetch):
+        remember(item)
+        events[item['eventId']] = item
+    return events
+
+
+def _static_fields(image):
+    return {k: v for k, v in image.items() if k not in INVENTORY_FIELDS}
+
+
+def changed_event_ids(records):
+    """
+    eventIds whose catalog entry changed in a batch of stream records.
+    Ticket-count updates (purchases on unsharded events) are skipped: they
+    do not change what the catalog shows or how it is searched.
+    Returns: (changed eventIds, removed eventIds)
+    """
+    changed, removed = set(), set()
+    for record in records:
+        data = record.get('dynamodb', {})
+        event_id = from_attribute_values(data.get('Keys', {})).get('eventId')
+        if not event_id:
+            continue
+        if record.get('eventName') == 'REMOVE':
+            removed.add(event_id)
+            changed.discard(event_id)
+            continue
+        old = from_attribute_values(data.get('OldImage', {}))
+        new = from_attribute_values(data.get('NewImage', {}))
+        if record.get('eventName') == 'INSERT' or _static_fields(old) != _static_fields(new):
+            changed.add(event_id)
+            removed.discard(event_id)
+    return changed, removed
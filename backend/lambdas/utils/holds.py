@@ -0,0 +1,115 @@
+"""
+Ticket holds: stock reserved for a buyer while they check out.
+
+A hold is created together with the inventory decrement (one transaction)
+and ends in exactly one of two ways, each a conditional update on
+holdState = held:
+- confirmed: converted into a pending order (same transaction), which the
+  OrdersTable stream publishes like any purchase
+- released: its deadline passed; hold_expiry returns the tickets to the
+  inventory item they came from (same transaction)
+
+While held, a hold carries expiryPartition/expiresAt, the keys of the sparse
+ExpiringHoldsIndex the expiry worker queries; both confirm and release
+remove expiryPartition. Finished holds are deleted by DynamoDB TTL on purgeAt.
+"""
+import random
+import time
+from utils.cache import env_int
+from utils.dynamo import to_attribute_values
+
+HELD = 'held'
+CONFIRMED = 'confirmed'
+RELEASED = 'released'
+
+# How long a buyer has to confirm a hold
+HOLD_TTL_SECONDS = env_int('HOLD_TTL_SECONDS', 10 * 60)
+# How long finished holds are kept (confirm retries, support) before TTL deletion
+HOLD_RETENTION_SECONDS = env_int('HOLD_RETENTION_SECONDS', 24 * 60 * 60)
+
+EXPIRY_INDEX = 'ExpiringHoldsIndex'
+# Held holds are spread over this many index partitions, so an on-sale does
+# not concentrate every hold on one GSI partition
+EXPIRY_PARTITIONS = 16
+
+
+def new_hold(hold_id, user_id, event_id, quantity, shard_id, now=None, unit_price=None):
+    """
+    HoldsTable item of a fresh hold (plain values).
+    unit_price: event price when the hold was taken, charged on confirm
+    """
+    now = int(now if now is not None else time.time())
+    expires_at = now + HOLD_TTL_SECONDS
+    hold = {
+        'holdId': hold_id,
+        'userId': user_id,
+        'eventId': event_id,
+        'quantity': quantity,
+        'holdState': HELD,
+        'createdAt': now,
+        'expiresAt': expires_at,
+        'expiryPartition': random.randrange(EXPIRY_PARTITIONS),
+        'purgeAt': expires_at + HOLD_RETENTION_SECONDS
+    }
+    if shard_id is not None:
+        hold['shardId'] = shard_id
+    if unit_price is not None:
+        hold['unitPrice'] = unit_price
+    return hold
+
+
+def put_hold(table_name, hold):
+    """TransactWriteItems `Put` of a new hold."""
+    return {
+        'Put': {
+            'TableName': table_name,
+            'Item': to_attribute_values(hold),
+            'ConditionExpression': 'attribute_not_exists(holdId)'
+        }
+    }
+
+
+def confirm_hold(table_name, hold_id, user_id, order_id, now=None):
+    """
+    TransactWriteItems `Update` that marks a live hold of user_id as
+    confirmed into order_id. Fails if the hold is missing, not held, expired
+    or owned by someone else.
+    """
+    now = int(now if now is not None else time.time())
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': {'holdId': {'S': hold_id}},
+            'UpdateExpression': 'SET holdState = :confirmed, orderId = :orderId, '
+                                'confirmedAt = :now REMOVE expiryPartition',
+            'ConditionExpression': 'holdState = :held AND userId = :userId AND expiresAt > :now',
+            'ExpressionAttributeValues': to_attribute_values({
+                ':confirmed': CONFIRMED,
+                ':held': HELD,
+                ':orderId': order_id,
+                ':userId': user_id,
+                ':now': now
+            })
+        }
+    }
+
+
+def release_hold(table_name, hold_id, now=None):
+    """
+    TransactWriteItems `Update` that marks a held, expired hold as released.
+    Fails if it was confirmed (or released) meanwhile.
+    """
+    now = int(now if now is not None else time.time())
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': {'holdId': {'S': hold_id}},
+            'UpdateExpression': 'SET holdState = :released, releasedAt = :now REMOVE expiryPartition',
+            'ConditionExpression': 'holdState = :held AND expiresAt <= :now',
+            'ExpressionAttributeValues': to_attribute_values({
+                ':released': RELEASED,
+                ':held': HELD,
+                ':now': now
+            })
+        }
+    }
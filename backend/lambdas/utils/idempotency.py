@@ -0,0 +1,75 @@
+import hashlib
+import time
+from utils.auth import get_header
+from utils.cache import env_int
+from utils.dynamo import to_attribute_values
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 128
+
+# How long a completed request can be replayed (DynamoDB TTL on expiresAt)
+IDEMPOTENCY_TTL_SECONDS = env_int('IDEMPOTENCY_TTL_SECONDS', 24 * 60 * 60)
+
+
+class InvalidIdempotencyKey(Exception):
+    """Raised when the Idempotency-Key header is malformed."""
+
+
+def get_idempotency_key(event):
+    """
+    Read the Idempotency-Key header (header names are case-insensitive).
+    Returns: the key, or None if the header is absent
+    Raises: InvalidIdempotencyKey if the key is empty or too long
+    """
+    value = get_header(event, IDEMPOTENCY_HEADER)
+    if value is None:
+        return None
+    value = value.strip()
+    if not value or len(value) > MAX_KEY_LENGTH:
+        raise InvalidIdempotencyKey(
+            f"{IDEMPOTENCY_HEADER} must be 1-{MAX_KEY_LENGTH} characters")
+    return value
+
+
+def record_key(user_id, idempotency_key):
+    """Dedupe table key: keys are scoped per user so clients cannot collide."""
+    return f"{user_id}#{idempotency_key}"
+
+
+def request_fingerprint(*parts):
+    """Hash of the request parameters a replay must match."""
+    return hashlib.sha256('|'.join(str(p) for p in parts).encode('utf-8')).hexdigest()
+
+
+def lookup(table, key):
+    """
+    Read a completed, unexpired request from the dedupe table.
+    Returns: the stored record, or None
+    """
+    item = table.get_item(Key={'idempotencyKey': key}, ConsistentRead=True).get('Item')
+    if item is None or int(item.get('expiresAt', 0)) <= int(time.time()):
+        # TTL deletion is lazy: expired records may still be present
+        return None
+    return item
+
+
+def record_item(table_name, key, fingerprint, response_body):
+    """
+    TransactWriteItems `Put` that stores a completed request, so the record
+    is written atomically with the side effects it protects. Conditional on
+    no live record for the key (an expired one may be overwritten).
+    """
+    now = int(time.time())
+    return {
+        'Put': {
+            'TableName': table_name,
+            'Item': to_attribute_values({
+                'idempotencyKey': key,
+                'requestHash': fingerprint,
+                'responseBody': response_body,
+                'expiresAt': now + IDEMPOTENCY_TTL_SECONDS
+            }),
+            'ConditionExpression': 'attribute_not_exists(idempotencyKey) OR expiresAt <= :now',
+            'ExpressionAttributeValues': {':now': {'N': str(now)}}
+        }
+    }
@@ -0,0 +1,103 @@
+"""
+Sharded inventory for hot events.
+
+An event with `inventoryShards` >= 2 keeps its stock in InventoryTable as N
+counter items (eventId, shardId 0..N-1), each with its own remainingTickets,
+so concurrent buyers spread their conditional writes over N items instead of
+contending on a single EventsTable item. Events without the attribute keep
+using remainingTickets on the EventsTable item.
+"""
+import random
+from utils.dynamo import batch_get_items
+
+
+def shard_count(event_item):
+    """Number of inventory shards of an event (0 when unsharded)."""
+    count = int(event_item.get('inventoryShards', 0) or 0)
+    return count if count > 1 else 0
+
+
+def decrement_targets(event_item):
+    """
+    Inventory items a purchase may decrement, in the order to try them:
+    a random permutation of the shards (fallback when one is exhausted),
+    or [None] for the EventsTable item of an unsharded event.
+    """
+    shards = shard_count(event_item)
+    if not shards:
+        return [None]
+    shard_ids = list(range(shards))
+    random.shuffle(shard_ids)
+    return shard_ids
+
+
+def _inventory_key(events_table_name, inventory_table_name, event_id, shard_id):
+    """(table name, low-level key) of one inventory item."""
+    if shard_id is None:
+        return events_table_name, {'eventId': {'S': event_id}}
+    return inventory_table_name, {'eventId': {'S': event_id}, 'shardId': {'N': str(shard_id)}}
+
+
+def decrement_item(events_table_name, inventory_table_name, event_id, shard_id, quantity):
+    """
+    TransactWriteItems `Update` that takes `quantity` tickets from one
+    inventory item (low-level attribute-value format), conditional on
+    remainingTickets >= quantity.
+    shard_id: InventoryTable shard, or None for the EventsTable item
+    """
+    table_name, key = _inventory_key(events_table_name, inventory_table_name, event_id, shard_id)
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': key,
+            'UpdateExpression': 'SET remainingTickets = remainingTickets - :qty',
+            'ConditionExpression': 'remainingTickets >= :qty',
+            'ExpressionAttributeValues': {':qty': {'N': str(quantity)}}
+        }
+    }
+
+
+def increment_item(events_table_name, inventory_table_name, event_id, shard_id, quantity):
+    """
+    TransactWriteItems `Update` that returns `quantity` tickets to the
+    inventory item they were taken from (e.g. an expired hold).
+    shard_id: InventoryTable shard, or None for the EventsTable item
+    """
+    table_name, key = _inventory_key(events_table_name, inventory_table_name, event_id, shard_id)
+    return {
+        'Update': {
+            'TableName': table_name,
+            'Key': key,
+            'UpdateExpression': 'SET remainingTickets = remainingTickets + :qty',
+            # Never recreate an inventory item that was deleted meanwhile
+            'ConditionExpression': 'attribute_exists(remainingTickets)',
+            'ExpressionAttributeValues': {':qty': {'N': str(quantity)}}
+        }
+    }
+
+
+def apply_shard_totals(inventory_table_name, event_items):
+    """
+    Replace remainingTickets of sharded events with the sum of their shards,
+    reading every shard of every sharded event in one chunked BatchGetItem.
+    Mutates and returns event_items.
+    """
+    keys = []
+    for item in event_items:
+        for shard_id in range(shard_count(item)):
+            keys.append({'eventId': item['eventId'], 'shardId': shard_id})
+    if not keys:
+        return event_items
+
+    totals = {}
+    shards = batch_get_items(
+        inventory_table_name, keys,
+        projection='eventId, remainingTickets'
+    )
+    for shard in shards:
+        totals[shard['eventId']] = totals.get(shard['eventId'], 0) + int(shard.get('remainingTickets', 0))
+
+    for item in event_items:
+        if shard_count(item):
+            item['remainingTickets'] = totals.get(item['eventId'], 0)
+    return event_items
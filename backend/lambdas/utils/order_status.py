@@ -0,0 +1,116 @@
+"""
+Order lifecycle: pending -> confirmed -> fulfilled, with cancellation
+allowed while pending (confirmed orders are counted in the event's sales
+counters, which cancellation would not undo). Every status change is a conditional update on
+the current status, so redelivered or out-of-order messages cannot move an
+order backwards.
+"""
+from datetime import datetime, timezone
+from botocore.exceptions import ClientError
+from utils.dynamo import transact_write_reasons
+
+PENDING = 'pending'
+CONFIRMED = 'confirmed'
+FULFILLED = 'fulfilled'
+CANCELLED = 'cancelled'
+
+ORDER_STATUSES = (PENDING, CONFIRMED, FULFILLED, CANCELLED)
+
+# status -> statuses it may move to
+TRANSITIONS = {
+    PENDING: (CONFIRMED, CANCELLED),
+    CONFIRMED: (FULFILLED,),
+    FULFILLED: (),
+    CANCELLED: ()
+}
+
+# Results of transition_order
+TRANSITIONED = 'transitioned'
+ALREADY_IN_STATUS = 'already_in_status'
+NOT_FOUND = 'not_found'
+INVALID_TRANSITION = 'invalid_transition'
+
+
+def allowed_sources(target):
+    """Statuses from which an order may move to `target`."""
+    return tuple(status for status, targets in TRANSITIONS.items() if target in targets)
+
+
+def is_reachable(source, target):
+    """Whether an order in `source` can end up in `target` (one or more transitions)."""
+    pending = list(TRANSITIONS.get(source, ()))
+    seen = set()
+    while pending:
+        status = pending.pop()
+        if status == target:
+            return True
+        if status not in seen:
+            seen.add(status)
+            pending.extend(TRANSITIONS.get(status, ()))
+    return False
+
+
+def display_status(status):
+    """Status as shown by the API; anything outside the state machine is 'unknown'."""
+    return status if status in ORDER_STATUSES else 'unknown'
+
+
+def transition_update(table_name, order_id, target):
+    """
+    Low-level UpdateItem request moving an order to `target`, conditional on
+    its current status being one that may transition there. On a failed
+    condition DynamoDB returns the current item (ALL_OLD), so callers learn
+    why without a second read.
+    """
+    sources = allowed_sources(target)
+    source_placeholders = ', '.join(f':from{i}' for i in range(len(sources)))
+    values = {f':from{i}': {'S': status} for i, status in enumerate(sources)}
+    values[':target'] = {'S': target}
+    values[':now'] = {'S': datetime.now(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z')}
+    return {
+        'TableName': table_name,
+        'Key': {'orderId': {'S': order_id}},
+        'UpdateExpression': 'SET #status = :target, updatedAt = :now',
+        'ConditionExpression': f'#status IN ({source_placeholders})',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ExpressionAttributeValues': values,
+        'ReturnValuesOnConditionCheckFailure': 'ALL_OLD'
+    }
+
+
+def classify_failed_transition(old_item, target):
+    """
+    Explain a ConditionalCheckFailed on transition_update.
+    old_item: the low-level Item returned with the failure (None if the order is missing)
+    Returns: NOT_FOUND, ALREADY_IN_STATUS (duplicate delivery) or INVALID_TRANSITION
+    """
+    if not old_item:
+        return NOT_FOUND
+    if old_item.get('status', {}).get('S') == target:
+        return ALREADY_IN_STATUS
+    return INVALID_TRANSITION
+
+
+def transition_order(dynamodb_client, table_name, order_id, target, with_items=None):
+    """
+    Move an order to `target` with a single conditional write.
+    with_items: further TransactWriteItems (e.g. sales counters) committed
+                only together with the transition, as one transaction
+                (retried on TransactionConflict)
+    Returns: TRANSITIONED, ALREADY_IN_STATUS, NOT_FOUND or INVALID_TRANSITION
+    Raises: ClientError for DynamoDB errors other than the failed condition
+    """
+    request = transition_update(table_name, order_id, target)
+    if with_items:
+        reasons = transact_write_reasons([{'Update': request}, *with_items])
+        if reasons is None:
+            return TRANSITIONED
+        return classify_failed_transition(reasons[0].get('Item'), target)
+
+    try:
+        dynamodb_client.update_item(**request)
+        return TRANSITIONED
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            raise
+        return classify_failed_transition(e.response.get('Item'), target)
@@ -0,0 +1,112 @@
+"""
+Per-user order summary (UserOrderSummaryTable), maintained by
+order_summarizer from the OrdersTable stream and read by get_orders.
+
+One item per user:
+- orders: the SUMMARY_ORDER_LIMIT newest orders, newest first, each with the
+  event fields the order list renders embedded (no join at read time)
+- hasMore: whether older orders exist beyond `orders`
+- orderCount / ticketCount / totalSpend: totals over all of the user's
+  orders; cancelled orders count as orders but not as tickets or spend
+- applied: recent "<orderId>#<status>" changes already counted, so stream
+  records delivered twice are not counted twice; a listed order also never
+  moves backwards through the order lifecycle, so records replayed after a
+  seed (which starts from current statuses) are skipped too
+- version: optimistic lock between concurrent writers
+"""
+from decimal import Decimal
+from utils.order_status import CANCELLED, is_reachable
+
+SUMMARY_ORDER_LIMIT = 50
+APPLIED_LIMIT = 200
+
+# Only the event fields the order list renders (my_orders.html)
+ORDER_EVENT_FIELDS = ('eventId', 'name', 'performer', 'venue', 'city', 'date', 'price', 'imageUrl')
+EVENT_PROJECTION = '#eid, #name, performer, venue, city, #date, price, imageUrl'
+EVENT_PROJECTION_NAMES = {
+    '#eid': 'eventId',
+    '#name': 'name',
+    '#date': 'date'
+}
+
+# Order attributes copied into a summary entry
+ENTRY_FIELDS = ('orderId', 'userId', 'eventId', 'quantity', 'status', 'createdAt', 'unitPrice')
+
+
+def empty_summary(user_id):
+    return {
+        'userId': user_id,
+        'orders': [],
+        'hasMore': False,
+        'orderCount': 0,
+        'ticketCount': 0,
+        'totalSpend': Decimal(0),
+        'applied': [],
+        'version': 0
+    }
+
+
+def order_amount(order, event=None):
+    """Price paid for an order: its unitPrice, else the event's current price."""
+    unit_price = order.get('unitPrice')
+    if unit_price is None and event:
+        unit_price = event.get('price')
+    return Decimal(str(unit_price or 0)) * int(order.get('quantity', 0))
+
+
+def _contribution(status, order, event):
+    """(tickets, spend) an order in `status` adds to the totals."""
+    if status is None or status == CANCELLED:
+        return 0, Decimal(0)
+    return int(order.get('quantity', 0)), order_amount(order, event)
+
+
+def apply_change(summary, order, previous_status, event=None):
+    """
+    Fold one order image into the summary (mutated in place).
+    previous_status: the status already counted for this order (None when
+                     the order is new to the totals)
+    event: EventsTable item to embed for orders not in the summary yet
+    Returns: False if this change was already applied, or is older than the
+             status the summary lists the order in
+    """
+    order_id = order['orderId']
+    status = order.get('status')
+    token = f"{order_id}#{status}"
+    if token in summary['applied']:
+        return False
+
+    entries = {entry['orderId']: entry for entry in summary['orders']}
+    current = entries.get(order_id)
+    if current is not None:
+        previous_status = current.get('status')
+        # e.g. a replayed INSERT (pending) of an order seeded as confirmed
+        if not is_reachable(previous_status, status):
+            return False
+
+    if previous_status != status:
+        if previous_status is None:
+            summary['orderCount'] += 1
+        old_tickets, old_spend = _contribution(previous_status, order, event or (current or {}).get('event'))
+        new_tickets, new_spend = _contribution(status, order, event or (current or {}).get('event'))
+        summary['ticketCount'] += new_tickets - old_tickets
+        summary['totalSpend'] += new_spend - old_spend
+    summary['applied'] = (summary['applied'] + [token])[-APPLIED_LIMIT:]
+
+    entry = {field: order[field] for field in ENTRY_FIELDS if field in order}
+    embedded = (current or {}).get('event') or event
+    if embedded:
+        entry['event'] = {field: embedded[field] for field in ORDER_EVENT_FIELDS if field in embedded}
+
+    # Orders older than the whole list fall off the end again
+    entries[order_id] = entry
+    ordered = sorted(entries.values(), key=lambda e: (e.get('createdAt', ''), e['orderId']), reverse=True)
+    if len(ordered) > SUMMARY_ORDER_LIMIT:
+        summary['hasMore'] = True
+    summary['orders'] = ordered[:SUMMARY_ORDER_LIMIT]
+    return True
+
+
+def page_key(entry):
+    """UserOrdersIndex ExclusiveStartKey positioned after a summary entry."""
+    return {'orderId': entry['orderId'], 'userId': entry['userId'], 'createdAt': entry['createdAt']}
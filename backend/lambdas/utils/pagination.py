@@ -0,0 +1,89 @@
+import base64
+import json
+from decimal import Decimal
+from utils.serialization import dumps
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+# Upper bound on DynamoDB reads per request when a filter discards most items;
+# the caller gets a short page plus a nextToken instead of a timeout
+MAX_READS_PER_PAGE = 10
+
+
+class InvalidPageRequest(Exception):
+    """Raised when limit/nextToken query parameters cannot be used."""
+
+
+def get_query_params(event):
+    """Return queryStringParameters as a dict (API Gateway sends None when empty)."""
+    return event.get('queryStringParameters') or {}
+
+
+def parse_limit(raw_limit, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    """
+    Parse the `limit` query parameter.
+    Returns: int in [1, maximum]
+    Raises: InvalidPageRequest if not a positive integer
+    """
+    if raw_limit in (None, ''):
+        return default
+    try:
+        limit = int(raw_limit)
+    except (ValueError, TypeError):
+        raise InvalidPageRequest("limit must be a positive integer")
+    if limit <= 0:
+        raise InvalidPageRequest("limit must be a positive integer")
+    return min(limit, maximum)
+
+
+def encode_token(last_evaluated_key):
+    """Turn a DynamoDB LastEvaluatedKey into an opaque, URL-safe nextToken."""
+    if not last_evaluated_key:
+        return None
+    raw = dumps(last_evaluated_key)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_token(token, key_names):
+    """
+    Turn a nextToken back into an ExclusiveStartKey.
+    key_names: the attributes the key must carry (table key + index keys)
+    Raises: InvalidPageRequest if the token is malformed or was issued for another listing
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')), parse_float=Decimal)
+    except (ValueError, TypeError):
+        raise InvalidPageRequest("nextToken is invalid")
+    if not isinstance(key, dict) or set(key) != set(key_names):
+        raise InvalidPageRequest("nextToken is invalid")
+    return key
+
+
+def read_page(operation, kwargs, key_names, limit, max_reads=MAX_READS_PER_PAGE):
+    """
+    Call a table's query/scan, following LastEvaluatedKey until `limit` items
+    are collected or the listing ends.
+    key_names: attributes of the LastEvaluatedKey (table key + index keys)
+    Returns: (items, last evaluated key to resume from or None)
+    """
+    items = []
+    last_key = kwargs.get('ExclusiveStartKey')
+    for _ in range(max_reads):
+        kwargs['Limit'] = limit
+        response = operation(**kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key or len(items) >= limit:
+            break
+        kwargs['ExclusiveStartKey'] = last_key
+
+    if len(items) > limit:
+        # Resume right after the last item we return, not after the last one read
+        items = items[:limit]
+        last_key = {name: items[-1][name] for name in key_names}
+    return items, last_key
+
@@ -0,0 +1,105 @@
+"""
+Salted password hashing with scrypt (hashlib, no extra dependency).
+
+Hashes are stored in UsersTable `passwordHash` as
+
+    scrypt$<cost>$<r>$<p>$<salt>$<hash>      (salt/hash base64)
+
+where cost is log2 of scrypt's N. Every user keeps the cost their hash was
+made with, so PASSWORD_HASH_COST (TicketingStack) can be raised or lowered
+against Lambda CPU time at any moment: login verifies with the stored cost
+and rehashes with the current one (needs_rehash). Use
+backend/benchmarks/bench_login.py to see what a cost does to login latency.
+"""
+import base64
+import hashlib
+import hmac
+import os
+from utils.cache import env_int
+
+SCHEME = 'scrypt'
+# log2(N): every step doubles CPU time and memory (128 * r * N bytes)
+PASSWORD_HASH_COST = env_int('PASSWORD_HASH_COST', 14)
+BLOCK_SIZE = 8
+PARALLELISM = 1
+SALT_BYTES = 16
+HASH_BYTES = 32
+
+_dummy = None
+
+
+def _scrypt(password, salt, cost, r, p):
+    n = 1 << cost
+    return hashlib.scrypt(
+        password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+        # Default limit (32 MiB) is below what cost >= 15 needs
+        maxmem=256 * r * n * p, dklen=HASH_BYTES
+    )
+
+
+def hash_password(password, cost=None):
+    """
+    Hash a password with a fresh salt.
+    cost: log2 of scrypt's N, default PASSWORD_HASH_COST
+    Returns: encoded hash string for `passwordHash`
+    """
+    cost = PASSWORD_HASH_COST if cost is None else int(cost)
+    salt = os.urandom(SALT_BYTES)
+    digest = _scrypt(password, salt, cost, BLOCK_SIZE, PARALLELISM)
+    return '$'.join([
+        SCHEME, str(cost), str(BLOCK_SIZE), str(PARALLELISM),
+        base64.b64encode(salt).decode('ascii'),
+        base64.b64encode(digest).decode('ascii')
+    ])
+
+
+def _parse(encoded):
+    """Returns: (cost, r, p, salt, digest), or None if not a hash of ours."""
+    try:
+        scheme, cost, r, p, salt, digest = encoded.split('$')
+        if scheme != SCHEME:
+            return None
+        return int(cost), int(r), int(p), base64.b64decode(salt), base64.b64decode(digest)
+    except (AttributeError, ValueError):
+        return None
+
+
+def verify_password(password, encoded):
+    """Whether password matches an encoded hash (constant-time compare)."""
+    parsed = _parse(encoded)
+    if parsed is None:
+        return False
+    cost, r, p, salt, digest = parsed
+    return hmac.compare_digest(_scrypt(password, salt, cost, r, p), digest)
+
+
+def needs_rehash(encoded):
+    """Whether a hash was made with other parameters than the current ones."""
+    parsed = _parse(encoded)
+    return parsed is None or parsed[:3] != (PASSWORD_HASH_COST, BLOCK_SIZE, PARALLELISM)
+
+
+def check_user_password(user, password):
+    """
+    Check a password against a UsersTable item. Items written before hashing
+    was introduced still hold a plaintext `password`; they are accepted here
+    and flagged for migration.
+    user: item or None (unknown users still pay for one hash, so response
+          times do not reveal which userIds exist)
+    Returns: (matches, needs_rehash)
+    """
+    if user and user.get('passwordHash'):
+        encoded = user['passwordHash']
+        return verify_password(password, encoded), needs_rehash(encoded)
+    if user and isinstance(user.get('password'), str):
+        return hmac.compare_digest(user['password'].encode('utf-8'), password.encode('utf-8')), True
+    verify_password(password, _dummy_hash())
+    return False, False
+
+
+def _dummy_hash():
+    """Hash verified for unknown users, made once per container."""
+    global _dummy
+    if _dummy is None:
+        _dummy = hash_password('')
+    return _dummy
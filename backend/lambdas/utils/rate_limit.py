@@ -0,0 +1,192 @@
+"""
+Rate limiting for write endpoints, shared by every container.
+
+Each bucket (e.g. purchase per userId, purchase per eventId) is one
+RateLimitTable item enforcing GCRA, the timestamp form of a token bucket: a
+bucket with `rate` requests/second and `burst` capacity stores only its
+theoretical arrival time (tat, epoch ms). A request costs at most two
+conditional updates:
+1. idle bucket (tat <= now): restart it, tat = now + interval
+2. busy bucket: tat += interval, only while tat stays within burst capacity
+If both conditions fail the request is rejected and the caller gets
+Retry-After. A request checked against several buckets is charged to all
+of them or none: buckets already taken are refunded (tat -= interval) when
+a later one rejects it.
+
+Fast path: a container that saw a bucket rejected remembers until when it
+stays empty and rejects further requests locally, without DynamoDB writes.
+Buckets only refill with time, so this never rejects a request DynamoDB
+would have allowed.
+
+Limits come from the environment as "<requests per second>:<burst>"
+(TicketingStack); "off" disables a limit. DynamoDB errors fail open.
+"""
+import math
+import os
+import time
+from collections import namedtuple
+from botocore.exceptions import ClientError
+from utils import clients
+from utils.cache import TTLCache
+from utils.response import JSON_HEADERS, respond
+
+Limit = namedtuple('Limit', ['rate', 'burst'])
+
+rate_limit_table_name = os.environ.get('RATE_LIMIT_TABLE')
+
+# bucket key -> epoch ms until which the bucket is known to be empty
+_blocked_until = TTLCache('rate_limits', max_entries=10000, ttl_seconds=60)
+
+
+class RateLimited(Exception):
+    """Raised when a bucket has no capacity left."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limit exceeded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+def limit_from_env(name, default):
+    """
+    Parse a "<rate>:<burst>" limit from the environment.
+    Returns: Limit, or None when set to "off"
+    """
+    spec = os.environ.get(name, default).strip().lower()
+    if spec in ('off', '0', ''):
+        return None
+    try:
+        rate, burst = spec.split(':')
+        limit = Limit(float(rate), int(burst))
+    except ValueError:
+        rate, burst = default.split(':')
+        limit = Limit(float(rate), int(burst))
+    return limit if limit.rate > 0 and limit.burst > 0 else None
+
+
+PURCHASE_PER_USER = limit_from_env('RATE_LIMIT_PURCHASE_PER_USER', '1:5')
+PURCHASE_PER_EVENT = limit_from_env('RATE_LIMIT_PURCHASE_PER_EVENT', '200:400')
+# Unauthenticated endpoints are limited per caller (source IP), never per
+# userId alone: anyone could otherwise exhaust a victim's bucket
+LOGIN_PER_CLIENT = limit_from_env('RATE_LIMIT_LOGIN_PER_CLIENT', '0.2:5')
+REGISTER_PER_CLIENT = limit_from_env('RATE_LIMIT_REGISTER_PER_CLIENT', '0.1:3')
+
+
+def source_ip(event):
+    """Caller's IP as seen by API Gateway ('unknown' outside API Gateway)."""
+    return ((event.get('requestContext') or {}).get('identity') or {}).get('sourceIp') or 'unknown'
+
+
+def _interval(limit):
+    """Milliseconds between requests of a bucket."""
+    return max(1, round(1000 / limit.rate))
+
+
+def _check_blocked(bucket_key, now_ms):
+    """Reject locally while a bucket is known to be empty. Raises: RateLimited"""
+    blocked_until = _blocked_until.get(bucket_key)
+    if blocked_until is not None and blocked_until > now_ms:
+        raise RateLimited(math.ceil((blocked_until - now_ms) / 1000))
+
+
+def _consume(bucket_key, limit, now_ms):
+    """Take one request from a bucket. Raises: RateLimited"""
+    _check_blocked(bucket_key, now_ms)
+
+    interval = _interval(limit)
+    capacity = interval * limit.burst
+    key = {'bucketKey': {'S': bucket_key}}
+    # The item is useless once the bucket is full again
+    expires_at = {'N': str(now_ms // 1000 + capacity // 1000 + 60)}
+    client = clients.dynamodb()
+
+    try:
+        client.update_item(
+            TableName=rate_limit_table_name,
+            Key=key,
+            UpdateExpression='SET tat = :next, expiresAt = :expiresAt',
+            ConditionExpression='attribute_not_exists(tat) OR tat <= :now',
+            ExpressionAttributeValues={
+                ':next': {'N': str(now_ms + interval)},
+                ':now': {'N': str(now_ms)},
+                ':expiresAt': expires_at
+            }
+        )
+        return
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+    try:
+        client.update_item(
+            TableName=rate_limit_table_name,
+            Key=key,
+            UpdateExpression='SET tat = tat + :interval, expiresAt = :expiresAt',
+            ConditionExpression='tat <= :maxTat',
+            ExpressionAttributeValues={
+                ':interval': {'N': str(interval)},
+                ':maxTat': {'N': str(now_ms + capacity - interval)},
+                ':expiresAt': expires_at
+            },
+            ReturnValuesOnConditionCheckFailure='ALL_OLD'
+        )
+        return
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        current = e.response.get('Item', {}).get('tat')
+        tat = int(current['N']) if current else now_ms + capacity
+        blocked_until = tat - capacity + interval
+        _blocked_until.put(bucket_key, blocked_until)
+        raise RateLimited(max(1, math.ceil((blocked_until - now_ms) / 1000)))
+
+
+def _refund(bucket_key, limit):
+    """Give back a request taken from a bucket."""
+    try:
+        clients.dynamodb().update_item(
+            TableName=rate_limit_table_name,
+            Key={'bucketKey': {'S': bucket_key}},
+            UpdateExpression='SET tat = tat - :interval',
+            ConditionExpression='attribute_exists(tat)',
+            ExpressionAttributeValues={':interval': {'N': str(_interval(limit))}}
+        )
+    except ClientError as e:
+        # At worst the bucket stays charged for a rejected request
+        print(f"WARNING: Unable to refund {bucket_key}: {str(e)}")
+
+
+def enforce(*buckets):
+    """
+    Take one request from each (bucket key, Limit) pair, e.g.
+    enforce((f"purchase#user#{user_id}", PURCHASE_PER_USER)).
+    Disabled limits (None) are skipped. Either every bucket is charged or,
+    when one rejects the request, none is.
+    Raises: RateLimited for the first exhausted bucket
+    """
+    if not rate_limit_table_name:
+        return
+    now_ms = int(time.time() * 1000)
+    buckets = [(bucket_key, limit) for bucket_key, limit in buckets if limit is not None]
+    # Buckets known to be empty reject before any other bucket is charged
+    for bucket_key, _ in buckets:
+        _check_blocked(bucket_key, now_ms)
+
+    taken = []
+    try:
+        for bucket_key, limit in buckets:
+            try:
+                _consume(bucket_key, limit, now_ms)
+                taken.append((bucket_key, limit))
+            except ClientError as e:
+                # Fail open: a limiter outage must not take the API down with it
+                print(f"WARNING: Rate limiter unavailable for {bucket_key}: {str(e)}")
+    except RateLimited:
+        for bucket_key, limit in taken:
+            _refund(bucket_key, limit)
+        raise
+
+
+def rate_limited_response(error):
+    """429 response with Retry-After for a RateLimited error."""
+    headers = {**JSON_HEADERS, "Retry-After": str(error.retry_after)}
+    return respond(429, {"success": False, "error": "Too many requests, please retry later"}, headers)
@@ -0,0 +1,42 @@
+from utils.serialization import dumps
+
+# Built once per container and shared by every response
+JSON_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Expose-Headers": "Retry-After"
+}
+
+CORS_HEADERS = {
+    "Content-Type": "application/json",
+    "Access-Control-Allow-Origin": "*",
+    "Access-Control-Allow-Headers": "Content-Type,Authorization,Idempotency-Key,X-Admission-Token",
+    "Access-Control-Allow-Methods": "GET,POST,OPTIONS"
+}
+
+
+def respond(status_code, body, headers=CORS_HEADERS):
+    """
+    Build an API Gateway proxy response.
+    body: dict (serialized here) or an already serialized JSON string
+    """
+    return {
+        "statusCode": status_code,
+        "headers": headers,
+        "body": body if isinstance(body, str) else dumps(body)
+    }
+
+
+def success_body(data, **extra):
+    """Serialized {"success": true, "data": ...} envelope (plus extra top-level keys)."""
+    return dumps({"success": True, "data": data, **extra})
+
+
+def success_response(data, **extra):
+    """200 response with the success envelope."""
+    return respond(200, success_body(data, **extra))
+
+
+def error_response(status_code, message, headers=JSON_HEADERS):
+    """Error response with the {"success": false, "error": ...} envelope."""
+    return respond(status_code, {"success": False, "error": message}, headers)
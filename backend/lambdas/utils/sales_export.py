@@ -0,0 +1,283 @@
+"""
+Export of OrdersTable as sales rows: one row per order, joined with the
+event it is for, written as gzip'd NDJSON or Parquet files partitioned
+Hive-style by event and order day:
+
+  <prefix>/eventId=<eventId>/date=<YYYY-MM-DD>/part-<writer>-<n>.<ext>
+  <prefix>/_manifest.json  (written last: the export is complete)
+
+OrdersTable is read by a parallel segmented scan. Scan segments hand their
+rows to as many partition writers, each partition going to the one writer
+its hash picks, so a partition is written by a single writer however many
+segments hold its orders. A writer buffers rows per partition and, once it
+holds max_buffered_rows, writes its largest partitions out as part files,
+so memory stays bounded by segments x max_buffered_rows however large the
+table is: a partition gets one file, plus one per spill that picked it.
+Events are read once into a map of the few fields joined, shared by all
+workers.
+
+Parquet output needs pyarrow, which is imported only when asked for.
+"""
+import gzip
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import quote
+from utils import clients
+from utils.dynamo import Table
+from utils.order_summary import order_amount
+from utils.serialization import dumps
+
+MAX_BUFFERED_ROWS = 20000
+
+# column -> Parquet type; NDJSON rows carry the same fields
+SALES_COLUMNS = (
+    ('orderId', 'string'),
+    ('userId', 'string'),
+    ('eventId', 'string'),
+    ('eventName', 'string'),
+    ('category', 'string'),
+    ('city', 'string'),
+    ('eventDate', 'string'),
+    ('quantity', 'int64'),
+    ('unitPrice', 'float64'),
+    ('amount', 'float64'),
+    ('status', 'string'),
+    ('createdAt', 'string'),
+    ('updatedAt', 'string')
+)
+
+ORDER_PROJECTION = 'orderId, userId, eventId, quantity, unitPrice, #status, createdAt, updatedAt'
+EVENT_PROJECTION = 'eventId, #name, category, city, #date, price'
+
+
+def load_event_map(events_table_name):
+    """eventId -> the event fields joined into sales rows (one scan)."""
+    table = Table(events_table_name)
+    events = {}
+    kwargs = {
+        'ProjectionExpression': EVENT_PROJECTION,
+        'ExpressionAttributeNames': {'#name': 'name', '#date': 'date'}
+    }
+    while True:
+        response = table.scan(**kwargs)
+        for item in response.get('Items', []):
+            events[item['eventId']] = item
+        if 'LastEvaluatedKey' not in response:
+            return events
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def sales_row(order, event):
+    """Flat export row of an order; event may be None (deleted event)."""
+    event = event or {}
+    quantity = int(order.get('quantity', 0))
+    amount = order_amount(order, event)
+    return {
+        'orderId': order.get('orderId'),
+        'userId': order.get('userId', ''),
+        'eventId': order.get('eventId', ''),
+        'eventName': event.get('name', ''),
+        'category': event.get('category', ''),
+        'city': event.get('city', ''),
+        'eventDate': event.get('date', ''),
+        'quantity': quantity,
+        'unitPrice': float(amount / quantity) if quantity else 0.0,
+        'amount': float(amount),
+        'status': order.get('status', ''),
+        'createdAt': order.get('createdAt', ''),
+        'updatedAt': order.get('updatedAt', '')
+    }
+
+
+def partition_path(event_id, day):
+    return f"eventId={quote(event_id or 'unknown', safe='')}/date={day or 'unknown'}"
+
+
+def encode_ndjson(rows):
+    return gzip.compress(''.join(dumps(row) + '\n' for row in rows).encode('utf-8'))
+
+
+def _parquet_modules():
+    """(pyarrow, pyarrow.parquet), or ValueError when pyarrow is not bundled."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ValueError("parquet output requires pyarrow")
+    return pyarrow, pyarrow.parquet
+
+
+def encode_parquet(rows):
+    pa, pq = _parquet_modules()
+    schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in SALES_COLUMNS])
+    buffer = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), buffer, compression='snappy')
+    return buffer.getvalue().to_pybytes()
+
+
+# format -> (file extension, encoder, content type)
+FORMATS = {
+    'ndjson': ('ndjson.gz', encode_ndjson, 'application/x-ndjson'),
+    'parquet': ('parquet', encode_parquet, 'application/vnd.apache.parquet')
+}
+
+
+class S3Sink:
+    """Writes export files under s3://bucket/prefix/."""
+
+    def __init__(self, bucket, prefix):
+        self.bucket = bucket
+        self.prefix = prefix.strip('/')
+
+    def location(self):
+        return f"s3://{self.bucket}/{self.prefix}"
+
+    def write(self, key, body, content_type):
+        clients.client('s3').put_object(
+            Bucket=self.bucket,
+            Key=f"{self.prefix}/{key}",
+            Body=body,
+            ContentType=content_type
+        )
+
+
+class DirectorySink:
+    """Writes export files under a local directory (scripts and tests)."""
+
+    def __init__(self, directory, prefix=''):
+        self.root = os.path.join(directory, prefix)
+
+    def location(self):
+        return self.root
+
+    def write(self, key, body, content_type):
+        path = os.path.join(self.root, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+
+
+def partition_of(row):
+    return row['eventId'], row['createdAt'][:10]
+
+
+class _PartitionWriter:
+    """Per-partition row buffers of one writer, spilled to part files."""
+
+    def __init__(self, index, sink, fmt, max_buffered_rows):
+        self.index = index
+        self.sink = sink
+        self.extension, self.encode, self.content_type = FORMATS[fmt]
+        self.max_buffered_rows = max_buffered_rows
+        # Scan segments add rows concurrently
+        self.lock = threading.Lock()
+        self.buffers = {}  # (eventId, day) -> rows
+        self.buffered = 0
+        self.rows = 0
+        self.files = 0
+        self.bytes = 0
+
+    def add(self, rows):
+        with self.lock:
+            for row in rows:
+                self.buffers.setdefault(partition_of(row), []).append(row)
+            self.buffered += len(rows)
+            if self.buffered >= self.max_buffered_rows:
+                # Largest partitions first, down to half the budget, so one
+                # spill writes few, large files
+                while self.buffered > self.max_buffered_rows // 2:
+                    self._flush(max(self.buffers, key=lambda key: len(self.buffers[key])))
+
+    def close(self):
+        with self.lock:
+            for partition in list(self.buffers):
+                self._flush(partition)
+
+    def _flush(self, partition):
+        rows = self.buffers.pop(partition)
+        body = self.encode(rows)
+        key = f"{partition_path(*partition)}/part-{self.index:03d}-{self.files:05d}.{self.extension}"
+        self.sink.write(key, body, self.content_type)
+        self.buffered -= len(rows)
+        self.rows += len(rows)
+        self.files += 1
+        self.bytes += len(body)
+
+
+def _writer_index(partition, writers):
+    """Writer owning a partition (stable across segments and runs)."""
+    return zlib.crc32('/'.join(partition).encode('utf-8')) % writers
+
+
+def _export_segment(orders_table_name, events, writers, segment, segments):
+    """Scan one segment of OrdersTable into the partitions' writers. Returns rows scanned."""
+    table = Table(orders_table_name)
+    scanned = 0
+    kwargs = {
+        'Segment': segment,
+        'TotalSegments': segments,
+        'ProjectionExpression': ORDER_PROJECTION,
+        'ExpressionAttributeNames': {'#status': 'status'}
+    }
+    while True:
+        response = table.scan(**kwargs)
+        # One lock round per writer and page
+        routed = {}
+        for order in response.get('Items', []):
+            row = sales_row(order, events.get(order.get('eventId')))
+            routed.setdefault(_writer_index(partition_of(row), len(writers)), []).append(row)
+        for index, rows in routed.items():
+            writers[index].add(rows)
+            scanned += len(rows)
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"Export segment {segment}/{segments} scanned: Rows={scanned}")
+    return scanned
+
+
+def export_sales(orders_table_name, events_table_name, sink, fmt='ndjson', segments=8,
+                 max_buffered_rows=MAX_BUFFERED_ROWS):
+    """
+    Export every order to `sink` (S3Sink or DirectorySink).
+    Returns: the manifest ({format, rows, files, bytes, ...})
+    Raises: ValueError for an unknown format or missing pyarrow
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    if fmt == 'parquet':
+        _parquet_modules()
+
+    started_at = datetime.now(timezone.utc).isoformat().replace('+00:00', 'Z')
+    started = time.perf_counter()
+    events = load_event_map(events_table_name)
+
+    writers = [_PartitionWriter(index, sink, fmt, max_buffered_rows) for index in range(segments)]
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        futures = [
+            pool.submit(_export_segment, orders_table_name, events, writers, segment, segments)
+            for segment in range(segments)
+        ]
+        for future in futures:
+            future.result()
+        # Remaining buffers, one writer per thread
+        for future in [pool.submit(writer.close) for writer in writers]:
+            future.result()
+
+    manifest = {
+        'format': fmt,
+        'columns': [name for name, _ in SALES_COLUMNS],
+        'partitioning': ['eventId', 'date'],
+        'segments': segments,
+        'rows': sum(writer.rows for writer in writers),
+        'files': sum(writer.files for writer in writers),
+        'bytes': sum(writer.bytes for writer in writers),
+        'startedAt': started_at,
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    sink.write('_manifest.json', dumps(manifest).encode('utf-8'), 'application/json')
+    return manifest
@@ -0,0 +1,169 @@
+"""
+In-memory inverted index over the event catalog, for GET /events/search.
+
+Documents are EventsTable items; `name`, `performer`, `venue` and
+`description` are tokenized into postings (term -> {eventId: weight}), with
+matches in the name counting most. A query matches events containing every
+query term (the last term also as a prefix, for search-as-you-type) and is
+ranked by tf-idf. category / city / price filters are applied to the
+matches, and facet counts per category and city are computed over the
+matches with all filters but their own, so each facet lists the
+alternatives a user can switch to.
+
+The index is mutable (upsert / remove), so warm containers keep it and apply
+catalog changes incrementally instead of rebuilding it (see search.py).
+"""
+import bisect
+import math
+import re
+
+# field -> weight of one occurrence
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'performer': 2.0,
+    'venue': 1.5,
+    'description': 1.0
+}
+
+# What a search result carries: the list view, without the description
+RESULT_FIELDS = (
+    'eventId', 'name', 'imageUrl', 'performer', 'venue', 'city',
+    'date', 'price', 'category', 'waitingRoom'
+)
+
+FACET_FIELDS = ('category', 'city')
+
+_TOKEN = re.compile(r'[a-z0-9]+')
+_STOPWORDS = frozenset(['a', 'an', 'and', 'at', 'for', 'in', 'of', 'on', 'the', 'to', 'with'])
+
+
+def tokenize(text):
+    """Lowercase alphanumeric terms of text, without stopwords."""
+    return [t for t in _TOKEN.findall(str(text or '').lower()) if t not in _STOPWORDS]
+
+
+def _price(item):
+    try:
+        return float(item.get('price') or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SearchIndex:
+    """Inverted index plus the filterable fields of every indexed event."""
+
+    def __init__(self):
+        self.postings = {}   # term -> {eventId: weight}
+        self.documents = {}  # eventId -> {'terms': set, 'category', 'city', 'price', 'date', 'item'}
+        self._vocabulary = None  # sorted terms, rebuilt lazily for prefix lookups
+
+    def __len__(self):
+        return len(self.documents)
+
+    def upsert(self, item):
+        """Index (or re-index) one EventsTable item."""
+        event_id = item['eventId']
+        self.remove(event_id)
+
+        weights = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            for term in tokenize(item.get(field)):
+                weights[term] = weights.get(term, 0.0) + weight
+        if any(term not in self.postings for term in weights):
+            self._vocabulary = None
+        for term, weight in weights.items():
+            self.postings.setdefault(term, {})[event_id] = weight
+
+        self.documents[event_id] = {
+            'terms': set(weights),
+            'category': item.get('category', ''),
+            'city': item.get('city', ''),
+            'price': _price(item),
+            'date': item.get('date', ''),
+            'item': {field: item[field] for field in RESULT_FIELDS if field in item}
+        }
+
+    def remove(self, event_id):
+        """Drop an event from the index (no-op if absent)."""
+        document = self.documents.pop(event_id, None)
+        if document is None:
+            return
+        for term in document['terms']:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(event_id, None)
+                if not postings:
+                    del self.postings[term]
+                    self._vocabulary = None
+
+    def _expand(self, term):
+        """Indexed terms starting with term."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + '\uffff')
+        return self._vocabulary[start:end]
+
+    def _match(self, query):
+        """
+        eventId -> score for events containing every query term; None when
+        the query has no terms (everything matches).
+        """
+        terms = tokenize(query)
+        if not terms:
+            return None
+
+        total = max(len(self.documents), 1)
+        scores = None
+        for position, term in enumerate(terms):
+            # The last term may still be being typed
+            candidates = self._expand(term) if position == len(terms) - 1 else [term]
+            term_scores = {}
+            for candidate in candidates:
+                postings = self.postings.get(candidate, {})
+                idf = math.log(1 + total / len(postings)) if postings else 0.0
+                for event_id, weight in postings.items():
+                    term_scores[event_id] = max(term_scores.get(event_id, 0.0), weight * idf)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {eid: score + term_scores[eid] for eid, score in scores.items() if eid in term_scores}
+            if not scores:
+                return {}
+        return scores
+
+    def search(self, query='', category=None, city=None, min_price=None, max_price=None):
+        """
+        Returns: (ranked list of result items, facets) where facets is
+        {'category': {value: count}, 'city': {value: count}}
+        """
+        scores = self._match(query)
+        candidates = self.documents.keys() if scores is None else scores.keys()
+
+        filters = {'category': category, 'city': city}
+        results = []
+        facets = {field: {} for field in FACET_FIELDS}
+        for event_id in candidates:
+            document = self.documents[event_id]
+            if min_price is not None and document['price'] < min_price:
+                continue
+            if max_price is not None and document['price'] > max_price:
+                continue
+
+            failed = [field for field, wanted in filters.items()
+                      if wanted and document[field].lower() != wanted.lower()]
+            # Facet counts ignore the facet's own filter
+            for field in FACET_FIELDS:
+                if not failed or failed == [field]:
+                    value = document[field]
+                    if value:
+                        facets[field][value] = facets[field].get(value, 0) + 1
+            if not failed:
+                results.append(event_id)
+
+        if scores is None:
+            # No text query: upcoming events first
+            results.sort(key=lambda eid: (self.documents[eid]['date'], eid))
+        else:
+            results.sort(key=lambda eid: (-scores[eid], self.documents[eid]['date'], eid))
+        return [self.documents[eid]['item'] for eid in results], facets
@@ -0,0 +1,122 @@
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from utils.order_status import display_status
+
+# orjson is optional: several times faster than json when it is bundled
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+EVENT_FIELDS = (
+    'eventId', 'name', 'description', 'imageUrl', 'remainingTickets',
+    'performer', 'venue', 'city', 'date', 'price', 'category', 'waitingRoom'
+)
+
+
+def _default(value):
+    """Serialize DynamoDB Decimals as int when integral, float otherwise."""
+    if isinstance(value, Decimal):
+        return int(value) if value % 1 == 0 else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    def dumps(value):
+        """Serialize to a JSON string (Decimal-aware)."""
+        return orjson.dumps(value, default=_default).decode('utf-8')
+else:
+    _encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+
+    def dumps(value):
+        """Serialize to a JSON string (Decimal-aware)."""
+        return _encoder.encode(value)
+
+
+def _to_int(value):
+    return int(value) if value is not None else 0
+
+
+def _to_float(value):
+    return float(value) if value is not None else 0
+
+
+def _to_number(value):
+    return _default(value) if value is not None else 0
+
+
+# field -> converter for DynamoDB values (numbers arrive as Decimal)
+_EVENT_CONVERTERS = {
+    'remainingTickets': _to_int,
+    'price': _to_float,
+    'waitingRoom': bool
+}
+
+# Order listings have always returned integral prices as ints
+ORDER_EVENT_CONVERTERS = {**_EVENT_CONVERTERS, 'price': _to_number}
+
+
+def project_event(item, fields=EVENT_FIELDS, converters=_EVENT_CONVERTERS):
+    """
+    Map an EventsTable item to the API representation; missing string fields
+    become '' and missing numbers 0.
+    fields: subset to emit (e.g. only what a list view renders)
+    converters: per-field number conversions (ORDER_EVENT_CONVERTERS for
+                events embedded in orders)
+    """
+    event = {}
+    for field in fields:
+        convert = converters.get(field)
+        if convert is not None:
+            event[field] = convert(item.get(field))
+        elif field == 'eventId':
+            event[field] = item.get(field)
+        else:
+            event[field] = item.get(field, '')
+    return event
+
+
+def format_timestamp(raw):
+    """ISO timestamp (e.g. createdAt) as 'YYYY-MM-DD HH:MM:SS'; unparseable values are returned unchanged."""
+    try:
+        return datetime.fromisoformat(raw.replace('Z', '+00:00')).strftime("%Y-%m-%d %H:%M:%S")
+    except (AttributeError, ValueError):
+        return raw
+
+
+def project_order(item, event=None):
+    """
+    Map an OrdersTable item to the API representation.
+    event: already projected event to embed, if any
+    """
+    order = {
+        'orderId': item.get('orderId'),
+        'eventId': item.get('eventId'),
+        'userId': item.get('userId', ''),
+        'quantity': _to_int(item.get('quantity')),
+        'status': display_status(item.get('status')),
+        'createdAt': format_timestamp(item.get('createdAt', ''))
+    }
+    if event is not None:
+        order['event'] = event
+    return order
+
+
+def format_epoch(seconds):
+    """Epoch seconds (e.g. a hold's expiresAt) as an ISO UTC timestamp."""
+    return datetime.fromtimestamp(int(seconds), timezone.utc).isoformat().replace('+00:00', 'Z')
+
+
+def project_hold(item):
+    """Map a HoldsTable item to the API representation."""
+    hold = {
+        'holdId': item.get('holdId'),
+        'eventId': item.get('eventId'),
+        'quantity': _to_int(item.get('quantity')),
+        'status': item.get('holdState', ''),
+        'expiresAt': format_epoch(item.get('expiresAt', 0))
+    }
+    if item.get('orderId'):
+        hold['orderId'] = item['orderId']
+    return hold
@@ -0,0 +1,89 @@
+"""
+HMAC-signed tokens (compact JWS, HS256), verified without any I/O.
+
+The signing key is read once per container: from Secrets Manager when
+SIGNING_SECRET_ARN is set (TicketingStack), else from SIGNING_KEY (local
+runs). Every token carries a `use` claim, so a token minted for one purpose
+(e.g. waiting-room admission) is never accepted for another.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+from utils import clients
+
+_HEADER = base64.urlsafe_b64encode(b'{"alg":"HS256","typ":"JWT"}').rstrip(b'=')
+
+_key = None
+_key_lock = threading.Lock()
+
+
+class InvalidToken(Exception):
+    """Raised when a token is malformed, forged, expired or minted for another use."""
+
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b'=')
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + b'=' * (-len(text) % 4))
+
+
+def signing_key():
+    """HMAC key, fetched on first use and cached for the container's lifetime."""
+    global _key
+    if _key is None:
+        with _key_lock:
+            if _key is None:
+                secret_arn = os.environ.get('SIGNING_SECRET_ARN')
+                if secret_arn:
+                    secret = clients.client('secretsmanager').get_secret_value(SecretId=secret_arn)
+                    _key = secret['SecretString'].encode('utf-8')
+                elif os.environ.get('SIGNING_KEY'):
+                    _key = os.environ['SIGNING_KEY'].encode('utf-8')
+                else:
+                    raise RuntimeError("SIGNING_SECRET_ARN or SIGNING_KEY must be set")
+    return _key
+
+
+def sign(claims, use, ttl_seconds, now=None):
+    """
+    Mint a token carrying claims plus `use`, `iat` and `exp` (epoch seconds).
+    Returns: token string
+    """
+    now = int(now if now is not None else time.time())
+    payload = {**claims, 'use': use, 'iat': now, 'exp': now + int(ttl_seconds)}
+    signing_input = _HEADER + b'.' + _b64encode(
+        json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8'))
+    signature = hmac.new(signing_key(), signing_input, hashlib.sha256).digest()
+    return (signing_input + b'.' + _b64encode(signature)).decode('ascii')
+
+
+def verify(token, use, now=None):
+    """
+    Check a token's signature, expiry and `use`.
+    Returns: its claims
+    Raises: InvalidToken
+    """
+    if not token or not isinstance(token, str):
+        raise InvalidToken("Missing token")
+    try:
+        raw = token.encode('ascii')
+        header, payload, signature = raw.split(b'.')
+        expected = hmac.new(signing_key(), header + b'.' + payload, hashlib.sha256).digest()
+        if header != _HEADER or not hmac.compare_digest(_b64decode(signature), expected):
+            raise InvalidToken("Invalid token signature")
+        claims = json.loads(_b64decode(payload))
+        if not isinstance(claims, dict) or claims.get('use') != use:
+            raise InvalidToken("Token is not valid for this use")
+        expires_at = int(claims.get('exp', 0))
+    except (ValueError, UnicodeError, TypeError):
+        raise InvalidToken("Malformed token")
+
+    if expires_at <= int(now if now is not None else time.time()):
+        raise InvalidToken("Token has expired")
+    return claims
@@ -0,0 +1,160 @@
+"""
+Virtual waiting room for hot events (EventsTable `waitingRoom` = true).
+
+Each room stores the next free admission time (nextAdmitAt, epoch ms) and
+advances it by one admission interval (1 / admissionRate) per join:
+
+    admitAt = max(now, nextAdmitAt);  nextAdmitAt = admitAt + interval
+
+so buyers are let through at a fixed rate without any scheduler, and a room
+that sat idle builds up no credit: the first buyer after a lull is admitted
+at once and the next ones are spaced out again. Like the rate limiter
+(utils.rate_limit), a join costs one conditional update while the queue is
+busy and two when the room restarts idle. The position, admitAt and the
+room's rate travel in a signed admission token (utils.signing); polling and
+the admission check in purchase / create_hold only verify that token,
+without reading DynamoDB.
+"""
+import math
+import time
+from botocore.exceptions import ClientError
+from utils.auth import get_header
+from utils.cache import env_int
+from utils.signing import InvalidToken, sign, verify
+
+ADMISSION_HEADER = 'X-Admission-Token'
+ADMISSION_USE = 'admission'
+
+# Buyers admitted per second, unless the event sets admissionRate
+DEFAULT_ADMISSION_RATE = env_int('WAITING_ROOM_ADMISSION_RATE', 50)
+# How long an admitted buyer may keep purchasing
+ADMISSION_WINDOW_SECONDS = env_int('ADMISSION_WINDOW_SECONDS', 10 * 60)
+
+
+class AdmissionDenied(Exception):
+    """Raised when a request to a waiting-room event is not (yet) admitted."""
+
+
+def is_gated(event_item):
+    """Whether purchases of this event go through the waiting room."""
+    return bool(event_item.get('waitingRoom'))
+
+
+def admission_rate(event_item):
+    """Buyers admitted per second for this event."""
+    return max(1, int(event_item.get('admissionRate') or DEFAULT_ADMISSION_RATE))
+
+
+def _take_slot(table, event_id, interval, now_ms):
+    """
+    Reserve the room's next admission slot.
+    Returns: (position, admission time in epoch ms)
+    """
+    key = {'eventId': event_id}
+    # Busy room: the next slot is still ahead, take it
+    try:
+        room = table.update_item(
+            Key=key,
+            UpdateExpression='ADD nextAdmitAt :interval, lastPosition :one',
+            ConditionExpression='nextAdmitAt > :now',
+            ExpressionAttributeValues={':interval': interval, ':one': 1, ':now': now_ms},
+            ReturnValues='ALL_NEW'
+        )['Attributes']
+        return int(room['lastPosition']), int(room['nextAdmitAt']) - interval
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+    # Idle (or new) room: restart the schedule at now
+    try:
+        room = table.update_item(
+            Key=key,
+            UpdateExpression='SET nextAdmitAt = :next ADD lastPosition :one',
+            ConditionExpression='attribute_not_exists(nextAdmitAt) OR nextAdmitAt <= :now',
+            ExpressionAttributeValues={':next': now_ms + interval, ':one': 1, ':now': now_ms},
+            ReturnValues='ALL_NEW'
+        )['Attributes']
+        return int(room['lastPosition']), now_ms
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+
+    # A concurrent join restarted it first; nextAdmitAt only moves forward,
+    # so it is ahead of now from here on
+    room = table.update_item(
+        Key=key,
+        UpdateExpression='ADD nextAdmitAt :interval, lastPosition :one',
+        ExpressionAttributeValues={':interval': interval, ':one': 1},
+        ReturnValues='ALL_NEW'
+    )['Attributes']
+    return int(room['lastPosition']), int(room['nextAdmitAt']) - interval
+
+
+def join(table, event_item, user_id, now=None):
+    """
+    Take the next position in the event's queue.
+    table: WaitingRoomTable (utils.dynamo.Table)
+    Returns: signed admission token
+    """
+    now = now if now is not None else time.time()
+    rate = admission_rate(event_item)
+    interval = max(1, round(1000 / rate))
+    position, admit_at_ms = _take_slot(table, event_item['eventId'], interval, int(now * 1000))
+
+    admit_at = admit_at_ms // 1000
+    claims = {
+        'eventId': event_item['eventId'],
+        'userId': user_id,
+        'position': position,
+        'rate': rate,
+        'admitAt': admit_at
+    }
+    now = int(now)
+    ttl = max(admit_at - now, 0) + ADMISSION_WINDOW_SECONDS
+    return sign(claims, ADMISSION_USE, ttl, now)
+
+
+def read_token(token, event_id):
+    """
+    Verify an admission token for event_id.
+    Returns: its claims
+    Raises: AdmissionDenied
+    """
+    try:
+        claims = verify(token, ADMISSION_USE)
+    except InvalidToken:
+        raise AdmissionDenied("A valid admission token is required")
+    if claims.get('eventId') != event_id:
+        raise AdmissionDenied("A valid admission token is required")
+    return claims
+
+
+def queue_status(claims, now=None):
+    """Position report for polling clients, computed from the token alone."""
+    now = int(now if now is not None else time.time())
+    wait = max(claims['admitAt'] - now, 0)
+    # Buyers ahead are admitted `rate` per second until admitAt
+    return {
+        'position': claims['position'],
+        'ahead': min(claims['position'] - 1, wait * claims['rate']),
+        'admitted': wait == 0,
+        'admitAt': claims['admitAt'],
+        'waitSeconds': wait,
+        # Suggested polling interval
+        'retryAfter': min(max(math.ceil(wait / 4), 1), 30)
+    }
+
+
+def check_admission(event, event_item, user_id, now=None):
+    """
+    Gate a write request on a waiting-room event; no-op for other events.
+    Raises: AdmissionDenied without a valid token of this user for this
+            event, or before the token's admission time
+    """
+    if not is_gated(event_item):
+        return
+    claims = read_token(get_header(event, ADMISSION_HEADER), event_item['eventId'])
+    if claims.get('userId') != user_id:
+        raise AdmissionDenied("A valid admission token is required")
+    if claims['admitAt'] > int(now if now is not None else time.time()):
+        raise AdmissionDenied("Not admitted yet, keep waiting")
@@ -0,0 +1,54 @@
+import os
+from utils.auth import verify_token, auth_response_401, get_header
+from utils.dynamo import Table
+from utils.events import load_event
+from utils.response import error_response, success_response
+from utils.waiting_room import (
+    ADMISSION_HEADER, AdmissionDenied, is_gated, join, read_token, queue_status
+)
+
+events_table = Table(os.environ['EVENTS_TABLE'])
+waiting_room_table = Table(os.environ['WAITING_ROOM_TABLE'])
+
+
+def lambda_handler(event, context):
+    """
+    POST /events/{eventId}/queue - join the event's waiting room; returns a
+        signed admission token and the queue position
+    GET /events/{eventId}/queue - poll the position of the X-Admission-Token
+        header; answered from the token alone (no DynamoDB read), so clients
+        can poll cheaply
+
+    Once admitted, the same token is sent as X-Admission-Token with
+    POST /purchase and POST /holds.
+    """
+    try:
+        event_id = (event.get('pathParameters') or {}).get('eventId')
+        if not event_id:
+            return error_response(400, "eventId is required")
+
+        if event.get('httpMethod') == 'GET':
+            try:
+                claims = read_token(get_header(event, ADMISSION_HEADER), event_id)
+            except AdmissionDenied as e:
+                return error_response(403, str(e))
+            return success_response(queue_status(claims))
+
+        # Authenticate user from token: admission is bound to the user
+        try:
+            user_id = verify_token(event)
+        except:
+            return auth_response_401()
+
+        # Checked against metaVersion, so opening or closing the room applies at once
+        event_item = load_event(events_table, event_id)
+        if event_item is None:
+            return error_response(404, "Event not found")
+        if not is_gated(event_item):
+            return error_response(400, "Event has no waiting room")
+
+        token = join(waiting_room_table, event_item, user_id)
+        claims = read_token(token, event_id)
+        return success_response({"admissionToken": token, **queue_status(claims)})
+    except Exception as e:
+        return error_response(500, str(e))
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Rebuild EventStatsTable (per-event sales counters) from OrdersTable
+
+order_consumer keeps the counters current as it confirms orders; this
+rebuilds them for orders confirmed before the counters existed, or after
+they drifted. OrdersTable is read by a parallel segmented scan in which
+every segment sums its confirmed and fulfilled orders per event and hour
+(revenue from the order's unitPrice or, for older orders, the event's
+price). The sums replace the counters as shard 0 of every bucket (see
+lambdas/utils/event_stats.py); all other counter items are deleted.
+
+Counters are replaced, not adjusted: pause order_consumer while this runs
+(disable its SQS event source), or orders confirmed meanwhile may be
+counted twice or not at all.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from pathlib import Path
+from bulk_write import write_items
+
+# Aggregate with the lambdas' own code, so the buckets match order_consumer's
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambdas'))
+from utils.dynamo import Table  # noqa: E402
+from utils.event_stats import hour_bucket, hour_of, total_bucket  # noqa: E402
+from utils.order_status import CONFIRMED, FULFILLED  # noqa: E402
+from utils.order_summary import order_amount  # noqa: E402
+from utils.sales_export import load_event_map  # noqa: E402
+
+# Orders order_consumer has counted (TRANSITIONS never moves a confirmed order back)
+COUNTED_STATUSES = (CONFIRMED, FULFILLED)
+
+
+def sum_segment(orders_table_name, events, segment, segments):
+    """
+    Sum one scan segment of OrdersTable.
+    Returns: (orders scanned, {(eventId, bucket): [tickets, revenue, orders]})
+    """
+    table = Table(orders_table_name)
+    sums = {}
+    scanned = 0
+    kwargs = {
+        'Segment': segment,
+        'TotalSegments': segments,
+        'ProjectionExpression': 'eventId, quantity, unitPrice, #status, createdAt',
+        'ExpressionAttributeNames': {'#status': 'status'}
+    }
+    while True:
+        response = table.scan(**kwargs)
+        for order in response.get('Items', []):
+            scanned += 1
+            if order.get('status') not in COUNTED_STATUSES or not order.get('eventId'):
+                continue
+            quantity = int(order.get('quantity', 0))
+            amount = order_amount(order, events.get(order['eventId']))
+            buckets = [total_bucket()]
+            if order.get('createdAt'):
+                buckets.append(hour_bucket(hour_of(order['createdAt'])))
+            for bucket in buckets:
+                counters = sums.setdefault((order['eventId'], bucket), [0, Decimal(0), 0])
+                counters[0] += quantity
+                counters[1] += amount
+                counters[2] += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    print(f"  segment {segment + 1}/{segments}: {scanned} orders scanned")
+    return scanned, sums
+
+
+def existing_keys(stats_table_name):
+    """Keys of every counter item currently in EventStatsTable."""
+    table = Table(stats_table_name)
+    keys = []
+    kwargs = {'ProjectionExpression': 'eventId, #bucket', 'ExpressionAttributeNames': {'#bucket': 'bucket'}}
+    while True:
+        response = table.scan(**kwargs)
+        keys.extend((item['eventId'], item['bucket']) for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return keys
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def backfill(orders_table_name, events_table_name, stats_table_name, region='us-east-1', segments=8):
+    """Recompute every counter and replace EventStatsTable's contents"""
+    started = time.perf_counter()
+    events = load_event_map(events_table_name)
+
+    print(f"Summing {orders_table_name} in {segments} segments")
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        results = list(pool.map(
+            lambda segment: sum_segment(orders_table_name, events, segment, segments),
+            range(segments)
+        ))
+
+    sums = {}
+    for _, segment_sums in results:
+        for key, (tickets, revenue, orders) in segment_sums.items():
+            counters = sums.setdefault(key, [0, Decimal(0), 0])
+            counters[0] += tickets
+            counters[1] += revenue
+            counters[2] += orders
+    scanned = sum(count for count, _ in results)
+
+    items = [
+        {'eventId': event_id, 'bucket': bucket, 'tickets': tickets, 'revenue': revenue, 'orders': orders}
+        for (event_id, bucket), (tickets, revenue, orders) in sums.items()
+    ]
+    stale = [
+        {'eventId': event_id, 'bucket': bucket}
+        for event_id, bucket in existing_keys(stats_table_name)
+        if (event_id, bucket) not in sums
+    ]
+
+    print(f"\nWriting {len(items)} counters to {stats_table_name}, deleting {len(stale)} stale ones")
+    written = write_items(stats_table_name, items, region, segments,
+                          key_names=['eventId', 'bucket'], unit='counters')
+    deleted = write_items(stats_table_name, stale, region, segments,
+                          key_names=['eventId', 'bucket'], unit='counters', delete=True)
+
+    elapsed = time.perf_counter() - started
+    events_counted = len({event_id for event_id, _ in sums})
+    print(f"\n{'='*50}")
+    print(
+        f"Summary: {scanned} orders scanned, {events_counted} events, {written.written} counters "
+        f"written, {deleted.written} deleted in {elapsed:.1f}s ({scanned / elapsed:.0f} orders/s)")
+    print(f"{'='*50}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild per-event sales counters from existing orders')
+    parser.add_argument('--orders-table-name',
+                        default=os.environ.get('ORDERS_TABLE'),
+                        help='OrdersTable name (or set ORDERS_TABLE env var)')
+    parser.add_argument('--events-table-name',
+                        default=os.environ.get('EVENTS_TABLE'),
+                        help='EventsTable name, for orders without unitPrice (or set EVENTS_TABLE env var)')
+    parser.add_argument('--stats-table-name',
+                        default=os.environ.get('EVENT_STATS_TABLE'),
+                        help='EventStatsTable name (or set EVENT_STATS_TABLE env var)')
+    parser.add_argument('--region',
+                        default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help='AWS region (default: us-east-1)')
+    parser.add_argument('--segments', type=int, default=8,
+                        help='Parallel scan segments (default: 8)')
+
+    args = parser.parse_args()
+
+    if not (args.orders_table_name and args.events_table_name and args.stats_table_name):
+        print("Error: Table names are required!")
+        print("Usage: python backfill_event_stats.py --orders-table-name <ORDERS> "
+              "--events-table-name <EVENTS> --stats-table-name <EVENT_STATS>")
+        return
+
+    # The lambdas' shared clients take their region from the environment
+    os.environ['AWS_DEFAULT_REGION'] = args.region
+    backfill(args.orders_table_name, args.events_table_name, args.stats_table_name,
+             args.region, max(1, args.segments))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Parallel bulk writes to DynamoDB, shared by the seed and import scripts
+
+Items are split into segments written concurrently. Each segment uses its
+own boto3 session (resources are not thread-safe) and its own batch_writer,
+which sends BatchWriteItem requests of 25 items and resends unprocessed
+items until DynamoDB accepts them. Progress reports items per second.
+"""
+
+import boto3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROGRESS_EVERY_SECONDS = 5
+
+
+class Progress:
+    """Thread-safe counters with periodic items/second output"""
+
+    def __init__(self, total, unit='items'):
+        self.total = total
+        self.unit = unit
+        self.written = 0
+        self.errors = 0
+        self.started = time.perf_counter()
+        self._last_report = self.started
+        self._lock = threading.Lock()
+
+    def add(self, written=0, errors=0):
+        with self._lock:
+            self.written += written
+            self.errors += errors
+            now = time.perf_counter()
+            if now - self._last_report >= PROGRESS_EVERY_SECONDS:
+                self._last_report = now
+                print(f"  {self.written}/{self.total} {self.unit}, {self.rate():.0f} {self.unit}/s")
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def rate(self):
+        elapsed = self.elapsed()
+        return self.written / elapsed if elapsed > 0 else 0.0
+
+
+def write_segment(table_name, region, items, progress, key_names=None, to_item=None, delete=False):
+    """
+    Write one segment through its own batch_writer.
+    key_names: primary key attributes; duplicates within a batch are dropped
+               (last item wins) instead of failing the request
+    to_item: optional conversion applied in the worker; a ValueError skips
+             the item and counts it as an error
+    delete: items are keys to delete instead of items to put
+    """
+    table = boto3.session.Session().resource('dynamodb', region_name=region).Table(table_name)
+    with table.batch_writer(overwrite_by_pkeys=key_names) as batch:
+        for item in items:
+            if to_item is not None:
+                try:
+                    item = to_item(item)
+                except ValueError as e:
+                    print(f"Skipping row: {e}")
+                    progress.add(errors=1)
+                    continue
+            if delete:
+                batch.delete_item(Key=item)
+            else:
+                batch.put_item(Item=item)
+            progress.add(written=1)
+
+
+def write_items(table_name, items, region='us-east-1', segments=8, key_names=None,
+                to_item=None, unit='items', delete=False):
+    """
+    Write `items` to table_name across `segments` parallel workers.
+    Returns: the Progress with final counts
+    """
+    progress = Progress(len(items), unit)
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        futures = [
+            pool.submit(write_segment, table_name, region, items[segment::segments],
+                        progress, key_names, to_item, delete)
+            for segment in range(segments)
+        ]
+        for future in futures:
+            future.result()
+    return progress
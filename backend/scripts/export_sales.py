@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Export OrdersTable, joined with EventsTable, as sales files
+
+Same export as the sales-exporter Lambda (see lambdas/utils/sales_export.py):
+a parallel segmented scan of orders streamed into gzip'd NDJSON or Parquet
+part files partitioned by eventId and order date, written to an S3 bucket
+or a local directory. Memory stays bounded by --segments x
+--max-buffered-rows whatever the table size.
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Run the lambdas' own export code
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambdas'))
+from utils.sales_export import (  # noqa: E402
+    FORMATS, MAX_BUFFERED_ROWS, DirectorySink, S3Sink, export_sales
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Export orders joined with their events to NDJSON or Parquet files')
+    parser.add_argument('--orders-table-name',
+                        default=os.environ.get('ORDERS_TABLE'),
+                        help='OrdersTable name (or set ORDERS_TABLE env var)')
+    parser.add_argument('--events-table-name',
+                        default=os.environ.get('EVENTS_TABLE'),
+                        help='EventsTable name (or set EVENTS_TABLE env var)')
+    destination = parser.add_mutually_exclusive_group(required=True)
+    destination.add_argument('--bucket', help='S3 bucket to write to')
+    destination.add_argument('--output-dir', help='Local directory to write to')
+    parser.add_argument('--prefix', default='exports/sales',
+                        help='Key prefix / subdirectory of the export (default: exports/sales)')
+    parser.add_argument('--format', choices=sorted(FORMATS), default='ndjson',
+                        help='Output format (default: ndjson; parquet needs pyarrow)')
+    parser.add_argument('--segments', type=int, default=8,
+                        help='Parallel scan segments (default: 8)')
+    parser.add_argument('--max-buffered-rows', type=int, default=MAX_BUFFERED_ROWS,
+                        help=f'Rows each partition writer buffers before writing part files (default: {MAX_BUFFERED_ROWS})')
+    parser.add_argument('--region',
+                        default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help='AWS region (default: us-east-1)')
+
+    args = parser.parse_args()
+
+    if not args.orders_table_name or not args.events_table_name:
+        print("Error: Table names are required!")
+        print("Usage: python export_sales.py --orders-table-name <ORDERS> --events-table-name <EVENTS> "
+              "--output-dir <DIR>")
+        return
+
+    # The lambdas' shared clients take their region from the environment
+    os.environ['AWS_DEFAULT_REGION'] = args.region
+    if args.bucket:
+        sink = S3Sink(args.bucket, args.prefix)
+    else:
+        sink = DirectorySink(args.output_dir, args.prefix)
+
+    print(f"Exporting {args.orders_table_name} to {sink.location()} ({args.format})")
+    print(f"Region: {args.region}, segments: {args.segments}\n")
+
+    try:
+        manifest = export_sales(args.orders_table_name, args.events_table_name, sink, args.format,
+                                max(1, args.segments), max(1, args.max_buffered_rows))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    rate = manifest['rows'] / manifest['seconds'] if manifest['seconds'] else 0
+    print(f"\n{'='*50}")
+    print(
+        f"Summary: {manifest['rows']} orders exported to {manifest['files']} files "
+        f"({manifest['bytes']} bytes) in {manifest['seconds']:.1f}s ({rate:.0f} rows/s)")
+    print(f"{'='*50}")
+
+
+if __name__ == '__main__':
+    main()
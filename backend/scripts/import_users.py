@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Bulk import of existing customers into DynamoDB UsersTable
+
+Input is a CSV file with a header row, or NDJSON (one JSON object per line,
+for files ending in .ndjson / .jsonl). Each row needs `userId` and either
+`password` (plaintext, hashed here with the same scrypt format as register)
+or `passwordHash` (already in our format, stored as is).
+
+Rows are split into --segments parallel segments (see bulk_write.py); each
+segment hashes its passwords and writes through its own batch_writer.
+Progress and the final summary report rows per second.
+
+Batch writes cannot be conditional: an imported row replaces an existing user
+with the same userId. Use register for sign-ups; this is for migrations.
+"""
+
+import csv
+import json
+import argparse
+import os
+import sys
+from pathlib import Path
+from bulk_write import write_items
+
+# Hash with the lambdas' own code so imported users can log in
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambdas'))
+from utils.passwords import hash_password  # noqa: E402
+
+
+def read_rows(path):
+    """Load user rows from a CSV or NDJSON file"""
+    with open(path, newline='') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            return [json.loads(line) for line in f if line.strip()]
+        return list(csv.DictReader(f))
+
+
+def to_user_item(row, cost):
+    """UsersTable item for an input row (raises ValueError if unusable)"""
+    user_id = (row.get('userId') or '').strip()
+    if not user_id:
+        raise ValueError("missing userId")
+    if row.get('passwordHash'):
+        return {'userId': user_id, 'passwordHash': row['passwordHash']}
+    if row.get('password'):
+        return {'userId': user_id, 'passwordHash': hash_password(row['password'], cost)}
+    raise ValueError(f"no password or passwordHash for {user_id}")
+
+
+def import_users(table_name, path, region='us-east-1', segments=8, cost=None):
+    """Import all rows of `path` into table_name using `segments` workers"""
+    rows = read_rows(path)
+
+    print(f"Importing {len(rows)} users into table: {table_name}")
+    print(f"Region: {region}, segments: {segments}\n")
+
+    # Passwords are hashed in the segment workers, in parallel
+    # overwrite_by_pkeys drops duplicate userIds within a batch (last row wins)
+    progress = write_items(table_name, rows, region, segments, key_names=['userId'],
+                           to_item=lambda row: to_user_item(row, cost), unit='rows')
+
+    print(f"\n{'='*50}")
+    print(
+        f"Summary: {progress.written} users imported, {progress.errors} skipped "
+        f"in {progress.elapsed():.1f}s ({progress.rate():.0f} rows/s)")
+    print(f"{'='*50}")
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Bulk import users into DynamoDB')
+    parser.add_argument('file',
+                        help='CSV (with header) or NDJSON file of users')
+    parser.add_argument('--table-name',
+                        default=os.environ.get('USERS_TABLE'),
+                        help='DynamoDB table name (or set USERS_TABLE env var)')
+    parser.add_argument('--region',
+                        default=os.environ.get('AWS_REGION', 'us-east-1'),
+                        help='AWS region (default: us-east-1)')
+    parser.add_argument('--segments', type=int, default=8,
+                        help='Parallel segments, each with its own batch writer (default: 8)')
+    parser.add_argument('--hash-cost', type=int, default=None,
+                        help='scrypt cost for plaintext passwords (default: PASSWORD_HASH_COST)')
+
+    args = parser.parse_args()
+
+    if not args.table_name:
+        print("Error: Table name is required!")
+        print("Usage: python import_users.py users.csv --table-name <TABLE_NAME>")
+        print("   or: export USERS_TABLE=<TABLE_NAME> && python import_users.py users.csv")
+        return
+
+    progress = import_users(args.table_name, args.file, args.region,
+                            max(1, args.segments), args.hash_cost)
+    if progress.errors:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,15 +1,43 @@
 #!/usr/bin/env python3
 """
-Seed script to preload sample events into DynamoDB EventsTable
+Seed script to preload events into DynamoDB EventsTable
 
+By default the five SAMPLE_EVENTS are written. For staging and load tests
+the catalog can instead be synthesized (--generate-events N) or imported
+from a CSV / JSON / NDJSON file (--import-events), and synthetic users
+(--users N) and historical orders (--orders N) added on top:
+
+- categories, cities, prices and capacities follow weighted distributions
+  (CATEGORIES, CITIES); prices skew towards the low end of each range
+- event popularity is Zipf-distributed (POPULARITY_SKEW): a few events take
+  most orders and sell out, the long tail sells little
+- confirmed and fulfilled orders are taken out of their event's
+  remainingTickets before the events are written
+- all generated users share one password (--user-password), hashed once
+
+Every table is written by --segments parallel batch writers (see
+bulk_write.py) with progress in items per second. --random-seed makes a
+generated data set reproducible. Existing users can be imported with
+import_users.py.
 """
 
-import boto3
+import csv
 import json
 import argparse
 import os
-from decimal import Decimal
-from botocore.exceptions import ClientError
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from bulk_write import write_items
+
+# Status values and password hashing from the lambdas' own code
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'lambdas'))
+from utils.order_status import CANCELLED, CONFIRMED, FULFILLED, ORDER_STATUSES  # noqa: E402
+from utils.passwords import hash_password  # noqa: E402
 
 # Sample events data
 SAMPLE_EVENTS = [
@@ -24,7 +52,9 @@ SAMPLE_EVENTS = [
         "city": "New York, NY",
         "date": "2026-07-15",
         "price": 129,
-        "category": "Music Festival"
+        "category": "Music Festival",
+        # Hot on-sale: stock split across 4 InventoryTable counters
+        "inventoryShards": 4
     },
     {
         "eventId": "e002",
@@ -50,7 +80,11 @@ SAMPLE_EVENTS = [
         "city": "Los Angeles, CA",
         "date": "2026-06-12",
         "price": 250,
-        "category": "Sports"
+        "category": "Sports",
+        "inventoryShards": 8,
+        # On-sale demo: buyers go through the waiting room
+        "waitingRoom": True,
+        "admissionRate": 20
     },
     {
         "eventId": "e004",
@@ -81,54 +115,373 @@ SAMPLE_EVENTS = [
 ]
 
 
+
+# ============================================================
+# Synthetic catalog distributions
+# ============================================================
+
+# category -> relative weight, price range ($), capacity range, name parts
+CATEGORIES = {
+    "Concert": {
+        "weight": 30, "price": (35, 250), "capacity": (500, 20000),
+        "names": ["Live", "World Tour", "Unplugged", "In Concert", "Reunion Tour"],
+        "performers": ["The Midnight Echoes", "Luna Vale", "Static Hearts", "Marcus Reed Band",
+                       "Violet Skies", "The Northern Lights", "Ada Stone", "Blue Harbor"],
+        "venues": ["Arena", "Amphitheater", "Music Hall", "Ballroom"],
+        "imageUrl": "https://images.unsplash.com/photo-1470229722913-7c0e2dbbafd3?w=800"
+    },
+    "Music Festival": {
+        "weight": 10, "price": (79, 399), "capacity": (5000, 40000),
+        "names": ["Summer Festival", "Sound Weekend", "Open Air", "Music & Arts Festival"],
+        "performers": ["Global Artists Lineup", "Indie Showcase", "Electronic All-Stars",
+                       "Folk & Roots Collective"],
+        "venues": ["Fairgrounds", "Park Open Grounds", "Waterfront"],
+        "imageUrl": "https://images.unsplash.com/photo-1470229722913-7c0e2dbbafd3?w=800"
+    },
+    "Sports": {
+        "weight": 25, "price": (25, 450), "capacity": (2000, 60000),
+        "names": ["Championship Finals", "Season Opener", "Rivalry Night", "All-Star Game",
+                  "Playoff Game"],
+        "performers": ["Pro League Finalists", "City Rivals", "Regional All-Stars",
+                       "National Team"],
+        "venues": ["Stadium", "Arena", "Field"],
+        "imageUrl": "https://images.unsplash.com/photo-1546519638-68e109498ffc?w=800"
+    },
+    "Comedy": {
+        "weight": 12, "price": (20, 120), "capacity": (100, 3000),
+        "names": ["Comedy Night", "Stand-Up Special", "Improv Showcase", "Late Show"],
+        "performers": ["Headliner Comedians", "Jess Park", "The Improv Collective",
+                       "Sam Okafor", "Rising Stars of Comedy"],
+        "venues": ["Comedy Club", "Theater", "Playhouse"],
+        "imageUrl": "https://images.unsplash.com/photo-1508214751196-bcfd4ca60f91?w=800"
+    },
+    "Theater": {
+        "weight": 10, "price": (40, 300), "capacity": (300, 2500),
+        "names": ["Opening Night", "Matinee", "Premiere", "Revival"],
+        "performers": ["City Repertory Company", "Touring Broadway Cast", "Shakespeare Ensemble"],
+        "venues": ["Playhouse", "Opera House", "Performing Arts Center"],
+        "imageUrl": "https://images.unsplash.com/photo-1508214751196-bcfd4ca60f91?w=800"
+    },
+    "Technology": {
+        "weight": 8, "price": (99, 1200), "capacity": (200, 8000),
+        "names": ["Tech Conference", "Developer Summit", "AI Forum", "Cloud Expo"],
+        "performers": ["Industry Leaders & Keynote Speakers", "Open Source Maintainers",
+                       "Startup Founders Panel"],
+        "venues": ["Convention Center", "Conference Center", "Expo Hall"],
+        "imageUrl": "https://images.unsplash.com/photo-1505373877841-8d25f7d46678?w=800"
+    },
+    "Art": {
+        "weight": 5, "price": (15, 90), "capacity": (50, 1500),
+        "names": ["Art Exhibition", "Gallery Opening", "Art Fair", "Retrospective"],
+        "performers": ["Featured Modern Artists", "Emerging Painters Collective",
+                       "Photography Guild"],
+        "venues": ["Art Gallery", "Museum", "Exhibition Hall"],
+        "imageUrl": "https://images.unsplash.com/photo-1541961017774-22349e4a1262?w=800"
+    }
+}
+
+# city -> relative weight (bigger markets host more events)
+CITIES = {
+    "New York, NY": 12, "Los Angeles, CA": 10, "Chicago, IL": 7, "Houston, TX": 5,
+    "Dallas, TX": 5, "Austin, TX": 4, "Miami, FL": 5, "Atlanta, GA": 4,
+    "Boston, MA": 4, "Seattle, WA": 4, "San Francisco, CA": 5, "San Jose, CA": 2,
+    "Denver, CO": 3, "Nashville, TN": 3, "Las Vegas, NV": 4, "Philadelphia, PA": 3
+}
+
+NAME_ADJECTIVES = ["Electric", "Golden", "Midnight", "Grand", "Neon", "Starlight", "Urban",
+                   "Riverside", "Crimson", "Evergreen", "Silver", "Wild"]
+
+# Zipf exponent of event popularity (~1 is typical for ticket sales)
+POPULARITY_SKEW = 1.1
+# Generated events take place within this many days from today
+EVENT_HORIZON_DAYS = 365
+# Tickets per order: 1-4, mostly one or two
+QUANTITY_WEIGHTS = {1: 45, 2: 35, 3: 10, 4: 10}
+# Historical order statuses (pending orders are never left behind)
+STATUS_WEIGHTS = {FULFILLED: 60, CONFIRMED: 35, CANCELLED: 5}
+# Hottest generated events get their stock split across inventory shards
+HOT_EVENT_SHARDS = 4
+
+# Field types of imported CSV rows (every CSV value is a string)
+NUMBER_FIELDS = ('remainingTickets', 'price', 'inventoryShards', 'admissionRate', 'quantity')
+BOOLEAN_FIELDS = ('waitingRoom',)
+
+
 def convert_to_dynamodb_item(item):
     """Convert Python dict to DynamoDB format (numbers as Decimal)"""
     return json.loads(json.dumps(item), parse_float=Decimal)
 
 
-def seed_events(table_name, region='us-east-1'):
-    """Seed sample events into DynamoDB table"""
-    dynamodb = boto3.resource('dynamodb', region_name=region)
-    table = dynamodb.Table(table_name)
+def split_inventory(total, shards):
+    """Split a ticket count into `shards` near-equal counters"""
+    base, extra = divmod(total, shards)
+    return [base + (1 if shard_id < extra else 0) for shard_id in range(shards)]
 
-    print(f"Seeding events into table: {table_name}")
-    print(f"Region: {region}\n")
 
-    success_count = 0
-    error_count = 0
+def inventory_items(event):
+    """InventoryTable counters of a sharded event"""
+    counts = split_inventory(event['remainingTickets'], event['inventoryShards'])
+    return [
+        {'eventId': event['eventId'], 'shardId': shard_id, 'remainingTickets': count}
+        for shard_id, count in enumerate(counts)
+    ]
 
-    for event in SAMPLE_EVENTS:
-        try:
-            # Convert to DynamoDB format
-            dynamodb_item = convert_to_dynamodb_item(event)
 
-            # Put item into table
-            table.put_item(Item=dynamodb_item)
-            print(f"Added event: {event['name']} (ID: {event['eventId']})")
-            success_count += 1
+def _weighted(rng, weights):
+    """Pick a key of a {value: weight} dict"""
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
 
-        except ClientError as e:
-            print(f"Error adding event {event['eventId']}: {e}")
-            error_count += 1
-        except Exception as e:
-            print(f"Unexpected error adding event {event['eventId']}: {e}")
+
+def _skewed_int(rng, low, high):
+    """Integer in [low, high], skewed towards low"""
+    return int(round(low + (high - low) * rng.betavariate(1.5, 4)))
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(moment):
+    """ISO timestamp in the format purchase writes"""
+    return moment.isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+
+def zipf_weights(count, rng, skew=POPULARITY_SKEW):
+    """Popularity weight per position: ranks 1..count in random order"""
+    ranks = list(range(1, count + 1))
+    rng.shuffle(ranks)
+    return [1.0 / rank ** skew for rank in ranks]
+
+
+def generate_events(count, rng, id_prefix='gen-', hot_events=0):
+    """
+    Synthesize `count` events.
+    hot_events: the most popular events get HOT_EVENT_SHARDS inventory shards
+    Returns: (events, popularity weights in the same order)
+    """
+    today = date.today()
+    events = []
+    for n in range(1, count + 1):
+        category = _weighted(rng, {name: spec['weight'] for name, spec in CATEGORIES.items()})
+        spec = CATEGORIES[category]
+        city = _weighted(rng, CITIES)
+        city_name = city.split(',')[0]
+        performer = rng.choice(spec['performers'])
+        title = rng.choice(spec['names'])
+        venue = f"{city_name} {rng.choice(spec['venues'])}"
+        event_date = today + timedelta(days=rng.randint(1, EVENT_HORIZON_DAYS))
+        events.append({
+            "eventId": f"{id_prefix}e{n:06d}",
+            "name": f"{rng.choice(NAME_ADJECTIVES)} {title} {event_date.year}",
+            "description": f"{title} with {performer} at {venue}.",
+            "imageUrl": spec['imageUrl'],
+            "remainingTickets": _skewed_int(rng, *spec['capacity']),
+            "performer": performer,
+            "venue": venue,
+            "city": city,
+            "date": event_date.isoformat(),
+            "price": _skewed_int(rng, *spec['price']),
+            "category": category
+        })
+
+    popularity = zipf_weights(count, rng)
+    hottest = sorted(range(count), key=lambda i: popularity[i], reverse=True)[:hot_events]
+    for i in hottest:
+        events[i]['inventoryShards'] = HOT_EVENT_SHARDS
+    return events, popularity
+
+
+def generate_users(count, password_hash, id_prefix='gen-'):
+    """Synthesize `count` users sharing one password hash"""
+    return [
+        {'userId': f"{id_prefix}user{n:06d}", 'passwordHash': password_hash}
+        for n in range(1, count + 1)
+    ]
+
+
+def generate_orders(count, rng, events, popularity, user_ids, history_days=180):
+    """
+    Synthesize up to `count` historical orders over the last history_days.
+    Popular events are picked more often (Zipf), and so are a core of
+    frequent buyers. Tickets of non-cancelled orders are taken out of the
+    events' remainingTickets (mutated in place); an order for a sold-out
+    event is dropped, so fewer than `count` may be returned.
+    """
+    now = datetime.now(timezone.utc)
+    buyer_weights = zipf_weights(len(user_ids), rng, skew=0.8)
+    event_picks = rng.choices(range(len(events)), weights=popularity, k=count)
+    user_picks = rng.choices(user_ids, weights=buyer_weights, k=count)
+
+    orders = []
+    for event_index, user_id in zip(event_picks, user_picks):
+        event = events[event_index]
+        quantity = _weighted(rng, QUANTITY_WEIGHTS)
+        status = _weighted(rng, STATUS_WEIGHTS)
+        if status != CANCELLED:
+            if event['remainingTickets'] < quantity:
+                continue
+            event['remainingTickets'] -= quantity
+        created_at = now - timedelta(seconds=rng.uniform(0, history_days * 86400))
+        orders.append({
+            'orderId': _uuid(rng),
+            'userId': user_id,
+            'eventId': event['eventId'],
+            'quantity': quantity,
+            'unitPrice': event['price'],
+            'status': status,
+            'createdAt': _timestamp(created_at)
+        })
+    return orders
+
+
+def _coerce(row):
+    """Typed values for a CSV row; empty cells are dropped"""
+    item = {}
+    for field, value in row.items():
+        if value is None or value == '':
+            continue
+        if field in NUMBER_FIELDS:
+            try:
+                number = Decimal(value)
+            except InvalidOperation:
+                raise ValueError(f"{field} is not a number: {value!r}")
+            value = int(number) if number == number.to_integral_value() else float(value)
+        elif field in BOOLEAN_FIELDS:
+            value = value.strip().lower() in ('1', 'true', 'yes')
+        item[field] = value
+    return item
+
+
+def read_records(path):
+    """Load rows from a CSV (with header), JSON array or NDJSON file"""
+    with open(path, newline='') as f:
+        if path.endswith(('.ndjson', '.jsonl')):
+            return [json.loads(line) for line in f if line.strip()]
+        if path.endswith('.json'):
+            return json.load(f)
+        return [_coerce(row) for row in csv.DictReader(f)]
+
+
+def validate_event(event):
+    """Raise ValueError if an imported event cannot be seeded"""
+    for field in ('eventId', 'name', 'remainingTickets', 'price'):
+        if event.get(field) in (None, ''):
+            raise ValueError(f"event {event.get('eventId', '?')} has no {field}")
+
+
+def to_order_item(order):
+    """OrdersTable item for an imported order (raises ValueError if unusable)"""
+    for field in ('orderId', 'userId', 'eventId', 'quantity', 'status', 'createdAt'):
+        if order.get(field) in (None, ''):
+            raise ValueError(f"order {order.get('orderId', '?')} has no {field}")
+    if order['status'] not in ORDER_STATUSES:
+        raise ValueError(f"order {order['orderId']} has unknown status {order['status']}")
+    return convert_to_dynamodb_item(order)
+
+
+def _report(progress, noun):
+    print(
+        f"  {progress.written} {noun} written, {progress.errors} skipped "
+        f"in {progress.elapsed():.1f}s ({progress.rate():.0f} items/s)")
+
+
+def seed_events(table_name, region='us-east-1', inventory_table_name=None, events=None, segments=8):
+    """Seed events (SAMPLE_EVENTS by default) into DynamoDB table"""
+    events = SAMPLE_EVENTS if events is None else events
+
+    print(f"Seeding {len(events)} events into table: {table_name}")
+    print(f"Region: {region}, segments: {segments}\n")
+
+    # New metaVersion so warm Lambdas drop their cached copy of re-seeded events
+    meta_version = int(time.time())
+
+    items = []
+    counters = []
+    error_count = 0
+    for event in events:
+        try:
+            validate_event(event)
+            dynamodb_item = convert_to_dynamodb_item({**event, 'metaVersion': meta_version})
+
+            shards = int(event.get('inventoryShards', 0))
+            if shards > 1:
+                if inventory_table_name is None:
+                    raise ValueError("sharded event requires --inventory-table-name")
+                # Stock lives in the shard counters, not on the event item
+                counters.extend(inventory_items({**event, 'inventoryShards': shards}))
+                dynamodb_item.pop('remainingTickets', None)
+            items.append(dynamodb_item)
+        except ValueError as e:
+            print(f"Error adding event {event.get('eventId', '?')}: {e}")
             error_count += 1
 
+    # Counters first: a sharded event is never readable without its stock
+    if counters:
+        progress = write_items(inventory_table_name, counters, region, segments,
+                               key_names=['eventId', 'shardId'], unit='counters')
+        _report(progress, 'inventory counters')
+
+    progress = write_items(table_name, items, region, segments, key_names=['eventId'], unit='events')
+    _report(progress, 'events')
+
     print(f"\n{'='*50}")
     print(
-        f"Summary: {success_count} events added successfully, {error_count} errors")
+        f"Summary: {progress.written} events added successfully, {error_count} errors")
     print(f"{'='*50}")
+    return progress.written, error_count
+
+
+def seed_table(table_name, items, region, segments, key_name, noun, to_item=None):
+    """Write generated or imported users/orders"""
+    print(f"\nSeeding {len(items)} {noun} into table: {table_name}")
+    progress = write_items(table_name, items, region, segments, key_names=[key_name],
+                           to_item=to_item, unit=noun)
+    _report(progress, noun)
+    return progress.errors
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description='Seed sample events into DynamoDB')
+        description='Seed events (and optionally users and orders) into DynamoDB')
     parser.add_argument('--table-name',
                         default=os.environ.get('EVENTS_TABLE'),
                         help='DynamoDB table name (or set EVENTS_TABLE env var)')
+    parser.add_argument('--inventory-table-name',
+                        default=os.environ.get('INVENTORY_TABLE'),
+                        help='InventoryTable name for sharded events (or set INVENTORY_TABLE env var)')
+    parser.add_argument('--users-table-name',
+                        default=os.environ.get('USERS_TABLE'),
+                        help='UsersTable name for --users (or set USERS_TABLE env var)')
+    parser.add_argument('--orders-table-name',
+                        default=os.environ.get('ORDERS_TABLE'),
+                        help='OrdersTable name for --orders / --import-orders (or set ORDERS_TABLE env var)')
     parser.add_argument('--region',
                         default=os.environ.get('AWS_REGION', 'us-east-1'),
                         help='AWS region (default: us-east-1)')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--generate-events', type=int, default=0, metavar='N',
+                        help='Synthesize N events instead of the samples')
+    source.add_argument('--import-events', metavar='FILE',
+                        help='Import events from a CSV, JSON or NDJSON file instead of the samples')
+    parser.add_argument('--users', type=int, default=0, metavar='N',
+                        help='Synthesize N users')
+    parser.add_argument('--orders', type=int, default=0, metavar='N',
+                        help='Synthesize up to N historical orders of the generated users')
+    parser.add_argument('--import-orders', metavar='FILE',
+                        help='Import orders from a CSV, JSON or NDJSON file (stock is not adjusted)')
+    parser.add_argument('--hot-events', type=int, default=0, metavar='N',
+                        help=f'Shard the stock of the N most popular generated events '
+                             f'({HOT_EVENT_SHARDS} shards)')
+    parser.add_argument('--history-days', type=int, default=180,
+                        help='Generated orders span this many past days (default: 180)')
+    parser.add_argument('--user-password', default='password123',
+                        help='Password of every generated user (default: password123)')
+    parser.add_argument('--id-prefix', default='gen-',
+                        help='Prefix of generated eventIds and userIds (default: gen-)')
+    parser.add_argument('--random-seed', type=int, default=None,
+                        help='Seed for reproducible generated data')
+    parser.add_argument('--segments', type=int, default=8,
+                        help='Parallel segments per table, each with its own batch writer (default: 8)')
 
     args = parser.parse_args()
 
@@ -137,8 +490,53 @@ def main():
         print("Usage: python seed_events.py --table-name <TABLE_NAME>")
         print("   or: export EVENTS_TABLE=<TABLE_NAME> && python seed_events.py")
         return
+    if args.users and not args.users_table_name:
+        print("Error: --users requires --users-table-name (or USERS_TABLE)")
+        return
+    if (args.orders or args.import_orders) and not args.orders_table_name:
+        print("Error: --orders / --import-orders require --orders-table-name (or ORDERS_TABLE)")
+        return
+    if args.orders and not args.users:
+        print("Error: --orders needs generated users (--users N)")
+        return
+
+    rng = random.Random(args.random_seed)
+    segments = max(1, args.segments)
+
+    if args.generate_events:
+        events, popularity = generate_events(args.generate_events, rng, args.id_prefix, args.hot_events)
+    elif args.import_events:
+        events = read_records(args.import_events)
+        popularity = [1.0] * len(events)
+    else:
+        # Copies: generated orders take tickets out of the events
+        events = [dict(event) for event in SAMPLE_EVENTS]
+        popularity = [1.0] * len(events)
+
+    users = []
+    if args.users:
+        users = generate_users(args.users, hash_password(args.user_password), args.id_prefix)
+
+    # Orders are generated first so the events are written with their stock
+    # already reduced by the tickets sold
+    orders = []
+    if args.orders:
+        orders = generate_orders(args.orders, rng, events, popularity,
+                                 [user['userId'] for user in users], args.history_days)
+
+    _, errors = seed_events(args.table_name, args.region, args.inventory_table_name, events, segments)
+
+    if users:
+        errors += seed_table(args.users_table_name, users, args.region, segments, 'userId', 'users')
+    if orders:
+        errors += seed_table(args.orders_table_name, orders, args.region, segments, 'orderId', 'orders',
+                             to_item=convert_to_dynamodb_item)
+    if args.import_orders:
+        errors += seed_table(args.orders_table_name, read_records(args.import_orders), args.region,
+                             segments, 'orderId', 'orders', to_item=to_order_item)
 
-    seed_events(args.table_name, args.region)
+    if errors:
+        sys.exit(1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,26 @@
+import sys
+from pathlib import Path
+
+import boto3
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Tests import the lambdas' modules the way the Lambda runtime does, and
+# share the benchmarks' table definitions (TicketingStack's keys and GSIs)
+for directory in (BACKEND_DIR / 'lambdas', BACKEND_DIR / 'benchmarks'):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+import common  # noqa: E402
+
+# Handlers read their table names at import time
+common.configure_environment()
+
+
+@pytest.fixture
+def aws():
+    """moto with every TicketingStack table created (names in common.TABLE_ENV)."""
+    from moto import mock_aws
+    with mock_aws():
+        common.create_tables(boto3.client('dynamodb', region_name=common.REGION))
+        yield
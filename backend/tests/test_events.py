@@ -0,0 +1,62 @@
+import boto3
+import pytest
+from moto import mock_aws
+
+from utils.dynamo import Table
+from utils.events import event_cache, load_event, load_static
+
+EVENTS_TABLE = 'test-events'
+
+
+@pytest.fixture
+def events_table(monkeypatch):
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'test')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'test')
+    event_cache.clear()
+    with mock_aws():
+        boto3.client('dynamodb').create_table(
+            TableName=EVENTS_TABLE,
+            KeySchema=[{'AttributeName': 'eventId', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'eventId', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        table = Table(EVENTS_TABLE)
+        table.put_item(Item={'eventId': 'evt-1', 'remainingTickets': 100, 'metaVersion': 1})
+        yield table
+    event_cache.clear()
+
+
+def _reshard(table):
+    """What an organizer does: change static fields and bump metaVersion."""
+    table.update_item(
+        Key={'eventId': 'evt-1'},
+        UpdateExpression='SET inventoryShards = :shards, waitingRoom = :on, metaVersion = metaVersion + :one',
+        ExpressionAttributeValues={':shards': 4, ':on': True, ':one': 1}
+    )
+
+
+def test_load_event_follows_a_metaversion_bump(events_table):
+    assert 'inventoryShards' not in load_event(events_table, 'evt-1')
+
+    _reshard(events_table)
+
+    event = load_event(events_table, 'evt-1')
+    assert event['inventoryShards'] == 4
+    assert event['waitingRoom'] is True
+
+
+def test_load_static_serves_the_cached_copy(events_table):
+    load_static(events_table, 'evt-1')
+
+    _reshard(events_table)
+
+    # Only safe for fields that may lag by the cache TTL
+    assert 'inventoryShards' not in load_static(events_table, 'evt-1')
+
+
+def test_load_event_of_a_deleted_event(events_table):
+    load_event(events_table, 'evt-1')
+    events_table.delete_item(Key={'eventId': 'evt-1'})
+
+    assert load_event(events_table, 'evt-1') is None
@@ -0,0 +1,138 @@
+import json
+
+import pytest
+
+import confirm_hold
+import create_hold
+import hold_expiry
+from common import TABLE_ENV
+from utils.auth import issue_token
+from utils.dynamo import Table
+from utils.events import event_cache
+
+EVENT_ID = 'evt-1'
+
+
+@pytest.fixture
+def tables(aws):
+    event_cache.clear()
+    tables = {
+        name: Table(TABLE_ENV[name])
+        for name in ('EVENTS_TABLE', 'INVENTORY_TABLE', 'HOLDS_TABLE', 'ORDERS_TABLE')
+    }
+    tables['EVENTS_TABLE'].put_item(Item={'eventId': EVENT_ID, 'remainingTickets': 10, 'price': 25, 'metaVersion': 1})
+    yield tables
+    event_cache.clear()
+
+
+def _request(user_id, body=None, hold_id=None):
+    return {
+        'headers': {'Authorization': f'Bearer {issue_token(user_id)}'},
+        'body': json.dumps(body or {}),
+        'pathParameters': {'holdId': hold_id} if hold_id else None
+    }
+
+
+def _hold(user_id, quantity):
+    response = create_hold.lambda_handler(_request(user_id, {'eventId': EVENT_ID, 'quantity': quantity}), None)
+    assert response['statusCode'] == 200, response['body']
+    return json.loads(response['body'])['data']
+
+
+def _confirm(user_id, hold_id):
+    response = confirm_hold.lambda_handler(_request(user_id, hold_id=hold_id), None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def _remaining(tables):
+    return int(tables['EVENTS_TABLE'].get_item(Key={'eventId': EVENT_ID})['Item']['remainingTickets'])
+
+
+def _expire(tables, hold_id):
+    tables['HOLDS_TABLE'].update_item(
+        Key={'holdId': hold_id},
+        UpdateExpression='SET expiresAt = :past',
+        ExpressionAttributeValues={':past': 1}
+    )
+
+
+def test_hold_takes_stock_and_confirm_creates_one_order(tables):
+    hold = _hold('user-1', 3)
+    assert hold['status'] == 'held'
+    assert _remaining(tables) == 7
+
+    status, body = _confirm('user-1', hold['holdId'])
+    assert status == 200
+    order = tables['ORDERS_TABLE'].get_item(Key={'orderId': body['data']['orderId']})['Item']
+    assert (order['status'], order['quantity'], order['unitPrice']) == ('pending', 3, 25)
+
+    # A retried confirm answers with the same order instead of a second one
+    assert _confirm('user-1', hold['holdId']) == (status, body)
+    assert len(tables['ORDERS_TABLE'].scan()['Items']) == 1
+    assert _remaining(tables) == 7
+
+
+def test_hold_beyond_stock_is_rejected(tables):
+    _hold('user-1', 8)
+
+    response = create_hold.lambda_handler(_request('user-2', {'eventId': EVENT_ID, 'quantity': 3}), None)
+    assert response['statusCode'] == 400
+    assert len(tables['HOLDS_TABLE'].scan()['Items']) == 1
+
+
+def test_only_the_owner_confirms(tables):
+    hold = _hold('user-1', 2)
+
+    status, _ = _confirm('user-2', hold['holdId'])
+    assert status == 404
+
+
+def test_expiry_restocks_expired_holds_only(tables):
+    expired = _hold('user-1', 2)
+    live = _hold('user-2', 3)
+    confirmed = _hold('user-3', 1)
+    assert _confirm('user-3', confirmed['holdId'])[0] == 200
+    _expire(tables, expired['holdId'])
+    assert _remaining(tables) == 4
+
+    summary = hold_expiry.lambda_handler({}, None)
+
+    assert (summary['expired'], summary['released'], summary['failed']) == (1, 1, 0)
+    assert _remaining(tables) == 6
+    states = {item['holdId']: item['holdState'] for item in tables['HOLDS_TABLE'].scan()['Items']}
+    assert states == {expired['holdId']: 'released', live['holdId']: 'held', confirmed['holdId']: 'confirmed'}
+    # Released holds leave the sparse expiry index and cannot be confirmed
+    assert hold_expiry.lambda_handler({}, None)['expired'] == 0
+    assert _confirm('user-1', expired['holdId'])[0] == 410
+
+
+def test_expired_hold_cannot_be_confirmed_before_the_worker_runs(tables):
+    hold = _hold('user-1', 2)
+    _expire(tables, hold['holdId'])
+
+    assert _confirm('user-1', hold['holdId'])[0] == 410
+    assert tables['ORDERS_TABLE'].scan()['Items'] == []
+
+
+def test_expiry_restocks_the_shard_the_hold_came_from(tables):
+    tables['EVENTS_TABLE'].update_item(
+        Key={'eventId': EVENT_ID},
+        UpdateExpression='SET inventoryShards = :two, metaVersion = :version',
+        ExpressionAttributeValues={':two': 2, ':version': 2}
+    )
+    for shard_id in (0, 1):
+        tables['INVENTORY_TABLE'].put_item(Item={'eventId': EVENT_ID, 'shardId': shard_id, 'remainingTickets': 5})
+    hold = _hold('user-1', 4)
+    shard_id = int(tables['HOLDS_TABLE'].get_item(Key={'holdId': hold['holdId']})['Item']['shardId'])
+    assert _shards(tables)[shard_id] == 1
+    _expire(tables, hold['holdId'])
+
+    hold_expiry.lambda_handler({}, None)
+
+    assert _shards(tables) == {0: 5, 1: 5}
+    # The unsharded counter is left alone
+    assert _remaining(tables) == 10
+
+
+def _shards(tables):
+    return {int(item['shardId']): int(item['remainingTickets']) for item in tables['INVENTORY_TABLE'].scan()['Items']}
@@ -0,0 +1,76 @@
+from decimal import Decimal
+from utils.order_summary import apply_change, empty_summary
+
+EVENT = {'eventId': 'evt-1', 'name': 'Show', 'price': Decimal('25')}
+
+
+def _order(status, order_id='order-1'):
+    return {
+        'orderId': order_id,
+        'userId': 'user-1',
+        'eventId': 'evt-1',
+        'quantity': 2,
+        'unitPrice': Decimal('25'),
+        'status': status,
+        'createdAt': '2026-10-18T10:00:00.000000Z'
+    }
+
+
+def _seeded(*orders):
+    """Summary as order_summarizer._seed builds it from current order images."""
+    summary = empty_summary('user-1')
+    for order in orders:
+        apply_change(summary, order, None, EVENT)
+    return summary
+
+
+def test_replayed_insert_and_modify_after_seed_are_skipped():
+    summary = _seeded(_order('confirmed'))
+
+    # The stream still holds the INSERT and MODIFY that led to the seeded status
+    assert not apply_change(summary, _order('pending'), None, EVENT)
+    assert not apply_change(summary, _order('confirmed'), 'pending', EVENT)
+
+    assert summary['orders'][0]['status'] == 'confirmed'
+    assert summary['orderCount'] == 1
+    assert summary['ticketCount'] == 2
+    assert summary['totalSpend'] == Decimal('50')
+
+
+def test_later_changes_still_apply_after_seed():
+    summary = _seeded(_order('pending'))
+
+    assert not apply_change(summary, _order('pending'), None, EVENT)
+    assert apply_change(summary, _order('confirmed'), 'pending', EVENT)
+    assert apply_change(summary, _order('fulfilled'), 'confirmed', EVENT)
+    # Out of order: fulfilled is final
+    assert not apply_change(summary, _order('confirmed'), 'pending', EVENT)
+
+    assert summary['orders'][0]['status'] == 'fulfilled'
+    assert summary['orderCount'] == 1
+    assert summary['ticketCount'] == 2
+    assert summary['totalSpend'] == Decimal('50')
+
+
+def test_cancelled_order_counts_no_tickets():
+    summary = _seeded(_order('pending'))
+
+    assert apply_change(summary, _order('cancelled'), 'pending', EVENT)
+    assert not apply_change(summary, _order('confirmed'), 'pending', EVENT)
+
+    assert summary['orders'][0]['status'] == 'cancelled'
+    assert summary['orderCount'] == 1
+    assert summary['ticketCount'] == 0
+    assert summary['totalSpend'] == Decimal('0')
+
+
+def test_duplicate_record_counted_once():
+    summary = empty_summary('user-1')
+
+    assert apply_change(summary, _order('pending'), None, EVENT)
+    assert apply_change(summary, _order('confirmed'), 'pending', EVENT)
+    assert not apply_change(summary, _order('confirmed'), 'pending', EVENT)
+
+    assert summary['orderCount'] == 1
+    assert summary['ticketCount'] == 2
+    assert summary['totalSpend'] == Decimal('50')
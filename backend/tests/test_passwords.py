@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+import login
+from common import TABLE_ENV
+from utils import passwords
+from utils.dynamo import Table
+from utils.passwords import check_user_password, hash_password, needs_rehash, verify_password
+
+# Cheap hashes: the tests check behaviour, not cost
+COST = 4
+
+
+@pytest.fixture(autouse=True)
+def cheap_cost(monkeypatch):
+    monkeypatch.setattr(passwords, 'PASSWORD_HASH_COST', COST)
+
+
+def test_hash_verifies_only_its_password():
+    encoded = hash_password('s3cret')
+
+    assert encoded.startswith(f'scrypt${COST}$')
+    assert verify_password('s3cret', encoded)
+    assert not verify_password('S3cret', encoded)
+
+
+def test_hashes_are_salted():
+    assert hash_password('s3cret') != hash_password('s3cret')
+
+
+def test_hash_keeps_verifying_after_the_cost_changes(monkeypatch):
+    encoded = hash_password('s3cret')
+    monkeypatch.setattr(passwords, 'PASSWORD_HASH_COST', COST + 1)
+
+    assert verify_password('s3cret', encoded)
+    assert needs_rehash(encoded)
+    assert not needs_rehash(hash_password('s3cret'))
+
+
+@pytest.mark.parametrize('encoded', ['', 'plain', 'bcrypt$4$8$1$AAAA$AAAA', 'scrypt$x$8$1$AAAA$AAAA', None])
+def test_foreign_or_broken_hashes_never_match(encoded):
+    assert not verify_password('s3cret', encoded)
+    assert needs_rehash(encoded)
+
+
+def test_check_user_password():
+    hashed = {'userId': 'user-1', 'passwordHash': hash_password('s3cret')}
+    legacy = {'userId': 'user-2', 'password': 's3cret'}
+
+    assert check_user_password(hashed, 's3cret') == (True, False)
+    assert check_user_password(hashed, 'wrong') == (False, False)
+    # Plaintext from before hashing: accepted once, flagged for migration
+    assert check_user_password(legacy, 's3cret') == (True, True)
+    assert check_user_password(legacy, 'wrong') == (False, True)
+    assert check_user_password(None, 's3cret') == (False, False)
+
+
+def _login(user_id, password):
+    response = login.lambda_handler({'body': json.dumps({'userId': user_id, 'password': password})}, None)
+    return response['statusCode']
+
+
+def test_login_migrates_plaintext_and_outdated_hashes(aws, monkeypatch):
+    monkeypatch.setattr(login, 'enforce', lambda *buckets: None)
+    users = Table(TABLE_ENV['USERS_TABLE'])
+    users.put_item(Item={'userId': 'legacy', 'password': 's3cret'})
+    users.put_item(Item={'userId': 'outdated', 'passwordHash': hash_password('s3cret', cost=COST + 1)})
+
+    assert _login('legacy', 'wrong') == 401
+    assert users.get_item(Key={'userId': 'legacy'})['Item']['password'] == 's3cret'
+
+    for user_id in ('legacy', 'outdated'):
+        assert _login(user_id, 's3cret') == 200
+        item = users.get_item(Key={'userId': user_id})['Item']
+        assert 'password' not in item
+        assert item['passwordHash'].startswith(f'scrypt${COST}$')
+        assert _login(user_id, 's3cret') == 200
@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import login
+from common import TABLE_ENV
+from utils import rate_limit
+from utils.dynamo import Table
+from utils.rate_limit import Limit, RateLimited, enforce
+
+START = 1_800_000_000.0
+
+
+@pytest.fixture
+def clock(aws, monkeypatch):
+    """Limiter time, moved by the test (epoch seconds)."""
+    rate_limit._blocked_until.clear()
+    now = [START]
+    monkeypatch.setattr(rate_limit, 'time', SimpleNamespace(time=lambda: now[0]))
+    yield now
+    rate_limit._blocked_until.clear()
+
+
+def _tat(bucket_key):
+    item = Table(TABLE_ENV['RATE_LIMIT_TABLE']).get_item(Key={'bucketKey': bucket_key}).get('Item')
+    return int(item['tat']) if item else None
+
+
+def _allowed(*buckets):
+    try:
+        enforce(*buckets)
+        return True
+    except RateLimited:
+        return False
+
+
+def test_burst_then_rate(clock):
+    bucket = ('b', Limit(1, 3))
+
+    assert [_allowed(bucket) for _ in range(4)] == [True, True, True, False]
+    clock[0] += 1
+    assert [_allowed(bucket) for _ in range(2)] == [True, False]
+
+
+def test_rejection_carries_retry_after(clock):
+    bucket = ('b', Limit(0.1, 1))
+    enforce(bucket)
+
+    with pytest.raises(RateLimited) as rejected:
+        enforce(bucket)
+    assert rejected.value.retry_after == 10
+
+
+def test_known_empty_bucket_is_rejected_without_dynamodb(clock, monkeypatch):
+    bucket = ('b', Limit(1, 1))
+    enforce(bucket)
+    assert not _allowed(bucket)
+
+    monkeypatch.setattr(rate_limit, '_consume', lambda *args: pytest.fail("bucket was written"))
+    assert not _allowed(bucket)
+
+
+def test_rejected_request_charges_no_bucket(clock):
+    user, event = ('user', Limit(1, 5)), ('event', Limit(1, 1))
+    enforce(user, event)
+    before = _tat('user')
+
+    # The event bucket rejects: the user bucket taken first is refunded
+    assert not _allowed(user, event)
+    assert _tat('user') == before
+
+    rate_limit._blocked_until.clear()
+    assert not _allowed(user, event)
+    assert _tat('user') == before
+
+
+def test_disabled_limits_are_skipped(clock):
+    assert all(_allowed(('b', None)) for _ in range(10))
+    assert _tat('b') is None
+
+
+def test_limiter_errors_fail_open(clock, monkeypatch):
+    monkeypatch.setattr(rate_limit, 'rate_limit_table_name', 'missing-table')
+    assert all(_allowed(('b', Limit(1, 1))) for _ in range(3))
+
+
+def _login(user_id, source_ip):
+    return login.lambda_handler({
+        'body': json.dumps({'userId': user_id, 'password': 'wrong'}),
+        'requestContext': {'identity': {'sourceIp': source_ip}}
+    }, None)['statusCode']
+
+
+def test_login_flood_does_not_lock_out_other_callers(clock):
+    burst = login.LOGIN_PER_CLIENT.burst
+    statuses = [_login('victim', '198.51.100.7') for _ in range(burst + 1)]
+    assert statuses == [401] * burst + [429]
+
+    assert _login('victim', '203.0.113.9') == 401
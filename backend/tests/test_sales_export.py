@@ -0,0 +1,103 @@
+import gzip
+import json
+import os
+import random
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from utils.sales_export import DirectorySink, export_sales
+
+ORDERS_TABLE = 'test-orders'
+EVENTS_TABLE = 'test-events'
+EVENTS = 20
+ORDERS = 3000
+
+
+@pytest.fixture
+def tables(monkeypatch):
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'test')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'test')
+    with mock_aws():
+        dynamodb = boto3.resource('dynamodb')
+        for name, key in ((ORDERS_TABLE, 'orderId'), (EVENTS_TABLE, 'eventId')):
+            dynamodb.create_table(
+                TableName=name,
+                KeySchema=[{'AttributeName': key, 'KeyType': 'HASH'}],
+                AttributeDefinitions=[{'AttributeName': key, 'AttributeType': 'S'}],
+                BillingMode='PAY_PER_REQUEST'
+            )
+        with dynamodb.Table(EVENTS_TABLE).batch_writer() as batch:
+            for n in range(EVENTS):
+                batch.put_item(Item={'eventId': f'evt-{n:02d}', 'name': f'Event {n}', 'price': Decimal(10)})
+        yield dynamodb
+
+
+def _seed_skewed_orders(dynamodb):
+    """Zipf-like: event n gets 1/(n+1) of the orders, all on one day."""
+    rng = random.Random(7)
+    weights = [1 / (n + 1) for n in range(EVENTS)]
+    expected = Counter()
+    with dynamodb.Table(ORDERS_TABLE).batch_writer() as batch:
+        for n in range(ORDERS):
+            event_id = f'evt-{rng.choices(range(EVENTS), weights)[0]:02d}'
+            expected[event_id] += 1
+            batch.put_item(Item={
+                'orderId': f'order-{n:05d}',
+                'userId': f'user-{n % 50}',
+                'eventId': event_id,
+                'quantity': 1,
+                'status': 'confirmed',
+                'createdAt': '2026-10-18T10:00:00.000000Z'
+            })
+    return expected
+
+
+def _part_files(root):
+    """eventId partition -> [(file name, rows)]"""
+    parts = defaultdict(list)
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.startswith('part-'):
+                with open(os.path.join(directory, name), 'rb') as f:
+                    rows = gzip.decompress(f.read()).decode('utf-8').splitlines()
+                event_id = os.path.relpath(directory, root).split(os.sep)[0].split('=')[1]
+                parts[event_id].append((name, len(rows)))
+    return parts
+
+
+def test_skewed_export_writes_one_file_per_partition(tables, tmp_path):
+    expected = _seed_skewed_orders(tables)
+
+    manifest = export_sales(ORDERS_TABLE, EVENTS_TABLE, DirectorySink(str(tmp_path)), segments=4)
+
+    parts = _part_files(tmp_path)
+    assert manifest['rows'] == ORDERS
+    assert manifest['files'] == len(expected) == sum(len(files) for files in parts.values())
+    for event_id, files in parts.items():
+        assert [rows for _, rows in files] == [expected[event_id]]
+    with open(tmp_path / '_manifest.json') as f:
+        assert json.load(f)['files'] == manifest['files']
+
+
+def test_spilled_partitions_stay_with_one_writer(tables, tmp_path):
+    expected = _seed_skewed_orders(tables)
+
+    manifest = export_sales(ORDERS_TABLE, EVENTS_TABLE, DirectorySink(str(tmp_path)),
+                            segments=4, max_buffered_rows=400)
+
+    parts = _part_files(tmp_path)
+    assert manifest['rows'] == ORDERS
+    for event_id, files in parts.items():
+        assert sum(rows for _, rows in files) == expected[event_id]
+        # part-<writer>-<n>: every file of a partition comes from the same writer
+        assert len({name.split('-')[1] for name, _ in files}) == 1
+    # Spills only split the hottest partitions: at most twice as many files
+    # as partitions (a writer per segment used to give every partition a
+    # file per segment and spill)
+    files = [rows for files in parts.values() for _, rows in files]
+    assert len(files) == manifest['files'] <= 2 * len(expected)
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+import search
+from common import TABLE_ENV
+from utils.dynamo import Table
+from utils.search_index import SearchIndex, tokenize
+
+EVENTS = [
+    {'eventId': 'e1', 'name': 'Taylor Swift Live', 'performer': 'Taylor Swift', 'venue': 'Madison Square Garden',
+     'city': 'New York', 'category': 'concert', 'price': 150, 'date': '2026-12-01',
+     'description': 'Pop concert of the year'},
+    {'eventId': 'e2', 'name': 'Swift Boats Regatta', 'performer': 'Harbor Club', 'venue': 'Pier 9',
+     'city': 'Boston', 'category': 'sports', 'price': 40, 'date': '2026-11-15',
+     'description': 'Sailing race'},
+    {'eventId': 'e3', 'name': 'Jazz Night', 'performer': 'Blue Trio', 'venue': 'Village Vanguard',
+     'city': 'New York', 'category': 'concert', 'price': 60, 'date': '2026-11-01',
+     'description': 'Live jazz with a Taylor tribute'},
+    {'eventId': 'e4', 'name': 'Comedy Hour', 'performer': 'Stand Up Crew', 'venue': 'Laugh Factory',
+     'city': 'Chicago', 'category': 'comedy', 'price': 25, 'date': '2026-10-30',
+     'description': 'Jokes'},
+]
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    for item in EVENTS:
+        index.upsert(item)
+    return index
+
+
+def _ids(results):
+    return [item['eventId'] for item in results]
+
+
+def test_tokenize_drops_case_punctuation_and_stopwords():
+    assert tokenize("The Taylor-Swift Show, at 8!") == ['taylor', 'swift', 'show', '8']
+
+
+def test_name_matches_rank_above_description_matches(index):
+    results, _ = index.search('taylor')
+    # e1 has it in name and performer, e3 only in the description
+    assert _ids(results) == ['e1', 'e3']
+
+
+def test_every_term_must_match(index):
+    assert _ids(index.search('swift')[0]) == ['e1', 'e2']
+    assert _ids(index.search('taylor swift')[0]) == ['e1']
+    assert index.search('taylor comedy')[0] == []
+
+
+def test_last_term_matches_as_a_prefix(index):
+    assert _ids(index.search('jaz')[0]) == ['e3']
+    assert _ids(index.search('taylor sw')[0]) == ['e1']
+    # Only the last term is a prefix
+    assert index.search('jaz night')[0] == []
+
+
+def test_empty_query_lists_upcoming_events_first(index):
+    assert _ids(index.search('')[0]) == ['e4', 'e3', 'e2', 'e1']
+    assert _ids(index.search('the of')[0]) == ['e4', 'e3', 'e2', 'e1']
+
+
+def test_filters_and_facets(index):
+    results, facets = index.search('', category='Concert', max_price=100)
+
+    assert _ids(results) == ['e3']
+    # Each facet counts the matches under every filter but its own
+    assert facets['category'] == {'concert': 1, 'sports': 1, 'comedy': 1}
+    assert facets['city'] == {'New York': 1}
+
+
+def test_upsert_and_remove_keep_postings_in_step(index):
+    index.upsert({**EVENTS[2], 'name': 'Blues Night', 'description': 'Blues'})
+    assert index.search('jazz')[0] == []
+    assert _ids(index.search('blu')[0]) == ['e3']
+
+    index.remove('e3')
+    index.remove('missing')
+    assert index.search('blues')[0] == []
+    assert 'blues' not in index.postings
+    assert len(index) == 3
+
+
+def test_results_carry_list_fields_only(index):
+    result = index.search('comedy')[0][0]
+    assert 'description' not in result
+    assert result['name'] == 'Comedy Hour'
+
+
+@pytest.fixture
+def api(aws, monkeypatch):
+    table = Table(TABLE_ENV['EVENTS_TABLE'])
+    for item in EVENTS:
+        table.put_item(Item=item)
+    monkeypatch.setattr(search, '_index', None)
+    return table
+
+
+def _search(**params):
+    response = search.lambda_handler({'queryStringParameters': params}, None)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_handler_pages_through_ranked_results(api):
+    status, first = _search(limit='3')
+    assert status == 200
+    assert (first['total'], _ids(first['data'])) == (4, ['e4', 'e3', 'e2'])
+
+    status, second = _search(limit='3', nextToken=first['nextToken'])
+    assert _ids(second['data']) == ['e1']
+    assert second['nextToken'] is None
+    assert second['data'][0]['price'] == 150
+
+
+def test_handler_rejects_bad_parameters(api):
+    assert _search(minPrice='-1')[0] == 400
+    assert _search(maxPrice='cheap')[0] == 400
+    assert _search(nextToken='garbage')[0] == 400
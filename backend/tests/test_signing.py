@@ -0,0 +1,93 @@
+import base64
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from utils.auth import issue_token, verify_token
+from utils.signing import InvalidToken, sign, verify
+
+NOW = 1_800_000_000
+
+
+def _segments(token):
+    return token.split('.')
+
+
+def _decode(segment):
+    return json.loads(base64.urlsafe_b64decode(segment + '=' * (-len(segment) % 4)))
+
+
+def _encode(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).rstrip(b'=').decode('ascii')
+
+
+def test_round_trip_carries_claims_use_and_expiry():
+    token = sign({'sub': 'user-1'}, 'auth', 60, now=NOW)
+
+    claims = verify(token, 'auth', now=NOW + 59)
+    assert claims == {'sub': 'user-1', 'use': 'auth', 'iat': NOW, 'exp': NOW + 60}
+
+
+def test_expired_token_is_rejected():
+    token = sign({'sub': 'user-1'}, 'auth', 60, now=NOW)
+
+    with pytest.raises(InvalidToken, match='expired'):
+        verify(token, 'auth', now=NOW + 60)
+
+
+def test_token_for_another_use_is_rejected():
+    token = sign({'eventId': 'evt-1'}, 'admission', 60, now=NOW)
+
+    with pytest.raises(InvalidToken, match='use'):
+        verify(token, 'auth', now=NOW)
+
+
+def test_tampered_payload_is_rejected():
+    header, payload, signature = _segments(sign({'sub': 'user-1'}, 'auth', 60, now=NOW))
+    claims = _decode(payload)
+    claims['sub'] = 'admin'
+
+    with pytest.raises(InvalidToken, match='signature'):
+        verify('.'.join([header, _encode(claims), signature]), 'auth', now=NOW)
+
+
+def test_token_signed_with_another_key_is_rejected():
+    header, payload, _ = _segments(sign({'sub': 'user-1'}, 'auth', 60, now=NOW))
+    forged = hmac.new(b'not-the-key', f'{header}.{payload}'.encode('ascii'), hashlib.sha256).digest()
+    signature = base64.urlsafe_b64encode(forged).rstrip(b'=').decode('ascii')
+
+    with pytest.raises(InvalidToken, match='signature'):
+        verify('.'.join([header, payload, signature]), 'auth', now=NOW)
+
+
+def test_other_algorithms_are_rejected():
+    _, payload, signature = _segments(sign({'sub': 'user-1'}, 'auth', 60, now=NOW))
+    header = _encode({'alg': 'none', 'typ': 'JWT'})
+
+    with pytest.raises(InvalidToken):
+        verify('.'.join([header, payload, signature]), 'auth', now=NOW)
+
+
+@pytest.mark.parametrize('token', [None, '', 'abc', 'a.b', 'a.b.c.d', 'é.é.é', 12345])
+def test_malformed_tokens_are_rejected(token):
+    with pytest.raises(InvalidToken):
+        verify(token, 'auth', now=NOW)
+
+
+def test_verify_token_reads_the_authorization_header():
+    token = issue_token('user-1')
+
+    assert verify_token({'headers': {'Authorization': f'Bearer {token}'}}) == 'user-1'
+    assert verify_token({'headers': {'authorization': token}}) == 'user-1'
+    for headers in ({}, {'Authorization': 'Bearer nope'}, None):
+        with pytest.raises(Exception, match='Unauthorized'):
+            verify_token({'headers': headers})
+
+
+def test_admission_token_is_not_a_session():
+    token = sign({'sub': 'user-1'}, 'admission', 60)
+
+    with pytest.raises(Exception, match='Unauthorized'):
+        verify_token({'headers': {'Authorization': f'Bearer {token}'}})
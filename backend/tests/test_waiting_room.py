@@ -0,0 +1,100 @@
+import time
+
+import pytest
+
+from common import TABLE_ENV
+from utils.dynamo import Table
+from utils.signing import sign
+from utils.waiting_room import (
+    ADMISSION_HEADER, AdmissionDenied, _take_slot, check_admission, join,
+    queue_status, read_token
+)
+
+EVENT = {'eventId': 'evt-1', 'waitingRoom': True, 'admissionRate': 2}
+
+# Tests start on a whole second: admitAt is the slot's epoch second
+
+
+@pytest.fixture
+def table(aws):
+    return Table(TABLE_ENV['WAITING_ROOM_TABLE'])
+
+
+def _join(table, user_id, now):
+    return read_token(join(table, EVENT, user_id, now=now), EVENT['eventId'])
+
+
+def _request(token):
+    return {'headers': {ADMISSION_HEADER: token}}
+
+
+def test_joins_are_spaced_by_the_admission_rate(table):
+    now = int(time.time())
+
+    admit_at = [_join(table, f'user-{n}', now)['admitAt'] for n in range(5)]
+
+    # 2 per second: two now, then two a second for the rest
+    assert [at - int(now) for at in admit_at] == [0, 0, 1, 1, 2]
+
+
+def test_idle_room_builds_up_no_credit(table):
+    now = int(time.time())
+    join(table, EVENT, 'user-0', now=now - 600)
+
+    # Ten minutes later a burst is still spaced out at the rate
+    admit_at = [_join(table, f'user-{n}', now)['admitAt'] for n in range(1, 5)]
+    assert [at - int(now) for at in admit_at] == [0, 0, 1, 1]
+
+
+def test_positions_count_every_join(table):
+    now = int(time.time())
+    positions = [_join(table, f'user-{n}', now + n * 10)['position'] for n in range(3)]
+    assert positions == [1, 2, 3]
+
+
+def test_take_slot_after_a_concurrent_restart(table):
+    now_ms = int(time.time() * 1000)
+    # Another join restarted the room a moment "after" this one read the clock
+    _take_slot(table, EVENT['eventId'], 500, now_ms + 10)
+
+    position, admit_at_ms = _take_slot(table, EVENT['eventId'], 500, now_ms)
+
+    assert position == 2
+    assert admit_at_ms == now_ms + 10 + 500
+
+
+def test_queue_status_reports_the_wait(table):
+    now = int(time.time())
+    claims = [_join(table, f'user-{n}', now) for n in range(6)]
+
+    status = queue_status(claims[-1], now=now)
+    assert (status['admitted'], status['waitSeconds'], status['ahead']) == (False, 2, 4)
+    assert queue_status(claims[-1], now=now + 2)['admitted']
+    assert queue_status(claims[0], now=now)['ahead'] == 0
+
+
+def test_check_admission(table):
+    now = int(time.time())
+    first = join(table, EVENT, 'user-0', now=now)
+    _join(table, 'user-1', now)
+    late = join(table, EVENT, 'user-2', now=now)
+
+    check_admission(_request(first), EVENT, 'user-0', now=now)
+    with pytest.raises(AdmissionDenied):
+        check_admission(_request(late), EVENT, 'user-2', now=now)
+    check_admission(_request(late), EVENT, 'user-2', now=now + 1)
+    # Bound to the user and the event
+    with pytest.raises(AdmissionDenied):
+        check_admission(_request(first), EVENT, 'user-1', now=now)
+    with pytest.raises(AdmissionDenied):
+        check_admission(_request(first), {**EVENT, 'eventId': 'evt-2'}, 'user-0', now=now)
+    with pytest.raises(AdmissionDenied):
+        check_admission(_request(None), EVENT, 'user-0', now=now)
+    # Tokens minted for another use are refused
+    with pytest.raises(AdmissionDenied):
+        forged = sign({'eventId': 'evt-1', 'userId': 'user-0', 'admitAt': 0}, 'auth', 60)
+        check_admission(_request(forged), EVENT, 'user-0', now=now)
+
+
+def test_events_without_a_waiting_room_are_not_gated(table):
+    check_admission({'headers': {}}, {'eventId': 'evt-2'}, 'user-0')
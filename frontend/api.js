@@ -76,14 +76,24 @@ const mockData = {
 async function mockGet(path) {
   console.log("[MOCK GET]", path);
 
-  if (path === "/events") {
+  if (path === "/events" || path.startsWith("/events?")) {
     return { success: true, data: mockData.events };
   }
 
+  if (path.startsWith("/events/search")) {
+    return { success: true, data: mockData.events, total: mockData.events.length, facets: { category: {}, city: {} } };
+  }
+
   if (path.startsWith("/events/")) {
     return { success: true, data: mockData.eventDetail };
   }
 
+  if (path.startsWith("/availability")) {
+    const counts = {};
+    mockData.events.forEach(ev => { counts[ev.eventId] = ev.remainingTickets; });
+    return { success: true, data: counts };
+  }
+
   if (path.startsWith("/orders")) {
     return { success: true, data: mockData.orders };
   }
@@ -114,16 +124,41 @@ async function mockPost(path, body) {
     };
   }
 
+  if (path === "/holds") {
+    return {
+      success: true,
+      data: {
+        holdId: "hold999",
+        eventId: body.eventId,
+        quantity: body.quantity,
+        status: "held",
+        expiresAt: new Date(Date.now() + 600000).toISOString(),
+        holdSeconds: 600
+      }
+    };
+  }
+
+  if (path.startsWith("/holds/") && path.endsWith("/confirm")) {
+    return {
+      success: true,
+      data: {
+        orderId: "order999",
+        holdId: path.split("/")[2],
+        message: "Mock purchase successful"
+      }
+    };
+  }
+
   return { success: false, error: "Unknown mock POST" };
 }
 
 /********************************************
  *  REAL API LOGIC
  ********************************************/
-async function realGet(path) {
+async function realGet(path, extraHeaders = {}) {
   const res = await fetch(BASE_URL + path, {
     method: "GET",
-    headers: { Authorization: getToken() }
+    headers: { Authorization: getToken(), ...extraHeaders }
   });
 
   if (res.status === 401) {
@@ -143,12 +178,13 @@ async function realGet(path) {
   }
 }
 
-async function realPost(path, body) {
+async function realPost(path, body, extraHeaders = {}) {
   const res = await fetch(BASE_URL + path, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
-      Authorization: getToken()
+      Authorization: getToken(),
+      ...extraHeaders
     },
     body: JSON.stringify(body)
   });
@@ -170,13 +206,101 @@ async function realPost(path, body) {
   }
 }
 
+/********************************************
+ *  CATALOG SNAPSHOT (static JSON on CloudFront)
+ *  Written by the backend's catalog-snapshot lambda whenever events
+ *  change; browsing reads it instead of calling GET /events. Ticket counts
+ *  in it may be slightly behind.
+ ********************************************/
+const CATALOG_URL = "catalog";
+const CATALOG_PAGE_SIZE = 20;
+let catalogRequest = null;
+
+async function fetchSnapshot(file) {
+  try {
+    const res = await fetch(`${CATALOG_URL}/${file}`);
+    return res.ok ? await res.json() : null;
+  } catch (e) {
+    return null;
+  }
+}
+
+function matchesFilters(ev, params) {
+  const startDate = params.get("startDate");
+  const endDate = params.get("endDate");
+  return (!params.get("category") || ev.category === params.get("category")) &&
+    (!params.get("city") || ev.city === params.get("city")) &&
+    (!startDate || ev.date >= startDate) &&
+    (!endDate || ev.date <= endDate);
+}
+
+// GET /events and GET /events/{eventId} from the snapshot; null when the
+// snapshot cannot answer (then the API is called)
+async function snapshotGet(path) {
+  const [route, query] = path.split("?");
+  const params = new URLSearchParams(query || "");
+
+  const detail = route.match(/^\/events\/([^/]+)$/);
+  if (detail && detail[1] !== "search") {
+    const ev = await fetchSnapshot(`events/${detail[1]}.json`);
+    return ev ? { success: true, data: ev } : null;
+  }
+
+  if (route !== "/events") return null;
+  // Page cursors handed out by the API continue on the API
+  const cursor = params.get("nextToken");
+  if (cursor && !cursor.startsWith("snapshot:")) return null;
+
+  catalogRequest = catalogRequest || fetchSnapshot("events.json");
+  const catalog = await catalogRequest;
+  if (!catalog) return null;
+
+  const offset = cursor ? parseInt(cursor.slice("snapshot:".length), 10) || 0 : 0;
+  const limit = parseInt(params.get("limit"), 10) || CATALOG_PAGE_SIZE;
+  const matching = catalog.events.filter(ev => matchesFilters(ev, params));
+  const end = offset + limit;
+  return {
+    success: true,
+    data: matching.slice(offset, end),
+    nextToken: end < matching.length ? `snapshot:${end}` : null
+  };
+}
+
+/********************************************
+ *  LIVE AVAILABILITY
+ *  Pages refresh ticket counts through GET /availability (a few bytes per
+ *  event) instead of reloading full event documents.
+ ********************************************/
+const AVAILABILITY_POLL_MS = 10000;
+const AVAILABILITY_MAX_IDS = 100;
+
+// Calls onCounts({ eventId: remainingTickets }) now and every
+// AVAILABILITY_POLL_MS while the page is visible; getIds() returns the
+// eventIds currently shown. Returns the refresh function, to update counts
+// right away (e.g. after new events are shown).
+function pollAvailability(getIds, onCounts) {
+  async function refresh() {
+    if (document.hidden) return;
+    const ids = getIds();
+    for (let i = 0; i < ids.length; i += AVAILABILITY_MAX_IDS) {
+      const chunk = ids.slice(i, i + AVAILABILITY_MAX_IDS).map(encodeURIComponent).join(",");
+      const res = await apiGet(`/availability?ids=${chunk}`);
+      if (res && res.success) onCounts(res.data);
+    }
+  }
+  refresh();
+  setInterval(refresh, AVAILABILITY_POLL_MS);
+  return refresh;
+}
+
 /********************************************
  *  PUBLIC API FUNCTIONS (auto-switch with USE_MOCK)
  ********************************************/
-async function apiGet(path) {
-  return USE_MOCK ? mockGet(path) : realGet(path);
+async function apiGet(path, extraHeaders = {}) {
+  if (USE_MOCK) return mockGet(path);
+  return (await snapshotGet(path)) || realGet(path, extraHeaders);
 }
 
-async function apiPost(path, body) {
-  return USE_MOCK ? mockPost(path, body) : realPost(path, body);
+async function apiPost(path, body, extraHeaders = {}) {
+  return USE_MOCK ? mockPost(path, body) : realPost(path, body, extraHeaders);
 }
\ No newline at end of file